@@ -1,27 +1,38 @@
 from __future__ import annotations
 
+import base64
 import json
+from collections import Counter
+from collections.abc import Callable
 from datetime import date, datetime, time, timedelta, timezone
 from typing import Any
 
-from sqlalchemy import select
-from sqlalchemy.orm import Session
+from sqlalchemy import ColumnElement, and_, case, delete, func, insert, or_, select, update
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session, contains_eager, selectinload
 
 from app import models, schemas
+from app.services import extractor as extractor_service
+from app.services import blob_store, document_store, recurrence, reminders, search_index
+from app.services.audit_writer import audit_writer
 
 
 def now_utc() -> datetime:
     return datetime.now(timezone.utc).replace(tzinfo=None)
 
 
-def obligation_due_at(obligation: models.Obligation) -> datetime | None:
-    if obligation.next_due_at:
-        return obligation.next_due_at
-    if obligation.due_date:
-        return datetime.combine(obligation.due_date, time(23, 59, 59))
+def due_at_from(next_due_at: datetime | None, due_date: date | None) -> datetime | None:
+    if next_due_at:
+        return next_due_at
+    if due_date:
+        return datetime.combine(due_date, time(23, 59, 59))
     return None
 
 
+def obligation_due_at(obligation: models.Obligation) -> datetime | None:
+    return due_at_from(obligation.next_due_at, obligation.due_date)
+
+
 def compute_status(
     *,
     current_status: str,
@@ -41,37 +52,244 @@ def compute_status(
     return schemas.ObligationStatus.ON_TRACK.value
 
 
+def status_expression(now: datetime | None = None) -> ColumnElement[str]:
+    n = now or now_utc()
+    o = models.Obligation
+    return case(
+        (o.status == schemas.ObligationStatus.COMPLETED.value, schemas.ObligationStatus.COMPLETED.value),
+        (o.effective_due_at < n, schemas.ObligationStatus.OVERDUE.value),
+        (o.effective_due_at <= n + timedelta(days=14), schemas.ObligationStatus.DUE_SOON.value),
+        else_=schemas.ObligationStatus.ON_TRACK.value,
+    )
+
+
 def refresh_status_in_memory(obligation: models.Obligation, now: datetime | None = None) -> None:
     obligation.status = compute_status(
         current_status=obligation.status, due_at=obligation_due_at(obligation), now=now
     )
 
 
-def create_audit_event(
-    db: Session,
+def encode_cursor(values: list[Any]) -> str:
+    return base64.urlsafe_b64encode(json.dumps(values, default=str).encode()).decode()
+
+
+def decode_cursor(cursor: str) -> list[Any]:
+    try:
+        values = json.loads(base64.urlsafe_b64decode(cursor.encode()))
+    except (ValueError, TypeError) as exc:
+        raise ValueError("Invalid cursor") from exc
+    if not isinstance(values, list):
+        raise ValueError("Invalid cursor")
+    return values
+
+
+def _audit_links(
+    *, entity_type: str, entity_id: int, details: dict[str, Any]
+) -> tuple[int | None, int | None]:
+    loan_id = entity_id if entity_type == "loan" else details.get("loan_id")
+    obligation_id = entity_id if entity_type == "obligation" else details.get("obligation_id")
+    return (
+        loan_id if isinstance(loan_id, int) else None,
+        obligation_id if isinstance(obligation_id, int) else None,
+    )
+
+
+def _audit_values(
     *,
     entity_type: schemas.EntityType,
     entity_id: int,
     action: schemas.AuditAction,
     details: Any | None = None,
-) -> models.AuditEvent:
-    event = models.AuditEvent(
+) -> dict[str, Any]:
+    loan_id, obligation_id = _audit_links(
         entity_type=entity_type,
         entity_id=entity_id,
-        action=action.value,
-        details_json=json.dumps(details or {}, default=str),
+        details=details if isinstance(details, dict) else {},
     )
-    db.add(event)
-    db.commit()
-    db.refresh(event)
-    return event
+    return {
+        "entity_type": entity_type,
+        "entity_id": entity_id,
+        "action": action.value,
+        "details_json": json.dumps(details or {}, default=str),
+        "loan_id": loan_id,
+        "obligation_id": obligation_id,
+    }
+
+
+def create_audit_events(db: Session, rows: list[dict[str, Any]]) -> None:
+    audit_writer.record(db, rows)
+
+
+def create_audit_event(
+    db: Session,
+    *,
+    entity_type: schemas.EntityType,
+    entity_id: int,
+    action: schemas.AuditAction,
+    details: Any | None = None,
+) -> None:
+    create_audit_events(
+        db,
+        [_audit_values(entity_type=entity_type, entity_id=entity_id, action=action, details=details)],
+    )
+
+
+def backfill_audit_links(db: Session, *, batch_size: int = 1000) -> int:
+    e = models.AuditEvent
+    last_id = 0
+    updated = 0
+    while True:
+        rows = db.execute(
+            select(e.id, e.entity_type, e.entity_id, e.details_json)
+            .where(e.id > last_id)
+            .order_by(e.id)
+            .limit(batch_size)
+        ).all()
+        if not rows:
+            break
+
+        params: list[dict[str, Any]] = []
+        for event_id, entity_type, entity_id, details_json in rows:
+            try:
+                details = json.loads(details_json or "{}")
+            except ValueError:
+                details = {}
+            loan_id, obligation_id = _audit_links(
+                entity_type=entity_type,
+                entity_id=entity_id,
+                details=details if isinstance(details, dict) else {},
+            )
+            if loan_id is not None or obligation_id is not None:
+                params.append({"id": event_id, "loan_id": loan_id, "obligation_id": obligation_id})
+        if params:
+            db.execute(update(e), params)
+        db.commit()
+        updated += len(params)
+        last_id = rows[-1][0]
+    return updated
+
+
+def backfill_effective_due_at(db: Session, *, batch_size: int = 1000) -> int:
+    o = models.Obligation
+    last_id = 0
+    updated = 0
+    while True:
+        rows = db.execute(
+            select(o.id, o.next_due_at, o.due_date)
+            .where(o.id > last_id)
+            .order_by(o.id)
+            .limit(batch_size)
+        ).all()
+        if not rows:
+            break
+
+        params = [
+            {"id": obligation_id, "effective_due_at": due_at_from(next_due_at, due_date)}
+            for obligation_id, next_due_at, due_date in rows
+            if next_due_at is not None or due_date is not None
+        ]
+        if params:
+            db.execute(update(o), params)
+        db.commit()
+        updated += len(params)
+        last_id = rows[-1][0]
+    return updated
+
+
+def list_audit_events(
+    db: Session,
+    *,
+    loan_id: int | None = None,
+    obligation_id: int | None = None,
+    action: schemas.AuditAction | None = None,
+    since: datetime | None = None,
+    until: datetime | None = None,
+    cursor: str | None = None,
+    limit: int = 200,
+) -> tuple[list[models.AuditEvent], str | None]:
+    e = models.AuditEvent
+    stmt = select(e).order_by(e.at.desc(), e.id.desc()).limit(limit + 1)
+    if loan_id is not None:
+        stmt = stmt.where(e.loan_id == loan_id)
+    if obligation_id is not None:
+        stmt = stmt.where(e.obligation_id == obligation_id)
+    if action is not None:
+        stmt = stmt.where(e.action == action.value)
+    if since is not None:
+        stmt = stmt.where(e.at >= since)
+    if until is not None:
+        stmt = stmt.where(e.at < until)
+    if cursor is not None:
+        values = decode_cursor(cursor)
+        try:
+            cursor_at, cursor_id = datetime.fromisoformat(values[0]), int(values[1])
+        except (IndexError, TypeError, ValueError) as exc:
+            raise ValueError("Invalid cursor") from exc
+        stmt = stmt.where(or_(e.at < cursor_at, and_(e.at == cursor_at, e.id < cursor_id)))
+
+    events = list(db.execute(stmt).scalars())
+    next_cursor = None
+    if len(events) > limit:
+        events = events[:limit]
+        next_cursor = encode_cursor([events[-1].at.isoformat(), events[-1].id])
+    return events, next_cursor
+
+
+SortKey = tuple[ColumnElement[Any], bool, Callable[[Any], Any]]
+
+
+def _keyset_after(keys: list[SortKey], cursor: str) -> ColumnElement[bool]:
+    raw = decode_cursor(cursor)
+    if len(raw) != len(keys):
+        raise ValueError("Invalid cursor")
+    try:
+        values = [None if v is None else parse(v) for v, (_, _, parse) in zip(raw, keys)]
+    except (TypeError, ValueError) as exc:
+        raise ValueError("Invalid cursor") from exc
+
+    terms: list[ColumnElement[bool]] = []
+    prefix: list[ColumnElement[bool]] = []
+    for (expr, descending, _), value in zip(keys, values):
+        if value is not None:
+            terms.append(and_(*prefix, expr < value if descending else expr > value))
+        prefix.append(expr.is_(None) if value is None else expr == value)
+    return or_(*terms)
+
+
+def _paginate(
+    db: Session, stmt: Any, keys: list[SortKey], *, cursor: str | None, limit: int | None
+) -> tuple[list[Any], str | None]:
+    stmt = stmt.add_columns(*(expr for expr, _, _ in keys)).order_by(
+        *(expr.desc() if descending else expr.asc() for expr, descending, _ in keys)
+    )
+    if cursor is not None:
+        stmt = stmt.where(_keyset_after(keys, cursor))
+    if limit is not None:
+        stmt = stmt.limit(limit + 1)
+
+    rows = db.execute(stmt).all()
+    next_cursor = None
+    if limit is not None and len(rows) > limit:
+        rows = rows[:limit]
+        next_cursor = encode_cursor(list(rows[-1][1:]))
+    return [row[0] for row in rows], next_cursor
+
+
+def bump_loan_version(db: Session, *loan_ids: int) -> None:
+    ids = sorted(set(loan_ids))
+    if ids:
+        db.execute(
+            update(models.Loan)
+            .where(models.Loan.id.in_(ids))
+            .values(version=models.Loan.version + 1, modified_at=now_utc())
+            .execution_options(synchronize_session=False)
+        )
 
 
 def create_loan(db: Session, *, title: str) -> models.Loan:
     loan = models.Loan(title=title)
     db.add(loan)
-    db.commit()
-    db.refresh(loan)
+    db.flush()
     create_audit_event(
         db,
         entity_type="loan",
@@ -79,22 +297,98 @@ def create_loan(db: Session, *, title: str) -> models.Loan:
         action=schemas.AuditAction.CREATED,
         details={"title": title},
     )
+    db.commit()
+    db.refresh(loan)
     return loan
 
 
-def list_loans(db: Session) -> list[models.Loan]:
-    return list(db.execute(select(models.Loan).order_by(models.Loan.created_at.desc())).scalars())
+def list_loans(
+    db: Session, *, cursor: str | None = None, limit: int | None = None
+) -> tuple[list[models.Loan], str | None]:
+    keys: list[SortKey] = [
+        (models.Loan.created_at, True, datetime.fromisoformat),
+        (models.Loan.id, True, int),
+    ]
+    return _paginate(db, select(models.Loan), keys, cursor=cursor, limit=limit)
 
 
 def get_loan(db: Session, *, loan_id: int) -> models.Loan | None:
     return db.get(models.Loan, loan_id)
 
 
+def get_loan_version(db: Session, *, loan_id: int) -> int | None:
+    return db.scalar(select(models.Loan.version).where(models.Loan.id == loan_id))
+
+
+def portfolio_version(db: Session) -> tuple[int, int]:
+    count, total = db.execute(
+        select(func.count(models.Loan.id), func.coalesce(func.sum(models.Loan.version), 0))
+    ).one()
+    return count, total
+
+
+def _write_loan_text(db: Session, *, loan_id: int, text: str) -> None:
+    search_index.remove_loan_text(db, loan_id=loan_id)
+    db.execute(
+        delete(models.LoanDocumentChunk).where(models.LoanDocumentChunk.loan_id == loan_id)
+    )
+    chunks = document_store.split_chunks(text)
+    rows = []
+    for chunk_index, (first_page, chunk) in enumerate(chunks):
+        codec, data = document_store.compress(chunk)
+        rows.append(
+            {
+                "loan_id": loan_id,
+                "chunk_index": chunk_index,
+                "first_page": first_page,
+                "codec": codec,
+                "data": data,
+                "size_bytes": len(chunk.encode("utf-8")),
+            }
+        )
+    chunk_ids = db.scalars(
+        insert(models.LoanDocumentChunk).returning(
+            models.LoanDocumentChunk.id, sort_by_parameter_order=True
+        ),
+        rows,
+    )
+    search_index.index_loan_text(db, [(i, chunk) for i, (_, chunk) in zip(chunk_ids, chunks)])
+
+
+def get_loan_text(db: Session, *, loan_id: int) -> str | None:
+    c = models.LoanDocumentChunk
+    chunks = db.execute(
+        select(c.codec, c.data).where(c.loan_id == loan_id).order_by(c.chunk_index)
+    ).all()
+    if not chunks:
+        return None
+    return document_store.join_chunks([document_store.decompress(*chunk) for chunk in chunks])
+
+
+def migrate_legacy_loan_text(db: Session, *, batch_size: int = 50) -> int:
+    migrated = 0
+    while True:
+        rows = db.execute(
+            select(models.Loan.id, models.Loan.raw_text)
+            .where(models.Loan.raw_text.is_not(None))
+            .limit(batch_size)
+        ).all()
+        if not rows:
+            return migrated
+        for loan_id, text in rows:
+            _write_loan_text(db, loan_id=loan_id, text=text)
+        db.execute(
+            update(models.Loan)
+            .where(models.Loan.id.in_([loan_id for loan_id, _ in rows]))
+            .values(raw_text=None)
+        )
+        db.commit()
+        migrated += len(rows)
+
+
 def store_loan_text(db: Session, *, loan: models.Loan, text: str) -> models.Loan:
-    loan.raw_text = text
-    db.add(loan)
-    db.commit()
-    db.refresh(loan)
+    _write_loan_text(db, loan_id=loan.id, text=text)
+    bump_loan_version(db, loan.id)
     create_audit_event(
         db,
         entity_type="loan",
@@ -102,31 +396,135 @@ def store_loan_text(db: Session, *, loan: models.Loan, text: str) -> models.Loan
         action=schemas.AuditAction.UPDATED,
         details={"raw_text_length": len(text)},
     )
+    db.commit()
+    db.refresh(loan)
     return loan
 
 
+def _search_row(
+    obligation: models.Obligation, values: dict[str, Any] | None = None
+) -> dict[str, Any]:
+    row = {f: getattr(obligation, f) for f in search_index.SEARCH_FIELDS}
+    row.update({f: v for f, v in (values or {}).items() if f in search_index.SEARCH_FIELDS})
+    return {"id": obligation.id, **row}
+
+
+ReminderTarget = tuple[str, datetime | None, bool]
+
+
+def _reminder_target(
+    obligation: models.Obligation, values: dict[str, Any] | None = None
+) -> ReminderTarget:
+    v = values or {}
+    return (
+        v.get("obligation_type", obligation.obligation_type),
+        v.get("effective_due_at", obligation.effective_due_at),
+        v.get("status", obligation.status) != schemas.ObligationStatus.COMPLETED.value,
+    )
+
+
+def _schedule_reminders(
+    db: Session,
+    targets: dict[int, ReminderTarget],
+    *,
+    replace: bool = True,
+    now: datetime | None = None,
+) -> None:
+    if not targets or not reminders.enabled():
+        return
+    n = now or now_utc()
+    r = models.Reminder
+    ids = list(targets)
+    kept: set[tuple[int, datetime, int]] = set()
+    retried: dict[tuple[int, datetime, int], int] = {}
+    if replace:
+        db.execute(
+            delete(r)
+            .where(r.obligation_id.in_(ids), r.status == schemas.ReminderStatus.PENDING.value)
+            .execution_options(synchronize_session=False)
+        )
+        done = (schemas.ReminderStatus.SENT.value, schemas.ReminderStatus.SENDING.value)
+        for reminder_id, obligation_id, due_at, days, status in db.execute(
+            select(r.id, r.obligation_id, r.due_at, r.lead_days, r.status).where(
+                r.obligation_id.in_(ids)
+            )
+        ):
+            if status in done:
+                kept.add((obligation_id, due_at, days))
+            else:
+                # A cancelled or failed reminder for a deadline that is back on the calendar
+                # goes out again; sent_to keeps the sinks that already have it.
+                retried[(obligation_id, due_at, days)] = reminder_id
+
+    planned = [
+        {"obligation_id": obligation_id, "lead_days": days, "due_at": due_at, "remind_at": remind_at}
+        for obligation_id, (obligation_type, due_at, is_open) in targets.items()
+        if is_open and due_at is not None
+        for days, remind_at in reminders.plan(obligation_type, due_at, now=n)
+        if (obligation_id, due_at, days) not in kept
+    ]
+    rows = []
+    resets = []
+    for row in planned:
+        reminder_id = retried.get((row["obligation_id"], row["due_at"], row["lead_days"]))
+        if reminder_id is None:
+            rows.append(row)
+        else:
+            resets.append(
+                {
+                    "id": reminder_id,
+                    "status": schemas.ReminderStatus.PENDING.value,
+                    "remind_at": row["remind_at"],
+                    "attempts": 0,
+                    "last_error": None,
+                }
+            )
+    if resets:
+        db.execute(update(r), resets)
+    if rows:
+        db.execute(insert(r), rows)
+    if planned:
+        # Picked up by the reminder scheduler once the transaction commits.
+        earliest = min(row["remind_at"] for row in planned)
+        noted = db.info.get("reminder_at")
+        db.info["reminder_at"] = earliest if noted is None else min(noted, earliest)
+
+
+def _obligation_values(
+    *, loan_id: int, obligation_in: schemas.ObligationCreate, now: datetime | None = None
+) -> dict[str, Any]:
+    values: dict[str, Any] = {
+        "loan_id": loan_id,
+        "name": obligation_in.name,
+        "obligation_type": obligation_in.obligation_type.value,
+        "description": obligation_in.description or "",
+        "party_responsible": obligation_in.party_responsible or "",
+        "frequency": obligation_in.frequency.value,
+        "due_date": obligation_in.due_date,
+        "due_rule": obligation_in.due_rule,
+        "next_due_at": obligation_in.next_due_at,
+        "status": (obligation_in.status.value if obligation_in.status else "ON_TRACK"),
+        "confidence": obligation_in.confidence,
+        "source_excerpt": obligation_in.source_excerpt,
+        "source_page": obligation_in.source_page,
+    }
+    values["effective_due_at"] = due_at_from(values["next_due_at"], values["due_date"])
+    values["anchor_day"] = values["effective_due_at"].day if values["effective_due_at"] else None
+    values["status"] = compute_status(
+        current_status=values["status"], due_at=values["effective_due_at"], now=now
+    )
+    return values
+
+
 def create_obligation(
     db: Session, *, loan_id: int, obligation_in: schemas.ObligationCreate
 ) -> models.Obligation:
-    obligation = models.Obligation(
-        loan_id=loan_id,
-        name=obligation_in.name,
-        obligation_type=obligation_in.obligation_type.value,
-        description=obligation_in.description or "",
-        party_responsible=obligation_in.party_responsible or "",
-        frequency=obligation_in.frequency.value,
-        due_date=obligation_in.due_date,
-        due_rule=obligation_in.due_rule,
-        next_due_at=obligation_in.next_due_at,
-        status=(obligation_in.status.value if obligation_in.status else "ON_TRACK"),
-        confidence=obligation_in.confidence,
-        source_excerpt=obligation_in.source_excerpt,
-        source_page=obligation_in.source_page,
-    )
-    refresh_status_in_memory(obligation)
+    obligation = models.Obligation(**_obligation_values(loan_id=loan_id, obligation_in=obligation_in))
     db.add(obligation)
-    db.commit()
-    db.refresh(obligation)
+    db.flush()
+    search_index.index_obligations(db, [_search_row(obligation)])
+    _schedule_reminders(db, {obligation.id: _reminder_target(obligation)}, replace=False)
+    bump_loan_version(db, loan_id)
     create_audit_event(
         db,
         entity_type="obligation",
@@ -134,48 +532,507 @@ def create_obligation(
         action=schemas.AuditAction.CREATED,
         details={"loan_id": loan_id, "name": obligation.name, "frequency": obligation.frequency},
     )
+    db.commit()
+    db.refresh(obligation)
     return obligation
 
 
-def list_obligations_for_loan(db: Session, *, loan_id: int) -> list[models.Obligation]:
-    obligations = list(
+def bulk_create_obligations(
+    db: Session, *, loan_id: int, obligations_in: list[schemas.ObligationCreate]
+) -> list[models.Obligation]:
+    if not obligations_in:
+        return []
+
+    n = now_utc()
+    rows = [_obligation_values(loan_id=loan_id, obligation_in=o, now=n) for o in obligations_in]
+    created = list(
+        db.scalars(
+            insert(models.Obligation)
+            .returning(models.Obligation)
+            .execution_options(render_nulls=True),
+            rows,
+        )
+    )
+    create_audit_events(
+        db,
+        [
+            _audit_values(
+                entity_type="obligation",
+                entity_id=o.id,
+                action=schemas.AuditAction.CREATED,
+                details={"loan_id": loan_id, "name": o.name, "frequency": o.frequency},
+            )
+            for o in created
+        ],
+    )
+    search_index.index_obligations(db, [_search_row(o) for o in created])
+    _schedule_reminders(db, {o.id: _reminder_target(o) for o in created}, replace=False, now=n)
+    ids = [o.id for o in created]
+    bump_loan_version(db, loan_id)
+    db.commit()
+
+    return list(
+        db.scalars(
+            select(models.Obligation)
+            .where(models.Obligation.id.in_(ids))
+            .order_by(models.Obligation.id)
+        )
+    )
+
+
+def _extracted_key(name: str, obligation_type: str, due_rule: str | None) -> tuple[str, str, str]:
+    return name, obligation_type, due_rule or ""
+
+
+def ingest_extracted_obligations(
+    db: Session, *, loan_id: int, extracted: list[schemas.ExtractedObligation]
+) -> tuple[list[models.Obligation], list[models.Obligation]]:
+    existing: dict[tuple[str, str, str], models.Obligation] = {}
+    names = {o.name for o in extracted}
+    if names:
+        for o in db.execute(
+            select(models.Obligation).where(
+                models.Obligation.loan_id == loan_id, models.Obligation.name.in_(names)
+            )
+        ).scalars():
+            existing.setdefault(_extracted_key(o.name, o.obligation_type, o.due_rule), o)
+
+    fresh: list[schemas.ObligationCreate] = []
+    matched: list[models.Obligation] = []
+    seen: set[tuple[str, str, str]] = set()
+    for o in extracted:
+        key = _extracted_key(o.name, o.obligation_type.value, o.due_rule)
+        if key in seen:
+            continue
+        seen.add(key)
+        if key in existing:
+            matched.append(existing[key])
+        else:
+            fresh.append(o.to_create())
+
+    return bulk_create_obligations(db, loan_id=loan_id, obligations_in=fresh), matched
+
+
+def get_cached_extraction(
+    db: Session, *, cache_key: str, max_age: timedelta | None = None
+) -> list[schemas.ExtractedObligation] | None:
+    entry = db.execute(
+        select(models.ExtractionCacheEntry).where(models.ExtractionCacheEntry.cache_key == cache_key)
+    ).scalar_one_or_none()
+    if entry is None:
+        return None
+    if max_age is not None and entry.created_at < now_utc() - max_age:
+        db.delete(entry)
+        db.commit()
+        return None
+    return [schemas.ExtractedObligation.model_validate(o) for o in json.loads(entry.result_json)]
+
+
+def store_cached_extraction(
+    db: Session,
+    *,
+    cache_key: str,
+    extractor: str,
+    extractor_version: str,
+    text_hash: str,
+    extracted: list[schemas.ExtractedObligation],
+    max_entries: int,
+    max_bytes: int,
+) -> None:
+    # Due dates are stored as their DueSpec and recomputed on every hit.
+    result_json = json.dumps(
+        [
+            {
+                **o.model_dump(mode="json", exclude={"due_date", "next_due_at"}),
+                "due_spec": o.due_spec.model_dump(mode="json") if o.due_spec else None,
+            }
+            for o in extracted
+        ]
+    )
+    db.add(
+        models.ExtractionCacheEntry(
+            cache_key=cache_key,
+            extractor=extractor,
+            extractor_version=extractor_version,
+            text_hash=text_hash,
+            result_json=result_json,
+            size_bytes=len(result_json.encode("utf-8")),
+        )
+    )
+    try:
+        db.commit()
+    except IntegrityError:
+        db.rollback()
+        return
+    evict_extraction_cache(db, max_entries=max_entries, max_bytes=max_bytes)
+
+
+def evict_extraction_cache(db: Session, *, max_entries: int, max_bytes: int) -> int:
+    c = models.ExtractionCacheEntry
+    count, total = db.execute(select(func.count(c.id), func.coalesce(func.sum(c.size_bytes), 0))).one()
+    if count <= max_entries and total <= max_bytes:
+        return 0
+
+    doomed: list[int] = []
+    for entry_id, size in db.execute(
+        select(c.id, c.size_bytes).order_by(c.last_used_at, c.id).execution_options(yield_per=500)
+    ):
+        if count <= max_entries and total <= max_bytes:
+            break
+        doomed.append(entry_id)
+        count -= 1
+        total -= size
+    db.execute(delete(c).where(c.id.in_(doomed)))
+    db.commit()
+    return len(doomed)
+
+
+def _queue_extraction_job(
+    db: Session, job: models.ExtractionJob, *, extractor_version: str, text: str
+) -> None:
+    job.extractor_version = extractor_version
+    job.text = text
+    job.status = schemas.JobStatus.QUEUED.value
+    job.error = None
+    job.started_at = None
+    job.finished_at = None
+    job.claimed_by = None
+    job.lease_expires_at = None
+    db.add(job)
+
+
+def submit_extraction_job(
+    db: Session, *, loan_id: int, extractor: str, extractor_version: str, text: str
+) -> tuple[models.ExtractionJob, bool]:
+    digest = extractor_service.text_hash(text)
+    j = models.ExtractionJob
+    same_input = select(j).where(j.loan_id == loan_id, j.extractor == extractor, j.text_hash == digest)
+    stmt = same_input.where(j.extractor_version == extractor_version)
+    job = db.execute(stmt).scalar_one_or_none()
+    if job is not None and job.status != schemas.JobStatus.FAILED.value:
+        return job, False
+
+    if job is None:
+        job = j(loan_id=loan_id, extractor=extractor, text_hash=digest)
+    _queue_extraction_job(db, job, extractor_version=extractor_version, text=text)
+    try:
+        db.commit()
+    except IntegrityError:
+        db.rollback()
+        job = db.execute(stmt).scalar_one_or_none()
+        if job is not None:
+            return job, False
+        # Tables created before jobs were versioned keep a (loan, extractor, text_hash) key;
+        # rerun that row under the new version instead.
+        job = db.execute(same_input).scalar_one()
+        if job.status in (schemas.JobStatus.QUEUED.value, schemas.JobStatus.RUNNING.value):
+            return job, False
+        _queue_extraction_job(db, job, extractor_version=extractor_version, text=text)
+        db.commit()
+    db.refresh(job)
+    return job, True
+
+
+def get_extraction_job(db: Session, *, job_id: int) -> models.ExtractionJob | None:
+    return db.get(models.ExtractionJob, job_id)
+
+
+def _stale_job_lease(now: datetime) -> ColumnElement[bool]:
+    j = models.ExtractionJob
+    return and_(
+        j.status == schemas.JobStatus.RUNNING.value,
+        or_(j.lease_expires_at.is_(None), j.lease_expires_at < now),
+    )
+
+
+def list_claimable_extraction_jobs(
+    db: Session, *, now: datetime | None = None, queued_before: datetime | None = None
+) -> list[int]:
+    n = now or now_utc()
+    j = models.ExtractionJob
+    queued = j.status == schemas.JobStatus.QUEUED.value
+    if queued_before is not None:
+        queued = and_(queued, j.created_at < queued_before)
+    return list(db.scalars(select(j.id).where(or_(queued, _stale_job_lease(n))).order_by(j.id)))
+
+
+def claim_extraction_job(
+    db: Session, *, job_id: int, worker_id: str, lease: timedelta, now: datetime | None = None
+) -> models.ExtractionJob | None:
+    n = now or now_utc()
+    j = models.ExtractionJob
+    claimed = db.scalar(
+        update(j)
+        .where(
+            j.id == job_id,
+            j.text.is_not(None),
+            or_(j.status == schemas.JobStatus.QUEUED.value, _stale_job_lease(n)),
+        )
+        .values(
+            status=schemas.JobStatus.RUNNING.value,
+            started_at=n,
+            claimed_by=worker_id,
+            lease_expires_at=n + lease,
+        )
+        .returning(j.id)
+        .execution_options(synchronize_session=False)
+    )
+    db.commit()
+    return db.get(j, claimed, populate_existing=True) if claimed is not None else None
+
+
+def renew_extraction_job_leases(
+    db: Session, *, job_ids: list[int], worker_id: str, lease: timedelta, now: datetime | None = None
+) -> None:
+    if not job_ids:
+        return
+    j = models.ExtractionJob
+    db.execute(
+        update(j)
+        .where(
+            j.id.in_(job_ids),
+            j.status == schemas.JobStatus.RUNNING.value,
+            j.claimed_by == worker_id,
+        )
+        .values(lease_expires_at=(now or now_utc()) + lease)
+        .execution_options(synchronize_session=False)
+    )
+    db.commit()
+
+
+def _finish_extraction_job(db: Session, *, job: models.ExtractionJob, **values: Any) -> bool:
+    j = models.ExtractionJob
+    # Only the worker still holding the claim may record a result.
+    finished = db.scalar(
+        update(j)
+        .where(
+            j.id == job.id,
+            j.status == schemas.JobStatus.RUNNING.value,
+            j.claimed_by == job.claimed_by,
+        )
+        .values(finished_at=now_utc(), lease_expires_at=None, **values)
+        .returning(j.id)
+        .execution_options(synchronize_session=False)
+    )
+    if finished is None:
+        db.rollback()
+        return False
+    return True
+
+
+def complete_extraction_job(
+    db: Session,
+    *,
+    job: models.ExtractionJob,
+    extracted: list[schemas.ExtractedObligation],
+) -> models.ExtractionJob | None:
+    if not _finish_extraction_job(db, job=job, status=schemas.JobStatus.SUCCEEDED.value, text=None):
+        return None
+    created, matched = ingest_extracted_obligations(db, loan_id=job.loan_id, extracted=extracted)
+    db.execute(
+        update(models.ExtractionJob)
+        .where(models.ExtractionJob.id == job.id)
+        .values(obligation_ids=[o.id for o in [*created, *matched]])
+        .execution_options(synchronize_session=False)
+    )
+    db.commit()
+    db.refresh(job)
+    return job
+
+
+def fail_extraction_job(
+    db: Session, *, job: models.ExtractionJob, error: str
+) -> models.ExtractionJob | None:
+    if not _finish_extraction_job(db, job=job, status=schemas.JobStatus.FAILED.value, error=error):
+        return None
+    db.commit()
+    db.refresh(job)
+    return job
+
+
+_STATUS_RANK = {
+    schemas.ObligationStatus.OVERDUE.value: 0,
+    schemas.ObligationStatus.DUE_SOON.value: 1,
+    schemas.ObligationStatus.ON_TRACK.value: 2,
+    schemas.ObligationStatus.COMPLETED.value: 3,
+}
+
+
+def _obligation_sort_keys(sort: schemas.ObligationSort) -> list[SortKey]:
+    o = models.Obligation
+    due_keys: list[SortKey] = [
+        (case((o.effective_due_at.is_(None), 1), else_=0), False, int),
+        (o.effective_due_at, False, datetime.fromisoformat),
+    ]
+    if sort == "due":
+        return [*due_keys, (o.id, False, int)]
+    if sort == "status":
+        rank = case(_STATUS_RANK, value=o.status, else_=len(_STATUS_RANK))
+        return [(rank, False, int), *due_keys, (o.id, False, int)]
+    if sort == "confidence":
+        return [
+            (case((o.confidence.is_(None), 1), else_=0), False, int),
+            (o.confidence, True, float),
+            (o.id, True, int),
+        ]
+    return [(o.created_at, True, datetime.fromisoformat), (o.id, True, int)]
+
+
+def list_obligations_for_loan(
+    db: Session,
+    *,
+    loan_id: int,
+    status: list[schemas.ObligationStatus] | None = None,
+    obligation_type: list[schemas.ObligationType] | None = None,
+    frequency: list[schemas.Frequency] | None = None,
+    party_responsible: str | None = None,
+    due_from: date | None = None,
+    due_to: date | None = None,
+    sort: schemas.ObligationSort = "created",
+    cursor: str | None = None,
+    limit: int | None = None,
+) -> tuple[list[models.Obligation], str | None]:
+    o = models.Obligation
+    stmt = select(o).where(o.loan_id == loan_id)
+    if status:
+        stmt = stmt.where(o.status.in_([s.value for s in status]))
+    if obligation_type:
+        stmt = stmt.where(o.obligation_type.in_([t.value for t in obligation_type]))
+    if frequency:
+        stmt = stmt.where(o.frequency.in_([f.value for f in frequency]))
+    if party_responsible is not None:
+        stmt = stmt.where(o.party_responsible == party_responsible)
+    if due_from is not None:
+        stmt = stmt.where(o.effective_due_at >= datetime.combine(due_from, time.min))
+    if due_to is not None:
+        stmt = stmt.where(o.effective_due_at < datetime.combine(due_to + timedelta(days=1), time.min))
+    return _paginate(db, stmt, _obligation_sort_keys(sort), cursor=cursor, limit=limit)
+
+
+def list_upcoming_obligations(
+    db: Session,
+    *,
+    days: int = 14,
+    party_responsible: str | None = None,
+    cursor: str | None = None,
+    limit: int | None = None,
+    now: datetime | None = None,
+) -> tuple[list[models.Obligation], str | None]:
+    n = now or now_utc()
+    o = models.Obligation
+    stmt = (
+        select(o)
+        .join(o.loan)
+        .options(contains_eager(o.loan))
+        .where(
+            o.status != schemas.ObligationStatus.COMPLETED.value,
+            o.effective_due_at <= n + timedelta(days=days),
+        )
+    )
+    if party_responsible is not None:
+        stmt = stmt.where(o.party_responsible == party_responsible)
+    keys: list[SortKey] = [
+        (o.effective_due_at, False, datetime.fromisoformat),
+        (o.id, False, int),
+    ]
+    return _paginate(db, stmt, keys, cursor=cursor, limit=limit)
+
+
+def list_obligations_by_ids(db: Session, *, obligation_ids: list[int]) -> list[models.Obligation]:
+    if not obligation_ids:
+        return []
+    return list(
         db.execute(
             select(models.Obligation)
-            .where(models.Obligation.loan_id == loan_id)
-            .order_by(models.Obligation.created_at.desc())
+            .where(models.Obligation.id.in_(obligation_ids))
+            .order_by(models.Obligation.id)
         ).scalars()
     )
-    n = now_utc()
-    for o in obligations:
-        refresh_status_in_memory(o, now=n)
-    return obligations
 
 
 def get_obligation(db: Session, *, obligation_id: int) -> models.Obligation | None:
-    obligation = db.get(models.Obligation, obligation_id)
-    if obligation:
-        refresh_status_in_memory(obligation)
-    return obligation
+    return db.get(models.Obligation, obligation_id)
 
 
-def update_obligation(
-    db: Session, *, obligation: models.Obligation, obligation_in: schemas.ObligationUpdate
-) -> models.Obligation:
-    patch = obligation_in.model_dump(exclude_unset=True)
+def _patch_changes(
+    obligation: models.Obligation, patch: dict[str, Any], now: datetime | None = None
+) -> tuple[dict[str, Any], dict[str, Any]]:
+    values: dict[str, Any] = {}
     changed: dict[str, Any] = {}
-
     for field_name, value in patch.items():
         if field_name in {"obligation_type", "frequency", "status"} and value is not None:
             value = value.value
         if getattr(obligation, field_name) != value:
             changed[field_name] = {"from": getattr(obligation, field_name), "to": value}
-            setattr(obligation, field_name, value)
+            values[field_name] = value
 
-    refresh_status_in_memory(obligation)
-    db.add(obligation)
-    db.commit()
-    db.refresh(obligation)
+    values["effective_due_at"] = due_at_from(
+        values.get("next_due_at", obligation.next_due_at),
+        values.get("due_date", obligation.due_date),
+    )
+    if "next_due_at" in values or "due_date" in values:
+        # A user-set deadline re-anchors the schedule; completions keep the original day.
+        eff = values["effective_due_at"]
+        values["anchor_day"] = eff.day if eff else None
+    values["status"] = compute_status(
+        current_status=values.get("status", obligation.status),
+        due_at=values["effective_due_at"],
+        now=now,
+    )
+    return values, changed
 
+
+def _completion_changes(
+    obligation: models.Obligation, now: datetime | None = None
+) -> tuple[dict[str, Any], dict[str, Any]]:
+    details: dict[str, Any] = {"loan_id": obligation.loan_id}
+    due_at = obligation_due_at(obligation)
+    next_due_at = (
+        recurrence.next_occurrence_after(due_at, obligation.frequency, day=obligation.anchor_day)
+        if due_at
+        else None
+    )
+    if next_due_at is None:
+        return {"status": schemas.ObligationStatus.COMPLETED.value}, details
+
+    details["completed_due_at"] = due_at
+    details["next_due_at"] = next_due_at
+    if obligation.next_due_at:
+        values: dict[str, Any] = {"next_due_at": next_due_at}
+    else:
+        values = {"due_date": next_due_at.date()}
+    values["effective_due_at"] = due_at_from(values.get("next_due_at"), values.get("due_date"))
+    values["status"] = compute_status(
+        current_status=schemas.ObligationStatus.ON_TRACK.value,
+        due_at=values["effective_due_at"],
+        now=now,
+    )
+    return values, details
+
+
+def _reopen_changes(obligation: models.Obligation, now: datetime | None = None) -> dict[str, Any]:
+    return {
+        "status": compute_status(
+            current_status=schemas.ObligationStatus.ON_TRACK.value,
+            due_at=obligation_due_at(obligation),
+            now=now,
+        )
+    }
+
+
+def update_obligation(
+    db: Session, *, obligation: models.Obligation, obligation_in: schemas.ObligationUpdate
+) -> models.Obligation:
+    values, changed = _patch_changes(obligation, obligation_in.model_dump(exclude_unset=True))
+    reschedule = _reminder_target(obligation) != _reminder_target(obligation, values)
+    for field_name, value in values.items():
+        setattr(obligation, field_name, value)
+    db.add(obligation)
+    if changed.keys() & set(search_index.SEARCH_FIELDS):
+        search_index.reindex_obligations(db, [_search_row(obligation)])
+    if reschedule:
+        _schedule_reminders(db, {obligation.id: _reminder_target(obligation)})
+    bump_loan_version(db, obligation.loan_id)
     if changed:
         create_audit_event(
             db,
@@ -184,31 +1041,37 @@ def update_obligation(
             action=schemas.AuditAction.UPDATED,
             details={"loan_id": obligation.loan_id, "changes": changed},
         )
-
+    db.commit()
+    db.refresh(obligation)
     return obligation
 
 
 def set_obligation_completed(db: Session, *, obligation: models.Obligation) -> models.Obligation:
-    obligation.status = schemas.ObligationStatus.COMPLETED.value
+    values, details = _completion_changes(obligation)
+    for field_name, value in values.items():
+        setattr(obligation, field_name, value)
     db.add(obligation)
-    db.commit()
-    db.refresh(obligation)
+    _schedule_reminders(db, {obligation.id: _reminder_target(obligation)})
+    bump_loan_version(db, obligation.loan_id)
     create_audit_event(
         db,
         entity_type="obligation",
         entity_id=obligation.id,
         action=schemas.AuditAction.COMPLETED,
-        details={"loan_id": obligation.loan_id},
+        details=details,
     )
+    db.commit()
+    db.refresh(obligation)
     return obligation
 
 
 def reopen_obligation(db: Session, *, obligation: models.Obligation) -> models.Obligation:
-    obligation.status = schemas.ObligationStatus.ON_TRACK.value
-    refresh_status_in_memory(obligation)
+    reschedule = obligation.status == schemas.ObligationStatus.COMPLETED.value
+    obligation.status = _reopen_changes(obligation)["status"]
     db.add(obligation)
-    db.commit()
-    db.refresh(obligation)
+    if reschedule:
+        _schedule_reminders(db, {obligation.id: _reminder_target(obligation)})
+    bump_loan_version(db, obligation.loan_id)
     create_audit_event(
         db,
         entity_type="obligation",
@@ -216,33 +1079,472 @@ def reopen_obligation(db: Session, *, obligation: models.Obligation) -> models.O
         action=schemas.AuditAction.UPDATED,
         details={"reopened": True, "loan_id": obligation.loan_id},
     )
+    db.commit()
+    db.refresh(obligation)
     return obligation
 
 
-def delete_obligation(db: Session, *, obligation: models.Obligation) -> None:
-    obligation_id = obligation.id
-    loan_id = obligation.loan_id
-    db.delete(obligation)
-    db.commit()
-    create_audit_event(
+def _delete_obligations(db: Session, obligations: list[models.Obligation]) -> list[str]:
+    ids = [o.id for o in obligations]
+    hashes = list(
+        db.scalars(
+            select(models.Evidence.sha256).where(
+                models.Evidence.obligation_id.in_(ids), models.Evidence.sha256.is_not(None)
+            )
+        )
+    )
+    db.execute(delete(models.UploadSession).where(models.UploadSession.obligation_id.in_(ids)))
+    db.execute(delete(models.Reminder).where(models.Reminder.obligation_id.in_(ids)))
+    db.execute(delete(models.Evidence).where(models.Evidence.obligation_id.in_(ids)))
+    db.execute(
+        delete(models.Obligation)
+        .where(models.Obligation.id.in_(ids))
+        .execution_options(synchronize_session=False)
+    )
+    search_index.remove_obligations(db, ids)
+    orphaned = _release_blobs(db, hashes) if hashes else []
+    bump_loan_version(db, *(o.loan_id for o in obligations))
+    create_audit_events(
         db,
-        entity_type="obligation",
-        entity_id=obligation_id,
-        action=schemas.AuditAction.DELETED,
-        details={"loan_id": loan_id},
+        [
+            _audit_values(
+                entity_type="obligation",
+                entity_id=o.id,
+                action=schemas.AuditAction.DELETED,
+                details={"loan_id": o.loan_id},
+            )
+            for o in obligations
+        ],
+    )
+    for o in obligations:
+        db.expunge(o)
+    return orphaned
+
+
+def delete_obligation(db: Session, *, obligation: models.Obligation) -> list[str]:
+    orphaned = _delete_obligations(db, [obligation])
+    db.commit()
+    return orphaned
+
+
+def _load_batch(
+    db: Session, obligation_ids: list[int]
+) -> tuple[list[models.Obligation], dict[int, str]]:
+    ids = list(dict.fromkeys(obligation_ids))
+    found = {o.id: o for o in list_obligations_by_ids(db, obligation_ids=ids)}
+    errors = {i: "Obligation not found" for i in ids if i not in found}
+    return [found[i] for i in ids if i in found], errors
+
+
+def _apply_batch(
+    db: Session,
+    obligations: list[models.Obligation],
+    rows: list[dict[str, Any]],
+    audits: list[dict[str, Any]],
+) -> list[models.Obligation]:
+    ids = [o.id for o in obligations]
+    values = {row["id"]: row for row in rows}
+    targets = {
+        o.id: _reminder_target(o, values.get(o.id))
+        for o in obligations
+        if _reminder_target(o, values.get(o.id)) != _reminder_target(o)
+    }
+    if rows:
+        db.execute(update(models.Obligation), rows)
+    _schedule_reminders(db, targets)
+    if values:
+        bump_loan_version(db, *(o.loan_id for o in obligations if o.id in values))
+    create_audit_events(db, audits)
+    db.commit()
+    return list_obligations_by_ids(db, obligation_ids=ids)
+
+
+def batch_complete_obligations(
+    db: Session, *, obligation_ids: list[int]
+) -> tuple[list[models.Obligation], dict[int, str]]:
+    obligations, errors = _load_batch(db, obligation_ids)
+    n = now_utc()
+    rows: list[dict[str, Any]] = []
+    audits: list[dict[str, Any]] = []
+    for o in obligations:
+        values, details = _completion_changes(o, now=n)
+        rows.append({"id": o.id, "updated_at": n, **values})
+        audits.append(
+            _audit_values(
+                entity_type="obligation",
+                entity_id=o.id,
+                action=schemas.AuditAction.COMPLETED,
+                details=details,
+            )
+        )
+    return _apply_batch(db, obligations, rows, audits), errors
+
+
+def batch_reopen_obligations(
+    db: Session, *, obligation_ids: list[int]
+) -> tuple[list[models.Obligation], dict[int, str]]:
+    obligations, errors = _load_batch(db, obligation_ids)
+    n = now_utc()
+    rows = [{"id": o.id, "updated_at": n, **_reopen_changes(o, now=n)} for o in obligations]
+    audits = [
+        _audit_values(
+            entity_type="obligation",
+            entity_id=o.id,
+            action=schemas.AuditAction.UPDATED,
+            details={"reopened": True, "loan_id": o.loan_id},
+        )
+        for o in obligations
+    ]
+    return _apply_batch(db, obligations, rows, audits), errors
+
+
+def batch_update_obligations(
+    db: Session, *, patches: list[schemas.ObligationPatch]
+) -> tuple[list[models.Obligation], dict[int, str]]:
+    counts = Counter(p.id for p in patches)
+    duplicates = {i for i, n in counts.items() if n > 1}
+    obligations, errors = _load_batch(db, [i for i in counts if i not in duplicates])
+    errors.update({i: "Obligation appears more than once in batch" for i in duplicates})
+    by_id = {o.id: o for o in obligations}
+    n = now_utc()
+    rows: list[dict[str, Any]] = []
+    audits: list[dict[str, Any]] = []
+    reindex: list[dict[str, Any]] = []
+    for patch in patches:
+        o = by_id.get(patch.id)
+        if o is None:
+            continue
+        values, changed = _patch_changes(
+            o, patch.model_dump(exclude_unset=True, exclude={"id"}), now=n
+        )
+        if not changed:
+            continue
+        rows.append({"id": o.id, "updated_at": n, **values})
+        if changed.keys() & set(search_index.SEARCH_FIELDS):
+            reindex.append(_search_row(o, values))
+        audits.append(
+            _audit_values(
+                entity_type="obligation",
+                entity_id=o.id,
+                action=schemas.AuditAction.UPDATED,
+                details={"loan_id": o.loan_id, "changes": changed},
+            )
+        )
+    search_index.reindex_obligations(db, reindex)
+    return _apply_batch(db, obligations, rows, audits), errors
+
+
+def batch_delete_obligations(
+    db: Session, *, obligation_ids: list[int]
+) -> tuple[list[int], dict[int, str], list[str], list[str]]:
+    obligations, errors = _load_batch(db, obligation_ids)
+    if not obligations:
+        return [], errors, [], []
+    ids = [o.id for o in obligations]
+    upload_ids = list(
+        db.scalars(
+            select(models.UploadSession.id).where(models.UploadSession.obligation_id.in_(ids))
+        )
+    )
+    orphaned = _delete_obligations(db, obligations)
+    db.commit()
+    return ids, errors, orphaned, upload_ids
+
+
+def sweep_statuses(
+    db: Session,
+    *,
+    since: datetime | None = None,
+    now: datetime | None = None,
+    batch_size: int = 500,
+) -> int:
+    n = now or now_utc()
+    o = models.Obligation
+    status = status_expression(n)
+    stmt = (
+        select(o.id, o.loan_id, o.status, status)
+        .where(o.status != schemas.ObligationStatus.COMPLETED.value, o.status != status)
+        .order_by(o.id)
+        .limit(batch_size)
+    )
+    if since is not None:
+        window = timedelta(days=14)
+        stmt = stmt.where(
+            or_(
+                o.effective_due_at.between(since, n),
+                o.effective_due_at.between(since + window, n + window),
+            )
+        )
+
+    swept = 0
+    while True:
+        rows = db.execute(stmt).all()
+        if not rows:
+            break
+        db.execute(update(o), [{"id": row[0], "status": row[3]} for row in rows])
+        create_audit_events(
+            db,
+            [
+                _audit_values(
+                    entity_type="obligation",
+                    entity_id=obligation_id,
+                    action=schemas.AuditAction.UPDATED,
+                    details={
+                        "loan_id": loan_id,
+                        "changes": {"status": {"from": old_status, "to": new_status}},
+                        "swept": True,
+                    },
+                )
+                for obligation_id, loan_id, old_status, new_status in rows
+            ],
+        )
+        bump_loan_version(db, *(row[1] for row in rows))
+        db.commit()
+        swept += len(rows)
+        if len(rows) < batch_size:
+            break
+    return swept
+
+
+def backfill_reminders(db: Session, *, batch_size: int = 1000, now: datetime | None = None) -> int:
+    n = now or now_utc()
+    o = models.Obligation
+    last_id = 0
+    scheduled = 0
+    while True:
+        rows = db.execute(
+            select(o.id, o.obligation_type, o.effective_due_at)
+            .where(
+                o.id > last_id,
+                o.status != schemas.ObligationStatus.COMPLETED.value,
+                o.effective_due_at > n,
+            )
+            .order_by(o.id)
+            .limit(batch_size)
+        ).all()
+        if not rows:
+            break
+        _schedule_reminders(
+            db, {i: (obligation_type, due_at, True) for i, obligation_type, due_at in rows}, now=n
+        )
+        db.commit()
+        scheduled += len(rows)
+        last_id = rows[-1][0]
+    return scheduled
+
+
+def next_reminder_at(db: Session) -> datetime | None:
+    r = models.Reminder
+    return db.scalar(
+        select(func.min(r.remind_at)).where(r.status == schemas.ReminderStatus.PENDING.value)
+    )
+
+
+def claim_due_reminders(
+    db: Session,
+    *,
+    worker_id: str,
+    lease: timedelta,
+    now: datetime | None = None,
+    limit: int = 500,
+) -> list[Any]:
+    n = now or now_utc()
+    r = models.Reminder
+    o = models.Obligation
+    pending = schemas.ReminderStatus.PENDING.value
+    rows = db.execute(
+        select(r.id, r.obligation_id, r.lead_days, r.due_at, o.status, o.effective_due_at)
+        .join(o, o.id == r.obligation_id)
+        .where(r.status == pending, r.remind_at <= n)
+        .order_by(r.remind_at, r.id)
+        .limit(limit)
+        .with_for_update(skip_locked=True, of=r)
+    ).all()
+    if not rows:
+        return []
+
+    cancelled: dict[int, str] = {}
+    keep: dict[int, tuple[int, int]] = {}
+    for reminder_id, obligation_id, lead_days, due_at, status, effective_due_at in rows:
+        if status == schemas.ObligationStatus.COMPLETED.value or effective_due_at != due_at:
+            cancelled[reminder_id] = "Obligation completed or rescheduled"
+        elif due_at <= n:
+            cancelled[reminder_id] = "Deadline passed before delivery"
+        elif obligation_id in keep and keep[obligation_id][1] <= lead_days:
+            cancelled[reminder_id] = "Superseded by a shorter lead time"
+        else:
+            if obligation_id in keep:
+                cancelled[keep[obligation_id][0]] = "Superseded by a shorter lead time"
+            keep[obligation_id] = (reminder_id, lead_days)
+
+    if cancelled:
+        db.execute(
+            update(r),
+            [
+                {"id": i, "status": schemas.ReminderStatus.CANCELLED.value, "last_error": reason}
+                for i, reason in cancelled.items()
+            ],
+        )
+    claimed: list[int] = []
+    if keep:
+        claimed = list(
+            db.scalars(
+                update(r)
+                .where(r.id.in_([i for i, _ in keep.values()]), r.status == pending)
+                .values(
+                    status=schemas.ReminderStatus.SENDING.value,
+                    attempts=r.attempts + 1,
+                    claimed_by=worker_id,
+                    lease_expires_at=now_utc() + lease,
+                )
+                .returning(r.id)
+                .execution_options(synchronize_session=False)
+            )
+        )
+    db.commit()
+    if not claimed:
+        return []
+    return list(
+        db.execute(
+            select(
+                r.id,
+                r.obligation_id,
+                o.loan_id,
+                models.Loan.title.label("loan_title"),
+                o.name,
+                o.obligation_type,
+                o.party_responsible,
+                r.due_at,
+                r.lead_days,
+                r.attempts,
+                r.sent_to,
+            )
+            .join(o, o.id == r.obligation_id)
+            .join(models.Loan, models.Loan.id == o.loan_id)
+            .where(r.id.in_(claimed))
+            .order_by(r.remind_at, r.id)
+        )
+    )
+
+
+def save_reminder_states(db: Session, rows: list[dict[str, Any]]) -> None:
+    if rows:
+        db.execute(update(models.Reminder), rows)
+    db.commit()
+
+
+def renew_reminder_leases(
+    db: Session, *, reminder_ids: list[int], worker_id: str, lease: timedelta
+) -> None:
+    if not reminder_ids:
+        return
+    r = models.Reminder
+    db.execute(
+        update(r)
+        .where(
+            r.id.in_(reminder_ids),
+            r.status == schemas.ReminderStatus.SENDING.value,
+            r.claimed_by == worker_id,
+        )
+        .values(lease_expires_at=now_utc() + lease)
+        .execution_options(synchronize_session=False)
     )
+    db.commit()
+
+
+def fail_interrupted_reminders(db: Session, *, now: datetime | None = None) -> int:
+    r = models.Reminder
+    # Only reminders whose owner stopped renewing its lease; live schedulers keep theirs.
+    result = db.execute(
+        update(r)
+        .where(
+            r.status == schemas.ReminderStatus.SENDING.value,
+            or_(r.lease_expires_at.is_(None), r.lease_expires_at < (now or now_utc())),
+        )
+        .values(
+            status=schemas.ReminderStatus.FAILED.value,
+            last_error="Interrupted during delivery",
+            claimed_by=None,
+            lease_expires_at=None,
+        )
+        .execution_options(synchronize_session=False)
+    )
+    db.commit()
+    return result.rowcount
+
+
+def _acquire_blob(db: Session, *, sha256: str, file_path: str, size_bytes: int) -> None:
+    b = models.EvidenceBlob
+    for _ in range(2):
+        bumped = db.execute(
+            update(b).where(b.sha256 == sha256).values(ref_count=b.ref_count + 1)
+        ).rowcount
+        if bumped:
+            return
+        try:
+            with db.begin_nested():
+                db.add(b(sha256=sha256, file_path=file_path, size_bytes=size_bytes, ref_count=1))
+            return
+        except IntegrityError:
+            continue
+    raise RuntimeError(f"Could not reference evidence blob {sha256}")
+
+
+def _release_blobs(db: Session, hashes: list[str]) -> list[str]:
+    b = models.EvidenceBlob
+    counts: dict[str, int] = {}
+    for sha256 in hashes:
+        counts[sha256] = counts.get(sha256, 0) + 1
+    for sha256, n in counts.items():
+        db.execute(update(b).where(b.sha256 == sha256).values(ref_count=b.ref_count - n))
+    return list(db.scalars(select(b.sha256).where(b.sha256.in_(counts), b.ref_count <= 0)))
+
+
+def remove_orphaned_blobs(db: Session, *, hashes: list[str]) -> int:
+    b = models.EvidenceBlob
+    removed = 0
+    for sha256 in hashes:
+        # The row is deleted only while still unreferenced, and the file is unlinked before
+        # commit, so a concurrent upload of the same content waits and then writes it back.
+        rel_path = db.scalar(
+            delete(b).where(b.sha256 == sha256, b.ref_count <= 0).returning(b.file_path)
+        )
+        if rel_path is not None:
+            blob_store.remove_blob(rel_path)
+            removed += 1
+        db.commit()
+    return removed
 
 
 def create_evidence(
-    db: Session, *, obligation_id: int, filename: str, file_path: str, note: str | None
-) -> models.Evidence:
+    db: Session,
+    *,
+    obligation_id: int,
+    filename: str,
+    note: str | None,
+    blob: blob_store.StagedBlob,
+    upload_id: str | None = None,
+) -> models.Evidence | None:
+    if upload_id is not None:
+        # The upload session goes in the same transaction as the evidence row.
+        u = models.UploadSession
+        if not db.execute(delete(u).where(u.id == upload_id, u.claimed_at.is_not(None))).rowcount:
+            db.rollback()
+            return None
     obligation = db.get(models.Obligation, obligation_id)
+    _acquire_blob(db, sha256=blob.sha256, file_path=blob.rel_path, size_bytes=blob.size_bytes)
     evidence = models.Evidence(
-        obligation_id=obligation_id, filename=filename, file_path=file_path, note=note
+        obligation_id=obligation_id,
+        filename=filename,
+        file_path=blob.rel_path,
+        sha256=blob.sha256,
+        size_bytes=blob.size_bytes,
+        note=note,
     )
     db.add(evidence)
-    db.commit()
-    db.refresh(evidence)
+    db.flush()
+    if obligation:
+        bump_loan_version(db, obligation.loan_id)
     create_audit_event(
         db,
         entity_type="evidence",
@@ -252,11 +1554,169 @@ def create_evidence(
             "loan_id": obligation.loan_id if obligation else None,
             "obligation_id": obligation_id,
             "filename": filename,
+            "sha256": blob.sha256,
         },
     )
+    db.commit()
+    # Place only once the reference is committed: a failed commit leaves the staged file
+    # for a retry, and the committed ref_count keeps orphan cleanup away from the blob.
+    try:
+        blob_store.place_blob(blob)
+    except BaseException:
+        _undo_evidence(db, evidence=evidence, loan_id=obligation.loan_id if obligation else None)
+        raise
+    db.refresh(evidence)
     return evidence
 
 
+def _undo_evidence(db: Session, *, evidence: models.Evidence, loan_id: int | None) -> None:
+    db.delete(evidence)
+    orphaned = _release_blobs(db, [evidence.sha256])
+    if loan_id is not None:
+        bump_loan_version(db, loan_id)
+    create_audit_event(
+        db,
+        entity_type="evidence",
+        entity_id=evidence.id,
+        action=schemas.AuditAction.DELETED,
+        details={"loan_id": loan_id, "obligation_id": evidence.obligation_id},
+    )
+    db.commit()
+    remove_orphaned_blobs(db, hashes=orphaned)
+
+
+def create_upload_session(
+    db: Session,
+    *,
+    upload_id: str,
+    obligation_id: int,
+    filename: str,
+    size_bytes: int,
+    note: str | None,
+    expires_at: datetime,
+) -> models.UploadSession:
+    upload = models.UploadSession(
+        id=upload_id,
+        obligation_id=obligation_id,
+        filename=filename,
+        size_bytes=size_bytes,
+        note=note,
+        expires_at=expires_at,
+    )
+    db.add(upload)
+    db.commit()
+    db.refresh(upload)
+    return upload
+
+
+def get_upload_session(db: Session, *, upload_id: str) -> models.UploadSession | None:
+    return db.get(models.UploadSession, upload_id)
+
+
+def claim_upload_session(
+    db: Session, *, upload_id: str, stale_after: timedelta, now: datetime | None = None
+) -> models.UploadSession | None:
+    n = now or now_utc()
+    u = models.UploadSession
+    claimed = db.scalar(
+        update(u)
+        .where(
+            u.id == upload_id,
+            u.expires_at > n,
+            or_(u.claimed_at.is_(None), u.claimed_at < n - stale_after),
+        )
+        .values(claimed_at=n)
+        .returning(u.id)
+        .execution_options(synchronize_session=False)
+    )
+    db.commit()
+    return db.get(u, claimed, populate_existing=True) if claimed is not None else None
+
+
+def release_upload_session(db: Session, *, upload_id: str) -> None:
+    u = models.UploadSession
+    db.execute(
+        update(u)
+        .where(u.id == upload_id)
+        .values(claimed_at=None)
+        .execution_options(synchronize_session=False)
+    )
+    db.commit()
+
+
+def pending_upload_bytes(db: Session, *, now: datetime | None = None) -> int:
+    u = models.UploadSession
+    return db.execute(
+        select(func.coalesce(func.sum(u.size_bytes), 0)).where(u.expires_at > (now or now_utc()))
+    ).scalar_one()
+
+
+def delete_upload_sessions(db: Session, *, upload_ids: list[str]) -> None:
+    if upload_ids:
+        db.execute(delete(models.UploadSession).where(models.UploadSession.id.in_(upload_ids)))
+        db.commit()
+
+
+def list_upload_sessions(db: Session, *, obligation_id: int) -> list[str]:
+    u = models.UploadSession
+    return list(db.scalars(select(u.id).where(u.obligation_id == obligation_id)))
+
+
+def list_expired_upload_sessions(db: Session, *, now: datetime | None = None) -> list[str]:
+    u = models.UploadSession
+    return list(db.scalars(select(u.id).where(u.expires_at <= (now or now_utc()))))
+
+
+def list_obligations_with_evidence(db: Session, *, loan_id: int) -> list[models.Obligation]:
+    return list(
+        db.execute(
+            select(models.Obligation)
+            .where(models.Obligation.loan_id == loan_id)
+            .order_by(models.Obligation.created_at.desc())
+            .options(selectinload(models.Obligation.evidence))
+        ).scalars()
+    )
+
+
+def list_occurrences(
+    db: Session, *, start: datetime, end: datetime, loan_id: int | None = None
+) -> list[recurrence.Occurrence]:
+    o = models.Obligation
+    recurring = [f.value for f in schemas.Frequency if recurrence.is_recurring(f.value)]
+    stmt = select(
+        o.id, o.loan_id, o.name, o.obligation_type, o.frequency, o.effective_due_at, o.anchor_day
+    ).where(
+        o.status != schemas.ObligationStatus.COMPLETED.value,
+        o.effective_due_at <= end,
+        or_(o.frequency.in_(recurring), o.effective_due_at >= start),
+    ).order_by(o.id)
+    if loan_id is not None:
+        stmt = stmt.where(o.loan_id == loan_id)
+
+    rows = db.execute(stmt.execution_options(yield_per=2000))
+    return recurrence.expand_occurrences(rows, start=start, end=end)
+
+
+def calendar_feed_state(
+    db: Session, *, loan_id: int | None = None, party_responsible: str | None = None
+) -> tuple[datetime | None, int, int]:
+    stmt = select(func.max(models.Obligation.updated_at), func.count(models.Obligation.id))
+    # Loan.modified_at moves with every version bump, deletes included, so the feed's
+    # Last-Modified cannot stay behind its ETag.
+    version_stmt = select(
+        func.max(models.Loan.modified_at), func.coalesce(func.sum(models.Loan.version), 0)
+    )
+    if loan_id is not None:
+        stmt = stmt.where(models.Obligation.loan_id == loan_id)
+        version_stmt = version_stmt.where(models.Loan.id == loan_id)
+    if party_responsible is not None:
+        stmt = stmt.where(models.Obligation.party_responsible == party_responsible)
+    updated_at, count = db.execute(stmt).one()
+    modified_at, version = db.execute(version_stmt).one()
+    stamps = [t for t in (updated_at, modified_at) if t is not None]
+    return (max(stamps) if stamps else None), count, version
+
+
 def list_evidence(db: Session, *, obligation_id: int) -> list[models.Evidence]:
     return list(
         db.execute(
@@ -267,17 +1727,96 @@ def list_evidence(db: Session, *, obligation_id: int) -> list[models.Evidence]:
     )
 
 
+def list_evidence_for_loan(db: Session, *, loan_id: int) -> list[models.Evidence]:
+    return list(
+        db.execute(
+            select(models.Evidence)
+            .join(models.Obligation, models.Obligation.id == models.Evidence.obligation_id)
+            .where(models.Obligation.loan_id == loan_id)
+            .order_by(models.Evidence.obligation_id, models.Evidence.id)
+        ).scalars()
+    )
+
+
 def get_evidence(db: Session, *, evidence_id: int) -> models.Evidence | None:
     return db.get(models.Evidence, evidence_id)
 
 
-def loan_summary(db: Session, *, loan_id: int) -> schemas.LoanSummary:
-    obligations = list_obligations_for_loan(db, loan_id=loan_id)
-    total = len(obligations)
-    due_soon = sum(1 for o in obligations if o.status == schemas.ObligationStatus.DUE_SOON.value)
-    overdue = sum(1 for o in obligations if o.status == schemas.ObligationStatus.OVERDUE.value)
-    on_track = sum(1 for o in obligations if o.status == schemas.ObligationStatus.ON_TRACK.value)
-    completed = sum(1 for o in obligations if o.status == schemas.ObligationStatus.COMPLETED.value)
+def _summary_from_counts(counts: dict[str, int]) -> schemas.LoanSummary:
     return schemas.LoanSummary(
-        total=total, due_soon=due_soon, overdue=overdue, on_track=on_track, completed=completed
+        total=sum(counts.values()),
+        due_soon=counts.get(schemas.ObligationStatus.DUE_SOON.value, 0),
+        overdue=counts.get(schemas.ObligationStatus.OVERDUE.value, 0),
+        on_track=counts.get(schemas.ObligationStatus.ON_TRACK.value, 0),
+        completed=counts.get(schemas.ObligationStatus.COMPLETED.value, 0),
     )
+
+
+def _status_counts(
+    db: Session, *, loan_ids: list[int] | None = None, now: datetime | None = None
+) -> dict[int, dict[str, int]]:
+    status = status_expression(now).label("status")
+    stmt = select(models.Obligation.loan_id, status, func.count()).group_by(
+        models.Obligation.loan_id, status
+    )
+    if loan_ids is not None:
+        stmt = stmt.where(models.Obligation.loan_id.in_(loan_ids))
+
+    counts: dict[int, dict[str, int]] = {}
+    for loan_id, status_value, count in db.execute(stmt):
+        counts.setdefault(loan_id, {})[status_value] = count
+    return counts
+
+
+def loan_summary(db: Session, *, loan_id: int, now: datetime | None = None) -> schemas.LoanSummary:
+    counts = _status_counts(db, loan_ids=[loan_id], now=now)
+    return _summary_from_counts(counts.get(loan_id, {}))
+
+
+def portfolio_summary(db: Session, *, now: datetime | None = None) -> schemas.PortfolioSummary:
+    counts = _status_counts(db, now=now)
+    loans = db.execute(
+        select(models.Loan.id, models.Loan.title, models.Loan.created_at).order_by(
+            models.Loan.created_at.desc()
+        )
+    )
+
+    totals: dict[str, int] = {}
+    for loan_counts in counts.values():
+        for status_value, count in loan_counts.items():
+            totals[status_value] = totals.get(status_value, 0) + count
+
+    return schemas.PortfolioSummary(
+        loans=[
+            schemas.LoanDetailOut(
+                id=loan_id,
+                title=title,
+                created_at=created_at,
+                summary=_summary_from_counts(counts.get(loan_id, {})),
+            )
+            for loan_id, title, created_at in loans
+        ],
+        totals=_summary_from_counts(totals),
+    )
+
+
+def next_status_transition(
+    db: Session, *, loan_id: int | None = None, now: datetime | None = None
+) -> datetime | None:
+    n = now or now_utc()
+    window = timedelta(days=14)
+    o = models.Obligation
+
+    def first_due_after(bound: datetime) -> Any:
+        stmt = select(func.min(o.effective_due_at)).where(
+            o.status != schemas.ObligationStatus.COMPLETED.value, o.effective_due_at >= bound
+        )
+        if loan_id is not None:
+            stmt = stmt.where(o.loan_id == loan_id)
+        return stmt.scalar_subquery()
+
+    overdue_at, due_soon_at = db.execute(
+        select(first_due_after(n), first_due_after(n + window))
+    ).one()
+    candidates = [overdue_at, due_soon_at - window if due_soon_at else None]
+    return min((c for c in candidates if c is not None), default=None)
@@ -0,0 +1,114 @@
+from __future__ import annotations
+
+from datetime import date, datetime
+
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app import crud, models, schemas
+
+
+async def get_loan(db: AsyncSession, *, loan_id: int) -> models.Loan | None:
+    return await db.get(models.Loan, loan_id)
+
+
+async def get_loan_version(db: AsyncSession, *, loan_id: int) -> int | None:
+    return await db.run_sync(crud.get_loan_version, loan_id=loan_id)
+
+
+async def portfolio_version(db: AsyncSession) -> tuple[int, int]:
+    return await db.run_sync(crud.portfolio_version)
+
+
+async def next_status_transition(
+    db: AsyncSession, *, loan_id: int | None = None, now: datetime | None = None
+) -> datetime | None:
+    return await db.run_sync(crud.next_status_transition, loan_id=loan_id, now=now)
+
+
+async def list_loans(
+    db: AsyncSession, *, cursor: str | None = None, limit: int | None = None
+) -> tuple[list[models.Loan], str | None]:
+    return await db.run_sync(crud.list_loans, cursor=cursor, limit=limit)
+
+
+async def loan_summary(
+    db: AsyncSession, *, loan_id: int, now: datetime | None = None
+) -> schemas.LoanSummary:
+    return await db.run_sync(crud.loan_summary, loan_id=loan_id, now=now)
+
+
+async def portfolio_summary(
+    db: AsyncSession, *, now: datetime | None = None
+) -> schemas.PortfolioSummary:
+    return await db.run_sync(crud.portfolio_summary, now=now)
+
+
+async def list_upcoming_obligations(
+    db: AsyncSession,
+    *,
+    days: int = 14,
+    party_responsible: str | None = None,
+    cursor: str | None = None,
+    limit: int | None = None,
+    now: datetime | None = None,
+) -> tuple[list[models.Obligation], str | None]:
+    return await db.run_sync(
+        crud.list_upcoming_obligations,
+        days=days,
+        party_responsible=party_responsible,
+        cursor=cursor,
+        limit=limit,
+        now=now,
+    )
+
+
+async def list_obligations_for_loan(
+    db: AsyncSession,
+    *,
+    loan_id: int,
+    status: list[schemas.ObligationStatus] | None = None,
+    obligation_type: list[schemas.ObligationType] | None = None,
+    frequency: list[schemas.Frequency] | None = None,
+    party_responsible: str | None = None,
+    due_from: date | None = None,
+    due_to: date | None = None,
+    sort: schemas.ObligationSort = "created",
+    cursor: str | None = None,
+    limit: int | None = None,
+) -> tuple[list[models.Obligation], str | None]:
+    return await db.run_sync(
+        crud.list_obligations_for_loan,
+        loan_id=loan_id,
+        status=status,
+        obligation_type=obligation_type,
+        frequency=frequency,
+        party_responsible=party_responsible,
+        due_from=due_from,
+        due_to=due_to,
+        sort=sort,
+        cursor=cursor,
+        limit=limit,
+    )
+
+
+async def list_audit_events(
+    db: AsyncSession,
+    *,
+    loan_id: int | None = None,
+    obligation_id: int | None = None,
+    action: schemas.AuditAction | None = None,
+    since: datetime | None = None,
+    until: datetime | None = None,
+    cursor: str | None = None,
+    limit: int = 200,
+) -> tuple[list[models.AuditEvent], str | None]:
+    return await db.run_sync(
+        crud.list_audit_events,
+        loan_id=loan_id,
+        obligation_id=obligation_id,
+        action=action,
+        since=since,
+        until=until,
+        cursor=cursor,
+        limit=limit,
+    )
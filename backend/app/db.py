@@ -1,28 +1,211 @@
 from __future__ import annotations
 
 import os
+from typing import Any
 
-from sqlalchemy import create_engine
+from sqlalchemy import Engine, create_engine, event, inspect, make_url, text
+from sqlalchemy.ext.asyncio import (
+    AsyncEngine,
+    AsyncSession,
+    async_sessionmaker,
+    create_async_engine,
+)
 from sqlalchemy.orm import DeclarativeBase, sessionmaker
+from sqlalchemy.pool import QueuePool
+from sqlalchemy.schema import CreateColumn
+
+from app.services import metrics
 
 DATABASE_URL = os.getenv("DATABASE_URL", "sqlite:///./covenantops.db")
+DATABASE_READ_URL = os.getenv("DATABASE_READ_URL") or None
+
+
+def _is_sqlite(url: str) -> bool:
+    return url.startswith("sqlite")
+
+
+def _is_memory_sqlite(url: str) -> bool:
+    return url in ("sqlite://", "sqlite:///:memory:") or "mode=memory" in url
+
+
+def _sqlite_pragmas(url: str, *, read_only: bool) -> list[str]:
+    pragmas = [
+        f"PRAGMA busy_timeout = {int(os.getenv('SQLITE_BUSY_TIMEOUT_MS', '5000'))}",
+        f"PRAGMA synchronous = {os.getenv('SQLITE_SYNCHRONOUS', 'NORMAL')}",
+        f"PRAGMA cache_size = {int(os.getenv('SQLITE_CACHE_SIZE', '-65536'))}",
+        f"PRAGMA mmap_size = {int(os.getenv('SQLITE_MMAP_SIZE', str(256 * 1024 * 1024)))}",
+        "PRAGMA temp_store = MEMORY",
+    ]
+    if not _is_memory_sqlite(url):
+        pragmas.insert(0, f"PRAGMA journal_mode = {os.getenv('SQLITE_JOURNAL_MODE', 'WAL')}")
+    if read_only:
+        pragmas.append("PRAGMA query_only = ON")
+    return pragmas
+
+
+def _engine_kwargs(url: str) -> dict[str, Any]:
+    if _is_sqlite(url):
+        return {"connect_args": {"check_same_thread": False}}
+    return {
+        "pool_size": int(os.getenv("DB_POOL_SIZE", "10")),
+        "max_overflow": int(os.getenv("DB_MAX_OVERFLOW", "20")),
+        "pool_timeout": float(os.getenv("DB_POOL_TIMEOUT_SECONDS", "30")),
+        "pool_recycle": int(os.getenv("DB_POOL_RECYCLE_SECONDS", "1800")),
+        "pool_pre_ping": os.getenv("DB_POOL_PRE_PING", "1") != "0",
+    }
+
+
+def _configure(target: Engine, url: str, *, read_only: bool) -> Engine:
+    metrics.instrument_engine(target)
+    if _is_sqlite(url):
+        pragmas = _sqlite_pragmas(url, read_only=read_only)
+
+        @event.listens_for(target, "connect")
+        def _set_pragmas(dbapi_connection: Any, _record: Any) -> None:
+            cursor = dbapi_connection.cursor()
+            for pragma in pragmas:
+                cursor.execute(pragma)
+            cursor.close()
 
-_connect_args: dict[str, object] = {}
-if DATABASE_URL.startswith("sqlite"):
-    _connect_args = {"check_same_thread": False}
+    elif read_only and target.dialect.name == "postgresql":
 
-engine = create_engine(DATABASE_URL, connect_args=_connect_args)
+        @event.listens_for(target, "connect")
+        def _set_read_only(dbapi_connection: Any, _record: Any) -> None:
+            cursor = dbapi_connection.cursor()
+            cursor.execute("SET SESSION CHARACTERISTICS AS TRANSACTION READ ONLY")
+            cursor.close()
+            dbapi_connection.commit()
+
+    return target
+
+
+def build_engine(url: str, *, read_only: bool = False) -> Engine:
+    return _configure(create_engine(url, **_engine_kwargs(url)), url, read_only=read_only)
+
+
+def async_url(url: str) -> str:
+    parsed = make_url(url)
+    if parsed.get_backend_name() == "sqlite":
+        return parsed.set(drivername="sqlite+aiosqlite").render_as_string(hide_password=False)
+    if parsed.get_backend_name() == "postgresql":
+        return parsed.set(drivername="postgresql+asyncpg").render_as_string(hide_password=False)
+    return url
+
+
+def build_async_engine(url: str, *, read_only: bool = False) -> AsyncEngine:
+    built = create_async_engine(async_url(url), **_engine_kwargs(url))
+    _configure(built.sync_engine, url, read_only=read_only)
+    return built
+
+
+engine = build_engine(DATABASE_URL)
+read_engine = build_engine(DATABASE_READ_URL, read_only=True) if DATABASE_READ_URL else engine
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+ReadSessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=read_engine)
+
+
+_async_sessions: dict[bool, async_sessionmaker[AsyncSession]] = {}
+
+
+def async_session_factory(*, read_only: bool = False) -> async_sessionmaker[AsyncSession]:
+    factory = _async_sessions.get(read_only)
+    if factory is None:
+        if read_only and not DATABASE_READ_URL:
+            factory = async_session_factory()
+        else:
+            url = DATABASE_READ_URL if read_only else DATABASE_URL
+            factory = async_sessionmaker(
+                bind=build_async_engine(url, read_only=read_only),
+                autoflush=False,
+                expire_on_commit=False,
+            )
+        _async_sessions[read_only] = factory
+    return factory
+
+
+async def dispose_async_engines() -> None:
+    engines = {factory.kw["bind"] for factory in _async_sessions.values()}
+    _async_sessions.clear()
+    for target in engines:
+        await target.dispose()
+
+
+def pool_stats(target: Engine) -> dict[str, Any]:
+    pool = target.pool
+    stats: dict[str, Any] = {"class": type(pool).__name__, "status": pool.status()}
+    if isinstance(pool, QueuePool):
+        stats.update(
+            size=pool.size(),
+            checked_in=pool.checkedin(),
+            checked_out=pool.checkedout(),
+            overflow=pool.overflow(),
+        )
+    return stats
+
+
+def database_stats() -> dict[str, Any]:
+    stats: dict[str, Any] = {
+        "dialect": engine.dialect.name,
+        "pool": pool_stats(engine),
+        "read_pool": pool_stats(read_engine) if read_engine is not engine else None,
+    }
+    with engine.connect() as conn:
+        conn.execute(text("SELECT 1"))
+        if engine.dialect.name == "sqlite":
+            stats["journal_mode"] = conn.execute(text("PRAGMA journal_mode")).scalar()
+            if stats["journal_mode"] == "wal":
+                busy, log_frames, checkpointed = conn.execute(
+                    text("PRAGMA wal_checkpoint(PASSIVE)")
+                ).one()
+                stats["wal"] = {
+                    "busy": bool(busy),
+                    "log_frames": log_frames,
+                    "checkpointed_frames": checkpointed,
+                }
+    return stats
 
 
 class Base(DeclarativeBase):
     pass
 
 
+def _add_missing_columns() -> set[tuple[str, str]]:
+    inspector = inspect(engine)
+    added: set[tuple[str, str]] = set()
+    with engine.begin() as conn:
+        for table in Base.metadata.sorted_tables:
+            existing = {c["name"] for c in inspector.get_columns(table.name)}
+            for column in table.columns:
+                if column.name in existing:
+                    continue
+                column_ddl = CreateColumn(column).compile(dialect=engine.dialect)
+                conn.execute(text(f"ALTER TABLE {table.name} ADD COLUMN {column_ddl}"))
+                added.add((table.name, column.name))
+    return added
+
+
 def init_db() -> None:
-    from app import models  # noqa: F401
+    from app import crud, models  # noqa: F401
+    from app.services import search_index
 
+    reminders_created = not inspect(engine).has_table("reminders")
     Base.metadata.create_all(bind=engine)
+    added = _add_missing_columns()
+    for table in Base.metadata.sorted_tables:
+        for index in table.indexes:
+            index.create(bind=engine, checkfirst=True)
+    search_created = search_index.create_schema(engine)
+
+    with SessionLocal() as db:
+        if ("audit_events", "loan_id") in added:
+            crud.backfill_audit_links(db)
+        if ("obligations", "effective_due_at") in added:
+            crud.backfill_effective_due_at(db)
+        if reminders_created:
+            crud.backfill_reminders(db)
+        if search_created:
+            search_index.rebuild(db)
+        crud.migrate_legacy_loan_text(db)
 
 
 def get_db():
@@ -31,3 +214,21 @@ def get_db():
         yield db
     finally:
         db.close()
+
+
+def get_read_db():
+    db = ReadSessionLocal()
+    try:
+        yield db
+    finally:
+        db.close()
+
+
+async def get_async_db():
+    async with async_session_factory()() as db:
+        yield db
+
+
+async def get_async_read_db():
+    async with async_session_factory(read_only=True)() as db:
+        yield db
@@ -1,10 +1,19 @@
 from __future__ import annotations
 
+from typing import Any
+
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import PlainTextResponse
 
-from app.db import init_db
-from app.routers import evidence, exports, loans, obligations
+from app.db import database_stats, dispose_async_engines, init_db
+from app.routers import evidence, exports, extraction_jobs, loans, obligations, search, uploads
+from app.services import metrics
+from app.services.audit_writer import audit_writer
+from app.services.extraction_jobs import get_extraction_worker
+from app.services.extractor import close_extractors
+from app.services.reminder_scheduler import get_reminder_scheduler
+from app.services.status_sweeper import get_status_sweeper
 
 
 def create_app() -> FastAPI:
@@ -16,12 +25,17 @@ def create_app() -> FastAPI:
         allow_credentials=True,
         allow_methods=["*"],
         allow_headers=["*"],
+        expose_headers=["X-Next-Cursor", "Location", "Upload-Offset", "Retry-After"],
     )
+    app.add_middleware(metrics.MetricsMiddleware)
 
     app.include_router(loans.router, prefix="/api")
     app.include_router(obligations.router, prefix="/api")
     app.include_router(evidence.router, prefix="/api")
+    app.include_router(uploads.router, prefix="/api")
     app.include_router(exports.router, prefix="/api")
+    app.include_router(extraction_jobs.router, prefix="/api")
+    app.include_router(search.router, prefix="/api")
 
     @app.on_event("startup")
     def _startup() -> None:
@@ -30,11 +44,40 @@ def create_app() -> FastAPI:
 
         init_db()
         Path(os.getenv("STORAGE_DIR", "./storage")).mkdir(parents=True, exist_ok=True)
+        audit_writer.start()
+        app.state.status_sweeper = get_status_sweeper()
+        app.state.status_sweeper.start()
+        app.state.extraction_worker = get_extraction_worker()
+        app.state.extraction_worker.start()
+        app.state.reminder_scheduler = get_reminder_scheduler()
+        app.state.reminder_scheduler.start()
+
+    @app.on_event("shutdown")
+    def _shutdown() -> None:
+        app.state.status_sweeper.stop()
+        app.state.extraction_worker.stop()
+        close_extractors()
+        app.state.reminder_scheduler.stop()
+        audit_writer.stop()
+
+    @app.on_event("shutdown")
+    async def _dispose_engines() -> None:
+        await dispose_async_engines()
 
     @app.get("/api/health")
     def health() -> dict[str, str]:
         return {"status": "ok"}
 
+    @app.get("/api/health/db")
+    def health_db() -> dict[str, Any]:
+        return {"status": "ok", **database_stats()}
+
+    @app.get("/api/metrics", response_class=PlainTextResponse, include_in_schema=False)
+    def metrics_endpoint() -> PlainTextResponse:
+        return PlainTextResponse(
+            metrics.registry.render(), media_type="text/plain; version=0.0.4"
+        )
+
     return app
 
 
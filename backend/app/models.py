@@ -2,7 +2,21 @@ from __future__ import annotations
 
 from datetime import date, datetime, timezone
 
-from sqlalchemy import Date, DateTime, Float, ForeignKey, Integer, String, Text
+from sqlalchemy import (
+    JSON,
+    BigInteger,
+    Date,
+    DateTime,
+    Float,
+    ForeignKey,
+    Index,
+    Integer,
+    LargeBinary,
+    String,
+    Text,
+    UniqueConstraint,
+    text,
+)
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
 from app.db import Base
@@ -17,16 +31,45 @@ class Loan(Base):
 
     id: Mapped[int] = mapped_column(Integer, primary_key=True, index=True)
     title: Mapped[str] = mapped_column(String(255), nullable=False)
-    raw_text: Mapped[str | None] = mapped_column(Text, nullable=True)
-    created_at: Mapped[datetime] = mapped_column(DateTime, default=utcnow, nullable=False)
+    raw_text: Mapped[str | None] = mapped_column(Text, nullable=True, deferred=True)
+    version: Mapped[int] = mapped_column(Integer, nullable=False, default=0, server_default="0")
+    modified_at: Mapped[datetime | None] = mapped_column(DateTime, nullable=True)
+    created_at: Mapped[datetime] = mapped_column(
+        DateTime, default=utcnow, nullable=False, index=True
+    )
 
     obligations: Mapped[list["Obligation"]] = relationship(
         back_populates="loan", cascade="all, delete-orphan"
     )
 
 
+class LoanDocumentChunk(Base):
+    __tablename__ = "loan_document_chunks"
+    __table_args__ = (UniqueConstraint("loan_id", "chunk_index"),)
+
+    id: Mapped[int] = mapped_column(Integer, primary_key=True, index=True)
+    loan_id: Mapped[int] = mapped_column(ForeignKey("loans.id"), index=True, nullable=False)
+    chunk_index: Mapped[int] = mapped_column(Integer, nullable=False)
+    first_page: Mapped[int] = mapped_column(Integer, nullable=False)
+    codec: Mapped[str] = mapped_column(String(20), nullable=False)
+    data: Mapped[bytes] = mapped_column(LargeBinary, nullable=False)
+    size_bytes: Mapped[int] = mapped_column(Integer, nullable=False)
+
+
 class Obligation(Base):
     __tablename__ = "obligations"
+    __table_args__ = (
+        Index("ix_obligations_loan_id_created_at", "loan_id", "created_at"),
+        Index("ix_obligations_loan_id_status_next_due_at", "loan_id", "status", "next_due_at"),
+        Index("ix_obligations_loan_id_due_date", "loan_id", "due_date"),
+        Index("ix_obligations_loan_id_effective_due_at", "loan_id", "effective_due_at"),
+        Index(
+            "ix_obligations_open_effective_due_at",
+            "effective_due_at",
+            sqlite_where=text("status != 'COMPLETED'"),
+            postgresql_where=text("status != 'COMPLETED'"),
+        ),
+    )
 
     id: Mapped[int] = mapped_column(Integer, primary_key=True, index=True)
     loan_id: Mapped[int] = mapped_column(ForeignKey("loans.id"), index=True, nullable=False)
@@ -35,10 +78,14 @@ class Obligation(Base):
     description: Mapped[str] = mapped_column(Text, nullable=False, default="")
     party_responsible: Mapped[str] = mapped_column(String(100), nullable=False, default="")
     frequency: Mapped[str] = mapped_column(String(50), nullable=False, default="ONCE")
-    due_date: Mapped[date | None] = mapped_column(Date, nullable=True)
+    due_date: Mapped[date | None] = mapped_column(Date, nullable=True, index=True)
     due_rule: Mapped[str | None] = mapped_column(String(255), nullable=True)
-    next_due_at: Mapped[datetime | None] = mapped_column(DateTime, nullable=True)
-    status: Mapped[str] = mapped_column(String(50), nullable=False, default="ON_TRACK")
+    next_due_at: Mapped[datetime | None] = mapped_column(DateTime, nullable=True, index=True)
+    effective_due_at: Mapped[datetime | None] = mapped_column(DateTime, nullable=True)
+    anchor_day: Mapped[int | None] = mapped_column(Integer, nullable=True)
+    status: Mapped[str] = mapped_column(
+        String(50), nullable=False, default="ON_TRACK", index=True
+    )
     confidence: Mapped[float | None] = mapped_column(Float, nullable=True)
     source_excerpt: Mapped[str | None] = mapped_column(Text, nullable=True)
     source_page: Mapped[int | None] = mapped_column(Integer, nullable=True)
@@ -49,7 +96,9 @@ class Obligation(Base):
 
     loan: Mapped["Loan"] = relationship(back_populates="obligations")
     evidence: Mapped[list["Evidence"]] = relationship(
-        back_populates="obligation", cascade="all, delete-orphan"
+        back_populates="obligation",
+        cascade="all, delete-orphan",
+        order_by="Evidence.uploaded_at.desc()",
     )
 
 
@@ -62,18 +111,116 @@ class Evidence(Base):
     )
     filename: Mapped[str] = mapped_column(String(255), nullable=False)
     file_path: Mapped[str] = mapped_column(String(1024), nullable=False)
+    sha256: Mapped[str | None] = mapped_column(
+        ForeignKey("evidence_blobs.sha256"), index=True, nullable=True
+    )
+    size_bytes: Mapped[int | None] = mapped_column(BigInteger, nullable=True)
     uploaded_at: Mapped[datetime] = mapped_column(DateTime, default=utcnow, nullable=False)
     note: Mapped[str | None] = mapped_column(Text, nullable=True)
 
     obligation: Mapped["Obligation"] = relationship(back_populates="evidence")
 
 
+class EvidenceBlob(Base):
+    __tablename__ = "evidence_blobs"
+
+    sha256: Mapped[str] = mapped_column(String(64), primary_key=True)
+    file_path: Mapped[str] = mapped_column(String(1024), nullable=False)
+    size_bytes: Mapped[int] = mapped_column(BigInteger, nullable=False)
+    ref_count: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+    created_at: Mapped[datetime] = mapped_column(DateTime, default=utcnow, nullable=False)
+
+
+class UploadSession(Base):
+    __tablename__ = "upload_sessions"
+
+    id: Mapped[str] = mapped_column(String(32), primary_key=True)
+    obligation_id: Mapped[int] = mapped_column(
+        ForeignKey("obligations.id"), index=True, nullable=False
+    )
+    filename: Mapped[str] = mapped_column(String(255), nullable=False)
+    note: Mapped[str | None] = mapped_column(Text, nullable=True)
+    size_bytes: Mapped[int] = mapped_column(BigInteger, nullable=False)
+    created_at: Mapped[datetime] = mapped_column(DateTime, default=utcnow, nullable=False)
+    expires_at: Mapped[datetime] = mapped_column(DateTime, index=True, nullable=False)
+    claimed_at: Mapped[datetime | None] = mapped_column(DateTime, nullable=True)
+
+
 class AuditEvent(Base):
     __tablename__ = "audit_events"
+    __table_args__ = (
+        Index("ix_audit_events_loan_id_at", "loan_id", "at"),
+        Index("ix_audit_events_obligation_id_at", "obligation_id", "at"),
+    )
 
     id: Mapped[int] = mapped_column(Integer, primary_key=True, index=True)
     entity_type: Mapped[str] = mapped_column(String(50), nullable=False, index=True)
     entity_id: Mapped[int] = mapped_column(Integer, nullable=False, index=True)
     action: Mapped[str] = mapped_column(String(50), nullable=False, index=True)
     details_json: Mapped[str] = mapped_column(Text, nullable=False, default="{}")
+    loan_id: Mapped[int | None] = mapped_column(Integer, nullable=True)
+    obligation_id: Mapped[int | None] = mapped_column(Integer, nullable=True)
     at: Mapped[datetime] = mapped_column(DateTime, default=utcnow, nullable=False, index=True)
+
+
+class Reminder(Base):
+    __tablename__ = "reminders"
+    __table_args__ = (
+        UniqueConstraint("obligation_id", "due_at", "lead_days"),
+        Index("ix_reminders_status_remind_at", "status", "remind_at"),
+    )
+
+    id: Mapped[int] = mapped_column(Integer, primary_key=True, index=True)
+    obligation_id: Mapped[int] = mapped_column(
+        ForeignKey("obligations.id"), index=True, nullable=False
+    )
+    lead_days: Mapped[int] = mapped_column(Integer, nullable=False)
+    due_at: Mapped[datetime] = mapped_column(DateTime, nullable=False)
+    remind_at: Mapped[datetime] = mapped_column(DateTime, nullable=False)
+    status: Mapped[str] = mapped_column(String(20), nullable=False, default="PENDING")
+    attempts: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+    sent_to: Mapped[list[str]] = mapped_column(JSON, nullable=False, default=list)
+    last_error: Mapped[str | None] = mapped_column(Text, nullable=True)
+    sent_at: Mapped[datetime | None] = mapped_column(DateTime, nullable=True)
+    claimed_by: Mapped[str | None] = mapped_column(String(100), nullable=True)
+    lease_expires_at: Mapped[datetime | None] = mapped_column(DateTime, nullable=True)
+    created_at: Mapped[datetime] = mapped_column(DateTime, default=utcnow, nullable=False)
+
+    obligation: Mapped["Obligation"] = relationship()
+
+
+class ExtractionJob(Base):
+    __tablename__ = "extraction_jobs"
+    __table_args__ = (UniqueConstraint("loan_id", "extractor", "extractor_version", "text_hash"),)
+
+    id: Mapped[int] = mapped_column(Integer, primary_key=True, index=True)
+    loan_id: Mapped[int] = mapped_column(ForeignKey("loans.id"), index=True, nullable=False)
+    extractor: Mapped[str] = mapped_column(String(50), nullable=False)
+    extractor_version: Mapped[str | None] = mapped_column(String(20), nullable=True)
+    text_hash: Mapped[str] = mapped_column(String(64), nullable=False)
+    text: Mapped[str | None] = mapped_column(Text, nullable=True)
+    status: Mapped[str] = mapped_column(String(20), nullable=False, default="QUEUED", index=True)
+    error: Mapped[str | None] = mapped_column(Text, nullable=True)
+    obligation_ids: Mapped[list[int] | None] = mapped_column(JSON, nullable=True)
+    created_at: Mapped[datetime] = mapped_column(DateTime, default=utcnow, nullable=False)
+    started_at: Mapped[datetime | None] = mapped_column(DateTime, nullable=True)
+    finished_at: Mapped[datetime | None] = mapped_column(DateTime, nullable=True)
+    claimed_by: Mapped[str | None] = mapped_column(String(100), nullable=True)
+    lease_expires_at: Mapped[datetime | None] = mapped_column(DateTime, nullable=True)
+
+
+class ExtractionCacheEntry(Base):
+    __tablename__ = "extraction_cache"
+
+    id: Mapped[int] = mapped_column(Integer, primary_key=True, index=True)
+    cache_key: Mapped[str] = mapped_column(String(64), unique=True, nullable=False)
+    extractor: Mapped[str] = mapped_column(String(50), nullable=False)
+    extractor_version: Mapped[str] = mapped_column(String(20), nullable=False)
+    text_hash: Mapped[str] = mapped_column(String(64), nullable=False)
+    result_json: Mapped[str] = mapped_column(Text, nullable=False)
+    size_bytes: Mapped[int] = mapped_column(Integer, nullable=False)
+    hits: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+    created_at: Mapped[datetime] = mapped_column(DateTime, default=utcnow, nullable=False)
+    last_used_at: Mapped[datetime] = mapped_column(
+        DateTime, default=utcnow, nullable=False, index=True
+    )
@@ -1,23 +1,18 @@
 from __future__ import annotations
 
-import os
 from pathlib import Path
-from uuid import uuid4
 
-from fastapi import APIRouter, Depends, File, Form, HTTPException, UploadFile
-from fastapi.responses import FileResponse
+from fastapi import APIRouter, Depends, File, Form, HTTPException, Request, Response, UploadFile
+from fastapi.responses import FileResponse, StreamingResponse
 from sqlalchemy.orm import Session
 
 from app import crud, schemas
-from app.db import get_db
+from app.db import get_db, get_read_db
+from app.services import blob_store, evidence_archive, uploads
 
 router = APIRouter(tags=["evidence"])
 
 
-def _storage_root() -> Path:
-    return Path(os.getenv("STORAGE_DIR", "./storage"))
-
-
 @router.post("/obligations/{obligation_id}/evidence", response_model=schemas.EvidenceOut)
 def upload_evidence(
     obligation_id: int,
@@ -29,52 +24,78 @@ def upload_evidence(
     if not obligation:
         raise HTTPException(status_code=404, detail="Obligation not found")
 
-    root = _storage_root()
-    rel_dir = Path(f"obligation_{obligation_id}")
-    target_dir = root / rel_dir
-    target_dir.mkdir(parents=True, exist_ok=True)
-
-    safe_name = Path(file.filename).name
-    rel_path = rel_dir / f"{uuid4().hex}_{safe_name}"
-    full_path = root / rel_path
-
-    with full_path.open("wb") as f:
-        while True:
-            chunk = file.file.read(1024 * 1024)
-            if not chunk:
-                break
-            f.write(chunk)
-
-    return crud.create_evidence(
-        db,
-        obligation_id=obligation_id,
-        filename=safe_name,
-        file_path=str(rel_path).replace("\\", "/"),
-        note=note,
-    )
+    try:
+        blob = blob_store.stage_blob(file.file, max_bytes=uploads.max_upload_bytes())
+    except blob_store.BlobTooLarge as exc:
+        raise HTTPException(status_code=413, detail=str(exc)) from exc
+    try:
+        return crud.create_evidence(
+            db,
+            obligation_id=obligation_id,
+            filename=Path(file.filename).name,
+            note=note,
+            blob=blob,
+        )
+    finally:
+        blob_store.discard_blob(blob)
 
 
 @router.get("/obligations/{obligation_id}/evidence", response_model=list[schemas.EvidenceOut])
-def list_evidence(obligation_id: int, db: Session = Depends(get_db)):
+def list_evidence(obligation_id: int, db: Session = Depends(get_read_db)):
     obligation = crud.get_obligation(db, obligation_id=obligation_id)
     if not obligation:
         raise HTTPException(status_code=404, detail="Obligation not found")
     return crud.list_evidence(db, obligation_id=obligation_id)
 
 
+def _etag_matches(if_none_match: str | None, etag: str) -> bool:
+    if if_none_match is None:
+        return False
+    tags = [t.strip().removeprefix("W/") for t in if_none_match.split(",")]
+    return "*" in tags or etag in tags
+
+
 @router.get("/evidence/{evidence_id}/download")
-def download_evidence(evidence_id: int, db: Session = Depends(get_db)):
+def download_evidence(evidence_id: int, request: Request, db: Session = Depends(get_read_db)):
     evidence = crud.get_evidence(db, evidence_id=evidence_id)
     if not evidence:
         raise HTTPException(status_code=404, detail="Evidence not found")
 
-    root = _storage_root()
-    full_path = root / Path(evidence.file_path)
+    full_path = blob_store.storage_root() / Path(evidence.file_path)
     if not full_path.exists():
         raise HTTPException(status_code=404, detail="Evidence file missing on disk")
 
+    headers = {"Cache-Control": "private, no-cache"}
+    if evidence.sha256:
+        headers["ETag"] = f'"{evidence.sha256}"'
+        if _etag_matches(request.headers.get("if-none-match"), headers["ETag"]):
+            return Response(status_code=304, headers=headers)
+
     return FileResponse(
         path=str(full_path),
         filename=evidence.filename,
         media_type="application/octet-stream",
+        headers=headers,
+    )
+
+
+@router.get("/loans/{loan_id}/evidence.zip")
+def download_loan_evidence(loan_id: int, db: Session = Depends(get_read_db)):
+    loan = crud.get_loan(db, loan_id=loan_id)
+    if not loan:
+        raise HTTPException(status_code=404, detail="Loan not found")
+
+    root = blob_store.storage_root()
+    members = [
+        evidence_archive.ArchiveMember(
+            arcname=f"obligation-{e.obligation_id}/{e.id}-{Path(e.filename).name}",
+            path=root / Path(e.file_path),
+            modified_at=e.uploaded_at,
+        )
+        for e in crud.list_evidence_for_loan(db, loan_id=loan_id)
+    ]
+    return StreamingResponse(
+        evidence_archive.stream_zip(members),
+        media_type="application/zip",
+        headers={"Content-Disposition": f'attachment; filename="loan-{loan_id}-evidence.zip"'},
     )
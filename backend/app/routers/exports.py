@@ -1,80 +1,141 @@
 from __future__ import annotations
 
-import json
+from datetime import datetime, timezone
+from email.utils import format_datetime, parsedate_to_datetime
+from urllib.parse import quote
 
-from fastapi import APIRouter, Depends, HTTPException, Request, Response
-from fastapi.responses import HTMLResponse
-from sqlalchemy import select
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response
+from fastapi.responses import HTMLResponse, StreamingResponse
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 
-from app import crud, models, schemas
-from app.db import get_db
-from app.services.calendar_export import build_ics
-from app.services.compliance_packet import render_compliance_packet
+from app import crud, crud_async, schemas
+from app.db import get_async_read_db, get_read_db
+from app.services.calendar_export import loan_ics, stream_portfolio_ics
+from app.services.compliance_packet import get_cached_compliance_packet, stream_compliance_packet
 
 router = APIRouter(tags=["exports"])
 
 
+def _feed_headers(*parts: object, last_modified: datetime | None) -> dict[str, str]:
+    headers = {
+        "ETag": '"' + "-".join(str(p) for p in parts) + '"',
+        "Cache-Control": "no-cache",
+    }
+    if last_modified is not None:
+        headers["Last-Modified"] = format_datetime(
+            last_modified.replace(tzinfo=timezone.utc, microsecond=0), usegmt=True
+        )
+    return headers
+
+
+def _not_modified(request: Request, headers: dict[str, str]) -> bool:
+    if_none_match = request.headers.get("if-none-match")
+    if if_none_match is not None:
+        tags = [t.strip().removeprefix("W/") for t in if_none_match.split(",")]
+        return "*" in tags or headers["ETag"] in tags
+
+    if_modified_since = request.headers.get("if-modified-since")
+    if if_modified_since and "Last-Modified" in headers:
+        try:
+            since = parsedate_to_datetime(if_modified_since)
+        except (TypeError, ValueError):
+            return False
+        return parsedate_to_datetime(headers["Last-Modified"]) <= since
+    return False
+
+
 @router.get("/loans/{loan_id}/export.ics")
-def export_ics(loan_id: int, db: Session = Depends(get_db)):
+def export_ics(loan_id: int, request: Request, db: Session = Depends(get_read_db)):
     loan = crud.get_loan(db, loan_id=loan_id)
     if not loan:
         raise HTTPException(status_code=404, detail="Loan not found")
-    obligations = crud.list_obligations_for_loan(db, loan_id=loan_id)
-    ics = build_ics(loan, obligations)
-    headers = {"Content-Disposition": f'attachment; filename="loan-{loan_id}-obligations.ics"'}
-    return Response(content=ics, media_type="text/calendar", headers=headers)
+
+    last_modified, count, version = crud.calendar_feed_state(db, loan_id=loan_id)
+    headers = _feed_headers(
+        "loan",
+        loan_id,
+        version,
+        count,
+        int(last_modified.timestamp()) if last_modified else 0,
+        last_modified=last_modified or loan.created_at,
+    )
+    if _not_modified(request, headers):
+        return Response(status_code=304, headers=headers)
+
+    headers["Content-Disposition"] = f'attachment; filename="loan-{loan_id}-obligations.ics"'
+    return Response(content=loan_ics(db, loan), media_type="text/calendar", headers=headers)
+
+
+@router.get("/portfolio/export.ics")
+def export_portfolio_ics(
+    request: Request, party_responsible: str | None = None, db: Session = Depends(get_read_db)
+):
+    last_modified, count, version = crud.calendar_feed_state(
+        db, party_responsible=party_responsible
+    )
+    headers = _feed_headers(
+        "portfolio",
+        quote(party_responsible or "", safe=""),
+        version,
+        count,
+        int(last_modified.timestamp()) if last_modified else 0,
+        last_modified=last_modified,
+    )
+    if _not_modified(request, headers):
+        return Response(status_code=304, headers=headers)
+
+    headers["Content-Disposition"] = 'attachment; filename="portfolio-obligations.ics"'
+    return StreamingResponse(
+        stream_portfolio_ics(party_responsible=party_responsible),
+        media_type="text/calendar",
+        headers=headers,
+    )
 
 
 @router.get("/loans/{loan_id}/compliance-packet", response_class=HTMLResponse)
-def compliance_packet(loan_id: int, request: Request, db: Session = Depends(get_db)):
+def compliance_packet(loan_id: int, request: Request, db: Session = Depends(get_read_db)):
     loan = crud.get_loan(db, loan_id=loan_id)
     if not loan:
         raise HTTPException(status_code=404, detail="Loan not found")
 
-    obligations = crud.list_obligations_for_loan(db, loan_id=loan_id)
-    evidence_by_obligation_id: dict[int, list[models.Evidence]] = {}
-    for o in obligations:
-        evidence_by_obligation_id[o.id] = crud.list_evidence(db, obligation_id=o.id)
-
     api_base = str(request.base_url).rstrip("/") + "/api"
-    html = render_compliance_packet(
-        loan=loan,
-        obligations=obligations,
-        evidence_by_obligation_id=evidence_by_obligation_id,
-        api_base=api_base,
+    cached = get_cached_compliance_packet(loan=loan, api_base=api_base)
+    if cached is not None:
+        return HTMLResponse(content=cached)
+
+    obligations = crud.list_obligations_with_evidence(db, loan_id=loan_id)
+    return StreamingResponse(
+        stream_compliance_packet(loan=loan, obligations=obligations, api_base=api_base),
+        media_type="text/html; charset=utf-8",
     )
-    return HTMLResponse(content=html)
 
 
 @router.get("/audit", response_model=list[schemas.AuditEventOut])
-def audit(loan_id: int | None = None, obligation_id: int | None = None, db: Session = Depends(get_db)):
-    events = list(
-        db.execute(select(models.AuditEvent).order_by(models.AuditEvent.at.desc()).limit(200)).scalars()
-    )
-
-    def matches_filters(e: models.AuditEvent) -> bool:
-        if loan_id is None and obligation_id is None:
-            return True
-
-        details: dict[str, object] = {}
-        try:
-            details = json.loads(e.details_json or "{}")
-        except Exception:
-            details = {}
-
-        if loan_id is not None:
-            if e.entity_type == "loan" and e.entity_id == loan_id:
-                pass
-            elif details.get("loan_id") != loan_id:
-                return False
-
-        if obligation_id is not None:
-            if e.entity_type == "obligation" and e.entity_id == obligation_id:
-                return True
-            if details.get("obligation_id") != obligation_id:
-                return False
-
-        return True
-
-    return [e for e in events if matches_filters(e)]
+async def audit(
+    response: Response,
+    loan_id: int | None = None,
+    obligation_id: int | None = None,
+    action: schemas.AuditAction | None = None,
+    since: datetime | None = None,
+    until: datetime | None = None,
+    cursor: str | None = None,
+    limit: int = Query(default=200, ge=1, le=1000),
+    db: AsyncSession = Depends(get_async_read_db),
+):
+    try:
+        events, next_cursor = await crud_async.list_audit_events(
+            db,
+            loan_id=loan_id,
+            obligation_id=obligation_id,
+            action=action,
+            since=since,
+            until=until,
+            cursor=cursor,
+            limit=limit,
+        )
+    except ValueError as exc:
+        raise HTTPException(status_code=400, detail=str(exc)) from exc
+    if next_cursor:
+        response.headers["X-Next-Cursor"] = next_cursor
+    return events
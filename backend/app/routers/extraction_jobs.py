@@ -0,0 +1,62 @@
+from __future__ import annotations
+
+from fastapi import APIRouter, Depends, HTTPException, Request, Response
+from sqlalchemy.orm import Session
+
+from app import crud, schemas
+from app.db import get_db, get_read_db
+from app.services.extraction_cache import extractor_identity
+from app.services.extractor import get_extractor
+
+router = APIRouter(tags=["extraction"])
+
+
+@router.post(
+    "/loans/{loan_id}/extraction-jobs",
+    response_model=schemas.ExtractionJobOut,
+    status_code=202,
+)
+def submit_extraction_job(
+    loan_id: int,
+    request: Request,
+    response: Response,
+    payload: schemas.ExtractIn | None = None,
+    db: Session = Depends(get_db),
+):
+    loan = crud.get_loan(db, loan_id=loan_id)
+    if not loan:
+        raise HTTPException(status_code=404, detail="Loan not found")
+
+    text = (payload.text if payload else None) or crud.get_loan_text(db, loan_id=loan_id)
+    if not text:
+        raise HTTPException(status_code=400, detail="No text available to extract from")
+
+    extractor, version = extractor_identity(get_extractor())
+    job, created = crud.submit_extraction_job(
+        db, loan_id=loan_id, extractor=extractor, extractor_version=version, text=text
+    )
+    if created:
+        request.app.state.extraction_worker.submit(job.id)
+        db.refresh(job)
+    else:
+        response.status_code = 200
+    response.headers["Location"] = f"/api/extraction-jobs/{job.id}"
+    return job
+
+
+@router.get("/extraction-jobs/{job_id}", response_model=schemas.ExtractionJobOut)
+def get_extraction_job(job_id: int, db: Session = Depends(get_read_db)):
+    job = crud.get_extraction_job(db, job_id=job_id)
+    if not job:
+        raise HTTPException(status_code=404, detail="Extraction job not found")
+    return job
+
+
+@router.get("/extraction-jobs/{job_id}/obligations", response_model=list[schemas.ObligationOut])
+def get_extraction_job_obligations(job_id: int, db: Session = Depends(get_read_db)):
+    job = crud.get_extraction_job(db, job_id=job_id)
+    if not job:
+        raise HTTPException(status_code=404, detail="Extraction job not found")
+    if job.status != schemas.JobStatus.SUCCEEDED.value:
+        raise HTTPException(status_code=409, detail=f"Extraction job is {job.status}")
+    return crud.list_obligations_by_ids(db, obligation_ids=job.obligation_ids or [])
@@ -1,18 +1,31 @@
 from __future__ import annotations
 
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Query, Response
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 
-from app import crud, schemas
-from app.db import get_db
+from app import crud, crud_async, schemas
+from app.db import get_async_read_db, get_db
+from app.services import extraction_cache, response_cache
 from app.services.extractor import get_extractor
 
 router = APIRouter(tags=["loans"])
 
 
 @router.get("/loans", response_model=list[schemas.LoanOut])
-def list_loans(db: Session = Depends(get_db)):
-    return crud.list_loans(db)
+async def list_loans(
+    response: Response,
+    cursor: str | None = None,
+    limit: int | None = Query(default=None, ge=1, le=1000),
+    db: AsyncSession = Depends(get_async_read_db),
+):
+    try:
+        loans, next_cursor = await crud_async.list_loans(db, cursor=cursor, limit=limit)
+    except ValueError as exc:
+        raise HTTPException(status_code=400, detail=str(exc)) from exc
+    if next_cursor:
+        response.headers["X-Next-Cursor"] = next_cursor
+    return loans
 
 
 @router.post("/loans", response_model=schemas.LoanOut)
@@ -21,12 +34,40 @@ def create_loan(payload: schemas.LoanCreate, db: Session = Depends(get_db)):
 
 
 @router.get("/loans/{loan_id}", response_model=schemas.LoanDetailOut)
-def get_loan(loan_id: int, db: Session = Depends(get_db)):
-    loan = crud.get_loan(db, loan_id=loan_id)
-    if not loan:
+async def get_loan(loan_id: int, db: AsyncSession = Depends(get_async_read_db)):
+    version = await crud_async.get_loan_version(db, loan_id=loan_id)
+    if version is None:
         raise HTTPException(status_code=404, detail="Loan not found")
-    summary = crud.loan_summary(db, loan_id=loan_id)
-    return schemas.LoanDetailOut(id=loan.id, title=loan.title, created_at=loan.created_at, summary=summary)
+    now = crud.now_utc()
+    key = ("loan", loan_id, version)
+    cached = response_cache.get(key, now=now)
+    if cached is None:
+        loan = await crud_async.get_loan(db, loan_id=loan_id)
+        summary = await crud_async.loan_summary(db, loan_id=loan_id, now=now)
+        detail = schemas.LoanDetailOut(
+            id=loan.id, title=loan.title, created_at=loan.created_at, summary=summary
+        )
+        cached = response_cache.put(
+            key,
+            detail.model_dump_json().encode("utf-8"),
+            fresh_until=await crud_async.next_status_transition(db, loan_id=loan_id, now=now),
+        )
+    return cached.to_response()
+
+
+@router.get("/portfolio/summary", response_model=schemas.PortfolioSummary)
+async def portfolio_summary(db: AsyncSession = Depends(get_async_read_db)):
+    now = crud.now_utc()
+    key = ("portfolio", *await crud_async.portfolio_version(db))
+    cached = response_cache.get(key, now=now)
+    if cached is None:
+        summary = await crud_async.portfolio_summary(db, now=now)
+        cached = response_cache.put(
+            key,
+            summary.model_dump_json().encode("utf-8"),
+            fresh_until=await crud_async.next_status_transition(db, now=now),
+        )
+    return cached.to_response()
 
 
 @router.post("/loans/{loan_id}/import-text", response_model=schemas.LoanOut)
@@ -44,15 +85,20 @@ def extract_obligations(loan_id: int, payload: schemas.ExtractIn | None = None,
     if not loan:
         raise HTTPException(status_code=404, detail="Loan not found")
 
-    text = (payload.text if payload else None) or loan.raw_text
+    text = (payload.text if payload else None) or crud.get_loan_text(db, loan_id=loan_id)
     if not text:
         raise HTTPException(status_code=400, detail="No text available to extract from")
 
     extractor = get_extractor()
-    extracted = extractor.extract_obligations(text)
-    created = [crud.create_obligation(db, loan_id=loan_id, obligation_in=o.to_create()) for o in extracted]
+    extracted, cache_hit = extraction_cache.extract(db, extractor, text)
+    created, existing = crud.ingest_extracted_obligations(db, loan_id=loan_id, extracted=extracted)
     return schemas.ExtractResult(
-        obligations=created,
+        obligations=[*created, *existing],
         extracted=extracted,
-        meta={"extractor": getattr(extractor, "name", "unknown"), "count": len(created)},
+        meta={
+            "extractor": getattr(extractor, "name", "unknown"),
+            "count": len(created),
+            "existing": len(existing),
+            "cached": cache_hit,
+        },
     )
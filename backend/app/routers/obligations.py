@@ -1,20 +1,114 @@
 from __future__ import annotations
 
-from fastapi import APIRouter, Depends, HTTPException
+from datetime import date, datetime, timedelta
+from typing import Any
+
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response
+from pydantic import TypeAdapter
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 
-from app import crud, schemas
-from app.db import get_db
+from app import crud, crud_async, schemas
+from app.db import get_async_read_db, get_db, get_read_db
+from app.services import response_cache, uploads
 
 router = APIRouter(tags=["obligations"])
 
+_obligation_list = TypeAdapter(list[schemas.ObligationOut])
+_upcoming_list = TypeAdapter(list[schemas.UpcomingObligationOut])
+
 
 @router.get("/loans/{loan_id}/obligations", response_model=list[schemas.ObligationOut])
-def list_obligations(loan_id: int, db: Session = Depends(get_db)):
-    loan = crud.get_loan(db, loan_id=loan_id)
-    if not loan:
+async def list_obligations(
+    loan_id: int,
+    request: Request,
+    status: list[schemas.ObligationStatus] | None = Query(default=None),
+    obligation_type: list[schemas.ObligationType] | None = Query(default=None),
+    frequency: list[schemas.Frequency] | None = Query(default=None),
+    party_responsible: str | None = None,
+    due_from: date | None = None,
+    due_to: date | None = None,
+    sort: schemas.ObligationSort = "created",
+    cursor: str | None = None,
+    limit: int | None = Query(default=None, ge=1, le=1000),
+    db: AsyncSession = Depends(get_async_read_db),
+):
+    version = await crud_async.get_loan_version(db, loan_id=loan_id)
+    if version is None:
         raise HTTPException(status_code=404, detail="Loan not found")
-    return crud.list_obligations_for_loan(db, loan_id=loan_id)
+    now = crud.now_utc()
+    key = ("obligations", loan_id, version, tuple(sorted(request.query_params.multi_items())))
+    cached = response_cache.get(key, now=now)
+    if cached is not None:
+        return cached.to_response()
+
+    try:
+        obligations, next_cursor = await crud_async.list_obligations_for_loan(
+            db,
+            loan_id=loan_id,
+            status=status,
+            obligation_type=obligation_type,
+            frequency=frequency,
+            party_responsible=party_responsible,
+            due_from=due_from,
+            due_to=due_to,
+            sort=sort,
+            cursor=cursor,
+            limit=limit,
+        )
+    except ValueError as exc:
+        raise HTTPException(status_code=400, detail=str(exc)) from exc
+    return response_cache.put(
+        key,
+        _obligation_list.dump_json(_obligation_list.validate_python(obligations, from_attributes=True)),
+        headers={"X-Next-Cursor": next_cursor} if next_cursor else None,
+        fresh_until=await crud_async.next_status_transition(db, loan_id=loan_id, now=now),
+    ).to_response()
+
+
+@router.get("/obligations/upcoming", response_model=list[schemas.UpcomingObligationOut])
+async def list_upcoming_obligations(
+    response: Response,
+    days: int = Query(default=14, ge=0, le=3660),
+    party_responsible: str | None = None,
+    cursor: str | None = None,
+    limit: int = Query(default=200, ge=1, le=1000),
+    db: AsyncSession = Depends(get_async_read_db),
+):
+    now = crud.now_utc()
+    try:
+        obligations, next_cursor = await crud_async.list_upcoming_obligations(
+            db,
+            days=days,
+            party_responsible=party_responsible,
+            cursor=cursor,
+            limit=limit,
+            now=now,
+        )
+    except ValueError as exc:
+        raise HTTPException(status_code=400, detail=str(exc)) from exc
+    if next_cursor:
+        response.headers["X-Next-Cursor"] = next_cursor
+    items = _upcoming_list.validate_python(obligations, from_attributes=True)
+    # The stored status lags until the next sweep; report the one implied by the deadline.
+    for item in items:
+        item.status = crud.compute_status(
+            current_status=item.status, due_at=item.effective_due_at, now=now
+        )
+    return items
+
+
+@router.get("/obligations/occurrences", response_model=list[schemas.ObligationOccurrence])
+def list_occurrences(
+    days: int = Query(default=365, ge=1, le=3660),
+    start: datetime | None = None,
+    loan_id: int | None = None,
+    db: Session = Depends(get_read_db),
+):
+    window_start = start or crud.now_utc()
+    return crud.list_occurrences(
+        db, start=window_start, end=window_start + timedelta(days=days), loan_id=loan_id
+    )
 
 
 @router.post("/loans/{loan_id}/obligations", response_model=schemas.ObligationOut)
@@ -25,6 +119,53 @@ def create_obligation(loan_id: int, payload: schemas.ObligationCreate, db: Sessi
     return crud.create_obligation(db, loan_id=loan_id, obligation_in=payload)
 
 
+def _batch_result(
+    ids: list[int], obligations: list[Any], errors: dict[int, str]
+) -> schemas.BatchResult:
+    by_id = {o.id: o for o in obligations}
+    results = [
+        schemas.BatchItemResult(id=i, ok=False, error=errors[i])
+        if i in errors
+        else schemas.BatchItemResult(
+            id=i,
+            ok=True,
+            obligation=schemas.ObligationOut.model_validate(by_id[i]) if i in by_id else None,
+        )
+        for i in dict.fromkeys(ids)
+    ]
+    failed = sum(1 for r in results if not r.ok)
+    return schemas.BatchResult(results=results, succeeded=len(results) - failed, failed=failed)
+
+
+@router.post("/obligations/batch/complete", response_model=schemas.BatchResult)
+def batch_complete(payload: schemas.ObligationIdsIn, db: Session = Depends(get_db)):
+    obligations, errors = crud.batch_complete_obligations(db, obligation_ids=payload.ids)
+    return _batch_result(payload.ids, obligations, errors)
+
+
+@router.post("/obligations/batch/reopen", response_model=schemas.BatchResult)
+def batch_reopen(payload: schemas.ObligationIdsIn, db: Session = Depends(get_db)):
+    obligations, errors = crud.batch_reopen_obligations(db, obligation_ids=payload.ids)
+    return _batch_result(payload.ids, obligations, errors)
+
+
+@router.post("/obligations/batch/update", response_model=schemas.BatchResult)
+def batch_update(payload: schemas.ObligationBatchUpdateIn, db: Session = Depends(get_db)):
+    obligations, errors = crud.batch_update_obligations(db, patches=payload.items)
+    return _batch_result([p.id for p in payload.items], obligations, errors)
+
+
+@router.post("/obligations/batch/delete", response_model=schemas.BatchResult)
+def batch_delete(payload: schemas.ObligationIdsIn, db: Session = Depends(get_db)):
+    _, errors, orphaned, upload_ids = crud.batch_delete_obligations(
+        db, obligation_ids=payload.ids
+    )
+    crud.remove_orphaned_blobs(db, hashes=orphaned)
+    for upload_id in upload_ids:
+        uploads.discard_part(upload_id)
+    return _batch_result(payload.ids, [], errors)
+
+
 @router.put("/obligations/{obligation_id}", response_model=schemas.ObligationOut)
 def update_obligation(
     obligation_id: int, payload: schemas.ObligationUpdate, db: Session = Depends(get_db)
@@ -56,5 +197,8 @@ def delete_obligation(obligation_id: int, db: Session = Depends(get_db)):
     obligation = crud.get_obligation(db, obligation_id=obligation_id)
     if not obligation:
         raise HTTPException(status_code=404, detail="Obligation not found")
-    crud.delete_obligation(db, obligation=obligation)
+    upload_ids = crud.list_upload_sessions(db, obligation_id=obligation_id)
+    crud.remove_orphaned_blobs(db, hashes=crud.delete_obligation(db, obligation=obligation))
+    for upload_id in upload_ids:
+        uploads.discard_part(upload_id)
     return {"deleted": True}
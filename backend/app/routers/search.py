@@ -0,0 +1,36 @@
+from __future__ import annotations
+
+from fastapi import APIRouter, Depends, HTTPException, Query
+from sqlalchemy.orm import Session
+
+from app import schemas
+from app.db import get_read_db
+from app.services import search_index
+
+router = APIRouter(tags=["search"])
+
+
+@router.get("/search", response_model=list[schemas.SearchHit])
+def search(
+    q: str = Query(min_length=1, max_length=500),
+    loan_id: int | None = None,
+    obligation_type: list[schemas.ObligationType] | None = Query(default=None),
+    status: list[schemas.ObligationStatus] | None = Query(default=None),
+    scope: schemas.SearchScope = "all",
+    limit: int = Query(default=20, ge=1, le=100),
+    db: Session = Depends(get_read_db),
+):
+    try:
+        return search_index.search(
+            db,
+            query=q,
+            loan_id=loan_id,
+            obligation_type=obligation_type,
+            status=status,
+            scope=scope,
+            limit=limit,
+        )
+    except search_index.SearchUnavailable as exc:
+        raise HTTPException(status_code=501, detail=str(exc)) from exc
+    except ValueError as exc:
+        raise HTTPException(status_code=400, detail=str(exc)) from exc
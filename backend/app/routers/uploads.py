@@ -0,0 +1,157 @@
+from __future__ import annotations
+
+from pathlib import Path
+from uuid import uuid4
+
+from fastapi import APIRouter, Depends, HTTPException, Query, Request
+from fastapi.concurrency import run_in_threadpool
+from sqlalchemy.orm import Session
+
+from app import crud, models, schemas
+from app.db import get_db
+from app.services import blob_store, uploads
+
+router = APIRouter(tags=["evidence"])
+
+
+def _session_out(upload: models.UploadSession) -> schemas.UploadSessionOut:
+    return schemas.UploadSessionOut(
+        id=upload.id,
+        obligation_id=upload.obligation_id,
+        filename=upload.filename,
+        size_bytes=upload.size_bytes,
+        received_bytes=uploads.received_bytes(upload.id),
+        chunk_size=uploads.chunk_size(),
+        created_at=upload.created_at,
+        expires_at=upload.expires_at,
+    )
+
+
+def _get_upload(db: Session, upload_id: str) -> models.UploadSession:
+    upload = crud.get_upload_session(db, upload_id=upload_id)
+    if not upload or upload.expires_at <= crud.now_utc():
+        raise HTTPException(status_code=404, detail="Upload not found")
+    return upload
+
+
+def _get_open_upload(db: Session, upload_id: str) -> models.UploadSession:
+    upload = _get_upload(db, upload_id)
+    if upload.claimed_at is not None and upload.claimed_at > crud.now_utc() - uploads.claim_timeout():
+        raise HTTPException(status_code=409, detail="Upload is already being completed")
+    return upload
+
+
+@router.post(
+    "/obligations/{obligation_id}/uploads",
+    response_model=schemas.UploadSessionOut,
+    status_code=201,
+)
+def create_upload(
+    obligation_id: int, payload: schemas.UploadSessionCreate, db: Session = Depends(get_db)
+):
+    obligation = crud.get_obligation(db, obligation_id=obligation_id)
+    if not obligation:
+        raise HTTPException(status_code=404, detail="Obligation not found")
+    if payload.size_bytes > uploads.max_upload_bytes():
+        raise HTTPException(
+            status_code=413, detail=f"Upload exceeds {uploads.max_upload_bytes()} bytes"
+        )
+
+    expired = crud.list_expired_upload_sessions(db)
+    crud.delete_upload_sessions(db, upload_ids=expired)
+    for upload_id in expired:
+        uploads.discard_part(upload_id)
+
+    if crud.pending_upload_bytes(db) + payload.size_bytes > uploads.max_pending_bytes():
+        raise HTTPException(
+            status_code=503,
+            detail="Too many uploads in progress",
+            headers={"Retry-After": "30"},
+        )
+
+    upload_id = uuid4().hex
+    uploads.create_part(upload_id)
+    upload = crud.create_upload_session(
+        db,
+        upload_id=upload_id,
+        obligation_id=obligation_id,
+        filename=Path(payload.filename).name,
+        size_bytes=payload.size_bytes,
+        note=payload.note,
+        expires_at=crud.now_utc() + uploads.session_ttl(),
+    )
+    return _session_out(upload)
+
+
+@router.get("/uploads/{upload_id}", response_model=schemas.UploadSessionOut)
+def get_upload(upload_id: str, db: Session = Depends(get_db)):
+    return _session_out(_get_upload(db, upload_id))
+
+
+@router.put("/uploads/{upload_id}/chunks", response_model=schemas.UploadSessionOut)
+async def put_chunk(
+    upload_id: str,
+    request: Request,
+    offset: int = Query(ge=0),
+    db: Session = Depends(get_db),
+):
+    upload = await run_in_threadpool(_get_open_upload, db, upload_id)
+    try:
+        await uploads.write_chunk(
+            upload_id, offset=offset, total=upload.size_bytes, body=request.stream()
+        )
+    except uploads.UploadBusy as exc:
+        raise HTTPException(
+            status_code=503, detail="Upload capacity exhausted", headers={"Retry-After": "1"}
+        ) from exc
+    except uploads.OffsetMismatch as exc:
+        raise HTTPException(
+            status_code=409,
+            detail=f"Expected offset {exc.expected}",
+            headers={"Upload-Offset": str(exc.expected)},
+        ) from exc
+    except uploads.ChunkTooLarge as exc:
+        raise HTTPException(status_code=413, detail=str(exc)) from exc
+    return _session_out(upload)
+
+
+@router.post("/uploads/{upload_id}/complete", response_model=schemas.EvidenceOut)
+def complete_upload(upload_id: str, db: Session = Depends(get_db)):
+    _get_upload(db, upload_id)
+    upload = crud.claim_upload_session(
+        db, upload_id=upload_id, stale_after=uploads.claim_timeout()
+    )
+    if upload is None:
+        raise HTTPException(status_code=409, detail="Upload is already being completed")
+
+    try:
+        received = uploads.received_bytes(upload_id)
+        if received != upload.size_bytes:
+            raise HTTPException(
+                status_code=409,
+                detail=f"Upload incomplete: {received} of {upload.size_bytes} bytes received",
+                headers={"Upload-Offset": str(received)},
+            )
+        evidence = crud.create_evidence(
+            db,
+            obligation_id=upload.obligation_id,
+            filename=upload.filename,
+            note=upload.note,
+            blob=blob_store.stage_file(uploads.part_path(upload_id)),
+            upload_id=upload_id,
+        )
+    except BaseException:
+        db.rollback()
+        crud.release_upload_session(db, upload_id=upload_id)
+        raise
+    if evidence is None:
+        raise HTTPException(status_code=404, detail="Upload not found")
+    return evidence
+
+
+@router.delete("/uploads/{upload_id}")
+def abort_upload(upload_id: str, db: Session = Depends(get_db)):
+    _get_open_upload(db, upload_id)
+    crud.delete_upload_sessions(db, upload_ids=[upload_id])
+    uploads.discard_part(upload_id)
+    return {"deleted": True}
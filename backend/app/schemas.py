@@ -4,7 +4,7 @@ from datetime import date, datetime
 from enum import Enum
 from typing import Any, Literal
 
-from pydantic import BaseModel, ConfigDict, Field
+from pydantic import AliasPath, BaseModel, ConfigDict, Field
 
 
 class ObligationType(str, Enum):
@@ -41,6 +41,26 @@ class AuditAction(str, Enum):
     DELETED = "DELETED"
 
 
+ObligationSort = Literal["created", "due", "status", "confidence"]
+
+SearchScope = Literal["all", "obligations", "agreements"]
+
+
+class JobStatus(str, Enum):
+    QUEUED = "QUEUED"
+    RUNNING = "RUNNING"
+    SUCCEEDED = "SUCCEEDED"
+    FAILED = "FAILED"
+
+
+class ReminderStatus(str, Enum):
+    PENDING = "PENDING"
+    SENDING = "SENDING"
+    SENT = "SENT"
+    FAILED = "FAILED"
+    CANCELLED = "CANCELLED"
+
+
 EntityType = Literal["obligation", "loan", "evidence"]
 
 
@@ -73,6 +93,11 @@ class LoanDetailOut(BaseModel):
     summary: LoanSummary
 
 
+class PortfolioSummary(BaseModel):
+    loans: list[LoanDetailOut]
+    totals: LoanSummary
+
+
 class ImportTextIn(BaseModel):
     text: str = Field(min_length=1)
 
@@ -136,6 +161,60 @@ class ObligationOut(BaseModel):
     updated_at: datetime
 
 
+class UpcomingObligationOut(ObligationOut):
+    loan_title: str = Field(validation_alias=AliasPath("loan", "title"))
+    effective_due_at: datetime
+
+
+class ObligationPatch(ObligationUpdate):
+    id: int
+
+
+class ObligationIdsIn(BaseModel):
+    ids: list[int] = Field(min_length=1, max_length=1000)
+
+
+class ObligationBatchUpdateIn(BaseModel):
+    items: list[ObligationPatch] = Field(min_length=1, max_length=1000)
+
+
+class BatchItemResult(BaseModel):
+    id: int
+    ok: bool
+    error: str | None = None
+    obligation: ObligationOut | None = None
+
+
+class BatchResult(BaseModel):
+    results: list[BatchItemResult]
+    succeeded: int
+    failed: int
+
+
+class SearchHit(BaseModel):
+    kind: Literal["obligation", "agreement"]
+    loan_id: int
+    loan_title: str
+    obligation_id: int | None = None
+    name: str | None = None
+    obligation_type: str | None = None
+    status: str | None = None
+    page: int | None = None
+    snippet: str
+    score: float
+
+
+class ObligationOccurrence(BaseModel):
+    model_config = ConfigDict(from_attributes=True)
+
+    obligation_id: int
+    loan_id: int
+    name: str
+    obligation_type: str
+    frequency: str
+    due_at: datetime
+
+
 class EvidenceOut(BaseModel):
     model_config = ConfigDict(from_attributes=True)
 
@@ -143,10 +222,29 @@ class EvidenceOut(BaseModel):
     obligation_id: int
     filename: str
     file_path: str
+    sha256: str | None = None
+    size_bytes: int | None = None
     uploaded_at: datetime
     note: str | None
 
 
+class UploadSessionCreate(BaseModel):
+    filename: str = Field(min_length=1, max_length=255)
+    size_bytes: int = Field(gt=0)
+    note: str | None = None
+
+
+class UploadSessionOut(BaseModel):
+    id: str
+    obligation_id: int
+    filename: str
+    size_bytes: int
+    received_bytes: int
+    chunk_size: int
+    created_at: datetime
+    expires_at: datetime
+
+
 class AuditEventOut(BaseModel):
     model_config = ConfigDict(from_attributes=True)
 
@@ -155,9 +253,19 @@ class AuditEventOut(BaseModel):
     entity_id: int
     action: str
     details_json: str
+    loan_id: int | None = None
+    obligation_id: int | None = None
     at: datetime
 
 
+class DueSpec(BaseModel):
+    """How an extracted deadline was derived, so it can be recomputed for another day."""
+
+    field: Literal["due_date", "next_due_at"] = "due_date"
+    offset_days: int = 0
+    period_months: int | None = None
+
+
 class ExtractedObligation(BaseModel):
     name: str
     obligation_type: ObligationType
@@ -170,6 +278,7 @@ class ExtractedObligation(BaseModel):
     confidence: float | None = None
     source_excerpt: str | None = None
     source_page: int | None = None
+    due_spec: DueSpec | None = Field(default=None, exclude=True)
 
     def to_create(self) -> "ObligationCreate":
         return ObligationCreate(
@@ -191,3 +300,18 @@ class ExtractResult(BaseModel):
     obligations: list[ObligationOut]
     extracted: list[ExtractedObligation] | None = None
     meta: dict[str, Any] = Field(default_factory=dict)
+
+
+class ExtractionJobOut(BaseModel):
+    model_config = ConfigDict(from_attributes=True)
+
+    id: int
+    loan_id: int
+    extractor: str
+    text_hash: str
+    status: JobStatus
+    error: str | None
+    obligation_ids: list[int] | None
+    created_at: datetime
+    started_at: datetime | None
+    finished_at: datetime | None
@@ -0,0 +1,137 @@
+from __future__ import annotations
+
+import logging
+import os
+import threading
+from datetime import datetime, timezone
+from typing import Any
+
+from sqlalchemy import event, insert
+from sqlalchemy.orm import Session, SessionTransaction
+
+from app import models
+from app.db import SessionLocal
+from app.services.metrics import registry
+
+logger = logging.getLogger(__name__)
+
+
+class AuditWriter:
+    def __init__(
+        self,
+        *,
+        buffered: bool,
+        max_batch: int = 500,
+        max_pending: int = 100_000,
+        flush_interval_seconds: float = 1.0,
+    ) -> None:
+        self.buffered = buffered
+        self.max_batch = max_batch
+        self.max_pending = max_pending
+        self.flush_interval_seconds = flush_interval_seconds
+        self._buffer: list[dict[str, Any]] = []
+        self._lock = threading.Lock()
+        self._flush_lock = threading.Lock()
+        self._wake = threading.Event()
+        self._stop = threading.Event()
+        self._thread: threading.Thread | None = None
+
+    @property
+    def running(self) -> bool:
+        return self._thread is not None and self._thread.is_alive()
+
+    def record(self, db: Session, rows: list[dict[str, Any]]) -> None:
+        if not rows:
+            return
+        # A full buffer pushes back on writers: their events go into their own transaction.
+        if not (self.buffered and self.running) or self.pending() >= self.max_pending:
+            db.execute(insert(models.AuditEvent), rows)
+            return
+
+        if not db.in_transaction():
+            db.begin()
+        at = datetime.now(timezone.utc).replace(tzinfo=None)
+        db.info.setdefault("audit_rows", []).extend({"at": at, **row} for row in rows)
+
+    def _after_commit(self, session: Session) -> None:
+        rows = session.info.pop("audit_rows", None)
+        if rows:
+            self._enqueue(rows)
+
+    def _after_transaction_end(self, session: Session, transaction: SessionTransaction) -> None:
+        # Rows of a transaction that ended without committing describe changes that never happened.
+        if transaction.parent is None:
+            session.info.pop("audit_rows", None)
+
+    def _enqueue(self, rows: list[dict[str, Any]], *, requeue: bool = False) -> None:
+        with self._lock:
+            if requeue:
+                self._buffer[:0] = rows
+            else:
+                self._buffer.extend(rows)
+            dropped = len(self._buffer) - self.max_pending
+            if dropped > 0:
+                # Oldest first: they have been waiting longest on a database that keeps failing.
+                del self._buffer[:dropped]
+            full = len(self._buffer) >= self.max_batch
+        if dropped > 0:
+            registry.inc("audit_events_dropped_total", amount=dropped)
+            logger.error("Audit buffer full; dropped %d oldest events", dropped)
+        if full:
+            self._wake.set()
+
+    def pending(self) -> int:
+        with self._lock:
+            return len(self._buffer)
+
+    def flush(self) -> int:
+        with self._flush_lock:
+            with self._lock:
+                rows, self._buffer = self._buffer, []
+            if not rows:
+                return 0
+            try:
+                with SessionLocal() as db:
+                    for i in range(0, len(rows), self.max_batch):
+                        db.execute(insert(models.AuditEvent), rows[i : i + self.max_batch])
+                    db.commit()
+            except Exception:
+                self._enqueue(rows, requeue=True)
+                raise
+            return len(rows)
+
+    def _run(self) -> None:
+        while not self._stop.is_set():
+            self._wake.wait(self.flush_interval_seconds)
+            self._wake.clear()
+            try:
+                self.flush()
+            except Exception:
+                logger.exception("Audit flush failed")
+
+    def start(self) -> None:
+        if not self.buffered or self.running:
+            return
+        event.listen(Session, "after_commit", self._after_commit)
+        event.listen(Session, "after_transaction_end", self._after_transaction_end)
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name="audit-writer", daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        self._stop.set()
+        self._wake.set()
+        if self._thread:
+            self._thread.join(timeout=self.flush_interval_seconds + 5)
+            self._thread = None
+            event.remove(Session, "after_commit", self._after_commit)
+            event.remove(Session, "after_transaction_end", self._after_transaction_end)
+        self.flush()
+
+
+audit_writer = AuditWriter(
+    buffered=os.getenv("AUDIT_MODE", "transaction") == "buffered",
+    max_batch=int(os.getenv("AUDIT_BATCH_SIZE", "500")),
+    max_pending=int(os.getenv("AUDIT_MAX_PENDING", "100000")),
+    flush_interval_seconds=float(os.getenv("AUDIT_FLUSH_INTERVAL_SECONDS", "1")),
+)
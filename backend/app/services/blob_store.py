@@ -0,0 +1,89 @@
+from __future__ import annotations
+
+import hashlib
+import os
+from pathlib import Path
+from typing import BinaryIO, NamedTuple
+from uuid import uuid4
+
+CHUNK_SIZE = 1024 * 1024
+
+
+class BlobTooLarge(ValueError):
+    pass
+
+
+def storage_root() -> Path:
+    return Path(os.getenv("STORAGE_DIR", "./storage"))
+
+
+def blob_rel_path(sha256: str) -> str:
+    return f"blobs/{sha256[:2]}/{sha256[2:4]}/{sha256}"
+
+
+class StagedBlob(NamedTuple):
+    sha256: str
+    size_bytes: int
+    rel_path: str
+    tmp_path: Path
+
+
+def place_blob(staged: StagedBlob) -> None:
+    # Call only after the evidence_blobs reference is committed, so orphan cleanup cannot
+    # unlink the file after this check.
+    full_path = storage_root() / staged.rel_path
+    if full_path.exists():
+        staged.tmp_path.unlink(missing_ok=True)
+    else:
+        full_path.parent.mkdir(parents=True, exist_ok=True)
+        os.replace(staged.tmp_path, full_path)
+
+
+def discard_blob(staged: StagedBlob) -> None:
+    staged.tmp_path.unlink(missing_ok=True)
+
+
+def stage_blob(stream: BinaryIO, *, max_bytes: int | None = None) -> StagedBlob:
+    tmp_dir = storage_root() / "tmp"
+    tmp_dir.mkdir(parents=True, exist_ok=True)
+    tmp_path = tmp_dir / uuid4().hex
+
+    digest = hashlib.sha256()
+    size = 0
+    try:
+        with tmp_path.open("wb") as f:
+            while True:
+                chunk = stream.read(CHUNK_SIZE)
+                if not chunk:
+                    break
+                size += len(chunk)
+                if max_bytes is not None and size > max_bytes:
+                    raise BlobTooLarge(f"Upload exceeds {max_bytes} bytes")
+                digest.update(chunk)
+                f.write(chunk)
+    except BaseException:
+        tmp_path.unlink(missing_ok=True)
+        raise
+    sha256 = digest.hexdigest()
+    return StagedBlob(sha256, size, blob_rel_path(sha256), tmp_path)
+
+
+def stage_file(path: Path) -> StagedBlob:
+    digest = hashlib.sha256()
+    size = 0
+    with path.open("rb") as f:
+        while chunk := f.read(CHUNK_SIZE):
+            digest.update(chunk)
+            size += len(chunk)
+    sha256 = digest.hexdigest()
+    return StagedBlob(sha256, size, blob_rel_path(sha256), path)
+
+
+def write_blob(stream: BinaryIO, *, max_bytes: int | None = None) -> tuple[str, int, str]:
+    staged = stage_blob(stream, max_bytes=max_bytes)
+    place_blob(staged)
+    return staged.sha256, staged.size_bytes, staged.rel_path
+
+
+def remove_blob(rel_path: str) -> None:
+    (storage_root() / rel_path).unlink(missing_ok=True)
@@ -1,8 +1,21 @@
 from __future__ import annotations
 
+import os
+from collections.abc import Iterator
 from datetime import datetime, timezone
 
+from sqlalchemy import select
+from sqlalchemy.orm import Session
+
 from app import crud, models
+from app.db import ReadSessionLocal
+from app.services import recurrence
+from app.services.cache import LRUCache
+
+_ics_cache = LRUCache(
+    max_entries=int(os.getenv("ICS_CACHE_ENTRIES", "512")),
+    max_bytes=int(os.getenv("ICS_CACHE_BYTES", str(32 * 1024 * 1024))),
+)
 
 
 def _format_dt(dt: datetime) -> str:
@@ -24,46 +37,91 @@ def _escape(text: str) -> str:
     )
 
 
-def build_ics(loan: models.Loan, obligations: list[models.Obligation]) -> str:
-    now = datetime.now(timezone.utc).replace(tzinfo=None, microsecond=0)
+def _event_lines(o: models.Obligation, *, summary: str) -> list[str]:
+    due_at = crud.obligation_due_at(o)
+    if not due_at:
+        return []
+
+    description = _escape(
+        " | ".join(
+            [
+                f"Type: {o.obligation_type}",
+                f"Status: {o.status}",
+                f"Rule: {o.due_rule or 'N/A'}",
+            ]
+        )
+    )
 
-    lines: list[str] = [
+    lines = [
+        "BEGIN:VEVENT",
+        f"UID:obligation-{o.id}@covenantops.local",
+        f"DTSTAMP:{_format_dt(o.updated_at.replace(microsecond=0))}",
+    ]
+    if o.due_date and not o.next_due_at:
+        lines.append(f"DTSTART;VALUE=DATE:{_format_date(o.due_date)}")
+    else:
+        if due_at.tzinfo is not None:
+            due_at = due_at.astimezone(timezone.utc).replace(tzinfo=None)
+        lines.append(f"DTSTART:{_format_dt(due_at)}")
+    rrule = recurrence.rrule_for(o.frequency, o.anchor_day or due_at.day)
+    if rrule:
+        lines.append(f"RRULE:{rrule}")
+    lines.append(f"SUMMARY:{_escape(summary)}")
+    lines.append(f"DESCRIPTION:{description}")
+    lines.append("END:VEVENT")
+    return lines
+
+
+def _calendar_header(name: str) -> list[str]:
+    return [
         "BEGIN:VCALENDAR",
         "VERSION:2.0",
         "PRODID:-//CovenantOps//EN",
         "CALSCALE:GREGORIAN",
-        f"X-WR-CALNAME:{_escape(loan.title)} Obligations",
+        f"X-WR-CALNAME:{_escape(name)}",
     ]
 
-    for o in obligations:
-        due_at = crud.obligation_due_at(o)
-        if not due_at:
-            continue
-
-        uid = f"obligation-{o.id}@covenantops.local"
-        summary = _escape(o.name)
-        description = _escape(
-            " | ".join(
-                [
-                    f"Type: {o.obligation_type}",
-                    f"Status: {o.status}",
-                    f"Rule: {o.due_rule or 'N/A'}",
-                ]
-            )
-        )
-
-        lines.append("BEGIN:VEVENT")
-        lines.append(f"UID:{uid}")
-        lines.append(f"DTSTAMP:{_format_dt(now)}")
-        if o.due_date and not o.next_due_at:
-            lines.append(f"DTSTART;VALUE=DATE:{_format_date(o.due_date)}")
-        else:
-            if due_at.tzinfo is not None:
-                due_at = due_at.astimezone(timezone.utc).replace(tzinfo=None)
-            lines.append(f"DTSTART:{_format_dt(due_at)}")
-        lines.append(f"SUMMARY:{summary}")
-        lines.append(f"DESCRIPTION:{description}")
-        lines.append("END:VEVENT")
 
+def build_ics(loan: models.Loan, obligations: list[models.Obligation]) -> str:
+    lines = _calendar_header(f"{loan.title} Obligations")
+    for o in obligations:
+        lines.extend(_event_lines(o, summary=o.name))
     lines.append("END:VCALENDAR")
     return "\r\n".join(lines) + "\r\n"
+
+
+def loan_ics(db: Session, loan: models.Loan) -> bytes:
+    key = (loan.id, loan.version)
+    body = _ics_cache.get(key)
+    if body is None:
+        body = build_ics(loan, crud.list_obligations_for_loan(db, loan_id=loan.id)[0]).encode("utf-8")
+        _ics_cache.set(key, body, size=len(body))
+    return body
+
+
+def stream_portfolio_ics(
+    *, party_responsible: str | None = None, batch_size: int = 500
+) -> Iterator[bytes]:
+    yield ("\r\n".join(_calendar_header("CovenantOps Portfolio Obligations")) + "\r\n").encode("utf-8")
+
+    stmt = (
+        select(models.Obligation, models.Loan.title)
+        .join(models.Loan, models.Loan.id == models.Obligation.loan_id)
+        .order_by(models.Obligation.loan_id, models.Obligation.id)
+        .execution_options(yield_per=batch_size)
+    )
+    if party_responsible is not None:
+        stmt = stmt.where(models.Obligation.party_responsible == party_responsible)
+
+    db = ReadSessionLocal()
+    try:
+        for partition in db.execute(stmt).partitions():
+            lines: list[str] = []
+            for o, loan_title in partition:
+                lines.extend(_event_lines(o, summary=f"{loan_title}: {o.name}"))
+            if lines:
+                yield ("\r\n".join(lines) + "\r\n").encode("utf-8")
+    finally:
+        db.close()
+
+    yield b"END:VCALENDAR\r\n"
@@ -1,13 +1,21 @@
 from __future__ import annotations
 
+import os
+from collections.abc import Iterator
 from datetime import datetime, timezone
 
 from jinja2 import Environment, select_autoescape
 
 from app import models
+from app.services.cache import LRUCache
 
 _env = Environment(autoescape=select_autoescape(["html", "xml"]))
 
+_packet_cache = LRUCache(
+    max_entries=int(os.getenv("PACKET_CACHE_ENTRIES", "64")),
+    max_bytes=int(os.getenv("PACKET_CACHE_BYTES", str(64 * 1024 * 1024))),
+)
+
 _TEMPLATE = _env.from_string(
     """
 <!doctype html>
@@ -108,15 +116,59 @@ _TEMPLATE = _env.from_string(
 )
 
 
+def get_cached_compliance_packet(*, loan: models.Loan, api_base: str) -> bytes | None:
+    return _packet_cache.get((loan.id, loan.version, api_base))
+
+
+def stream_compliance_packet(
+    *,
+    loan: models.Loan,
+    obligations: list[models.Obligation],
+    api_base: str,
+    chunk_size: int = 64 * 1024,
+) -> Iterator[bytes]:
+    generated_at = datetime.now(timezone.utc).strftime("%Y-%m-%d %H:%M UTC")
+    items = ({"obligation": o, "evidence": o.evidence} for o in obligations)
+    cache_key = (loan.id, loan.version, api_base)
+
+    # Packets larger than the whole cache are never kept, so stop copying them once that is certain.
+    limit = _packet_cache.max_bytes
+    rendered: list[bytes] | None = []
+    rendered_size = 0
+    pending: list[str] = []
+    pending_size = 0
+
+    def emit(chunk: bytes) -> bytes:
+        nonlocal rendered, rendered_size
+        if rendered is not None:
+            rendered_size += len(chunk)
+            if limit is not None and rendered_size > limit:
+                rendered = None
+            else:
+                rendered.append(chunk)
+        return chunk
+
+    for part in _TEMPLATE.generate(
+        loan=loan, items=items, generated_at=generated_at, api_base=api_base
+    ):
+        pending.append(part)
+        pending_size += len(part)
+        if pending_size >= chunk_size:
+            yield emit("".join(pending).encode("utf-8"))
+            pending, pending_size = [], 0
+    if pending:
+        yield emit("".join(pending).encode("utf-8"))
+
+    if rendered is not None:
+        _packet_cache.set(cache_key, b"".join(rendered), size=rendered_size)
+
+
 def render_compliance_packet(
     *,
     loan: models.Loan,
     obligations: list[models.Obligation],
-    evidence_by_obligation_id: dict[int, list[models.Evidence]],
     api_base: str,
 ) -> str:
-    generated_at = datetime.now(timezone.utc).strftime("%Y-%m-%d %H:%M UTC")
-    items = [
-        {"obligation": o, "evidence": evidence_by_obligation_id.get(o.id, [])} for o in obligations
-    ]
-    return _TEMPLATE.render(loan=loan, items=items, generated_at=generated_at, api_base=api_base)
+    return b"".join(
+        stream_compliance_packet(loan=loan, obligations=obligations, api_base=api_base)
+    ).decode("utf-8")
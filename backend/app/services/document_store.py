@@ -0,0 +1,30 @@
+from __future__ import annotations
+
+import os
+import zlib
+
+CODEC = "zlib"
+
+
+def pages_per_chunk() -> int:
+    return int(os.getenv("LOAN_TEXT_PAGES_PER_CHUNK", "50"))
+
+
+def compress(text: str) -> tuple[str, bytes]:
+    return CODEC, zlib.compress(text.encode("utf-8"), 6)
+
+
+def decompress(codec: str, data: bytes) -> str:
+    if codec != CODEC:
+        raise ValueError(f"Unsupported document codec: {codec}")
+    return zlib.decompress(data).decode("utf-8")
+
+
+def split_chunks(text: str, pages: int | None = None) -> list[tuple[int, str]]:
+    size = pages or pages_per_chunk()
+    split = text.split("\f")
+    return [(i + 1, "\f".join(split[i : i + size])) for i in range(0, len(split), size)]
+
+
+def join_chunks(chunks: list[str]) -> str:
+    return "\f".join(chunks)
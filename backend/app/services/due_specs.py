@@ -0,0 +1,34 @@
+from __future__ import annotations
+
+import calendar
+from datetime import date, datetime, timedelta
+
+from app import schemas
+
+
+def next_period_due(period_months: int, days: int, today: date) -> date:
+    month_index = (today.year * 12 + today.month - 1) // period_months * period_months
+    month_index -= period_months * (days // 28 // period_months + 1)
+    while True:
+        year, month = divmod(month_index + period_months - 1, 12)
+        period_end = date(year, month + 1, calendar.monthrange(year, month + 1)[1])
+        due = period_end + timedelta(days=days)
+        if due >= today:
+            return due
+        month_index += period_months
+
+
+def resolve(
+    obligation: schemas.ExtractedObligation, *, now: datetime
+) -> schemas.ExtractedObligation:
+    spec = obligation.due_spec
+    if spec is None:
+        return obligation
+    due: date | datetime
+    if spec.period_months:
+        due = next_period_due(spec.period_months, spec.offset_days, now.date())
+    elif spec.field == "due_date":
+        due = now.date() + timedelta(days=spec.offset_days)
+    else:
+        due = now.replace(microsecond=0) + timedelta(days=spec.offset_days)
+    return obligation.model_copy(update={spec.field: due})
@@ -0,0 +1,63 @@
+from __future__ import annotations
+
+import zipfile
+from collections.abc import Iterator
+from datetime import datetime
+from pathlib import Path
+from typing import NamedTuple
+
+CHUNK_SIZE = 1024 * 1024
+
+
+class ArchiveMember(NamedTuple):
+    arcname: str
+    path: Path
+    modified_at: datetime
+
+
+class _ChunkSink:
+    def __init__(self) -> None:
+        self._chunks: list[bytes] = []
+        self._offset = 0
+
+    def write(self, data: bytes) -> int:
+        self._chunks.append(bytes(data))
+        self._offset += len(data)
+        return len(data)
+
+    def tell(self) -> int:
+        return self._offset
+
+    def flush(self) -> None:
+        pass
+
+    def drain(self) -> bytes:
+        data = b"".join(self._chunks)
+        self._chunks.clear()
+        return data
+
+
+def stream_zip(members: list[ArchiveMember]) -> Iterator[bytes]:
+    sink = _ChunkSink()
+    with zipfile.ZipFile(sink, mode="w", compression=zipfile.ZIP_STORED) as archive:
+        for member in members:
+            try:
+                src = member.path.open("rb")
+            except FileNotFoundError:
+                continue
+            with src:
+                size = member.path.stat().st_size
+                info = zipfile.ZipInfo(member.arcname, date_time=member.modified_at.timetuple()[:6])
+                info.file_size = size
+                with archive.open(info, mode="w", force_zip64=size >= zipfile.ZIP64_LIMIT) as dest:
+                    while True:
+                        chunk = src.read(CHUNK_SIZE)
+                        if not chunk:
+                            break
+                        dest.write(chunk)
+                        if data := sink.drain():
+                            yield data
+            if data := sink.drain():
+                yield data
+    if data := sink.drain():
+        yield data
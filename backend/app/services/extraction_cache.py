@@ -0,0 +1,90 @@
+from __future__ import annotations
+
+import hashlib
+import os
+from datetime import timedelta
+
+from sqlalchemy.orm import Session
+
+from app import crud, schemas
+from app.services import due_specs
+from app.services.extractor import ObligationExtractor, text_hash
+
+
+def _max_entries() -> int:
+    return int(os.getenv("EXTRACTION_CACHE_MAX_ENTRIES", "10000"))
+
+
+def _max_bytes() -> int:
+    return int(os.getenv("EXTRACTION_CACHE_MAX_BYTES", str(256 * 1024 * 1024)))
+
+
+def _max_age() -> timedelta | None:
+    days = float(os.getenv("EXTRACTION_CACHE_MAX_AGE_DAYS", "7"))
+    return timedelta(days=days) if days > 0 else None
+
+
+def extractor_identity(extractor: ObligationExtractor) -> tuple[str, str]:
+    return getattr(extractor, "name", "unknown"), str(getattr(extractor, "version", "0"))
+
+
+# Bumped when the stored result format changes; version 2 stores due dates as DueSpecs.
+_FORMAT = 2
+
+
+def cache_key(*, extractor: str, extractor_version: str, digest: str) -> str:
+    return hashlib.sha256(
+        f"{_FORMAT}:{extractor}:{extractor_version}:{digest}".encode()
+    ).hexdigest()
+
+
+def _cacheable(extracted: list[schemas.ExtractedObligation]) -> bool:
+    # A deadline without a DueSpec cannot be recomputed for a later hit.
+    return all(o.due_spec is not None or (o.due_date is None and o.next_due_at is None) for o in extracted)
+
+
+def get_cached(
+    db: Session, *, extractor: str, extractor_version: str, text: str
+) -> list[schemas.ExtractedObligation] | None:
+    key = cache_key(extractor=extractor, extractor_version=extractor_version, digest=text_hash(text))
+    cached = crud.get_cached_extraction(db, cache_key=key, max_age=_max_age())
+    if cached is None:
+        return None
+    now = crud.now_utc()
+    return [due_specs.resolve(o, now=now) for o in cached]
+
+
+def store(
+    db: Session,
+    *,
+    extractor: str,
+    extractor_version: str,
+    text: str,
+    extracted: list[schemas.ExtractedObligation],
+) -> None:
+    if not _cacheable(extracted):
+        return
+    digest = text_hash(text)
+    crud.store_cached_extraction(
+        db,
+        cache_key=cache_key(extractor=extractor, extractor_version=extractor_version, digest=digest),
+        extractor=extractor,
+        extractor_version=extractor_version,
+        text_hash=digest,
+        extracted=extracted,
+        max_entries=_max_entries(),
+        max_bytes=_max_bytes(),
+    )
+
+
+def extract(
+    db: Session, extractor: ObligationExtractor, text: str
+) -> tuple[list[schemas.ExtractedObligation], bool]:
+    name, version = extractor_identity(extractor)
+    cached = get_cached(db, extractor=name, extractor_version=version, text=text)
+    if cached is not None:
+        return cached, True
+
+    extracted = extractor.extract_obligations(text)
+    store(db, extractor=name, extractor_version=version, text=text, extracted=extracted)
+    return extracted, False
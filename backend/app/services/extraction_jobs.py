@@ -0,0 +1,160 @@
+from __future__ import annotations
+
+import logging
+import multiprocessing
+import os
+import socket
+import threading
+import uuid
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from datetime import datetime, timedelta
+
+from app import crud, schemas
+from app.db import SessionLocal
+from app.services import extraction_cache
+from app.services.extractor import extract_obligations, get_extractor
+
+logger = logging.getLogger(__name__)
+
+
+def extractor_version(provider: str) -> str:
+    return extraction_cache.extractor_identity(get_extractor(provider))[1]
+
+
+class ExtractionWorker:
+    def __init__(
+        self, *, max_workers: int, use_processes: bool = True, lease_seconds: float = 300.0
+    ) -> None:
+        self.max_workers = max_workers
+        self.use_processes = use_processes
+        self.lease = timedelta(seconds=lease_seconds)
+        self.worker_id = f"{socket.gethostname()}:{os.getpid()}:{uuid.uuid4().hex[:8]}"
+        self._runner: ThreadPoolExecutor | None = None
+        self._pool: Executor | None = None
+        self._lock = threading.Lock()
+        self._pending: set[int] = set()
+        self._active: set[int] = set()
+        self._stop = threading.Event()
+        self._heartbeat: threading.Thread | None = None
+
+    def _new_pool(self) -> Executor:
+        return ProcessPoolExecutor(
+            max_workers=self.max_workers, mp_context=multiprocessing.get_context("spawn")
+        )
+
+    def start(self) -> None:
+        if self._runner is not None:
+            return
+        # Jobs are claimed by runner threads, one per extraction slot, so a job only turns
+        # RUNNING once a slot is free to run it.
+        self._runner = ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix="extraction")
+        if self.use_processes:
+            self._pool = self._new_pool()
+        self._stop.clear()
+        self._recover(queued_before=None)
+        self._heartbeat = threading.Thread(
+            target=self._beat, name="extraction-heartbeat", daemon=True
+        )
+        self._heartbeat.start()
+
+    def stop(self) -> None:
+        if self._runner is None:
+            return
+        self._stop.set()
+        if self._heartbeat is not None:
+            self._heartbeat.join(timeout=10)
+            self._heartbeat = None
+        self._runner.shutdown(wait=False, cancel_futures=True)
+        self._runner = None
+        if self._pool is not None:
+            self._pool.shutdown(wait=True, cancel_futures=True)
+            self._pool = None
+        with self._lock:
+            self._pending.clear()
+
+    def submit(self, job_id: int) -> None:
+        if self._runner is None:
+            raise RuntimeError("Extraction worker is not running")
+        with self._lock:
+            if job_id in self._pending:
+                return
+            self._pending.add(job_id)
+        self._runner.submit(self._run, job_id)
+
+    def _recover(self, *, queued_before: datetime | None) -> None:
+        with SessionLocal() as db:
+            job_ids = crud.list_claimable_extraction_jobs(db, queued_before=queued_before)
+        for job_id in job_ids:
+            self.submit(job_id)
+
+    def _beat(self) -> None:
+        interval = self.lease.total_seconds() / 3
+        while not self._stop.wait(interval):
+            try:
+                with self._lock:
+                    active = sorted(self._active)
+                with SessionLocal() as db:
+                    crud.renew_extraction_job_leases(
+                        db, job_ids=active, worker_id=self.worker_id, lease=self.lease
+                    )
+                # Pick up jobs whose owner died, and queued jobs no live worker has taken.
+                self._recover(queued_before=crud.now_utc() - self.lease)
+            except Exception:
+                logger.exception("Extraction lease heartbeat failed")
+
+    def _extract(self, text: str, provider: str) -> list[schemas.ExtractedObligation]:
+        if self._pool is None:
+            return extract_obligations(text, provider)
+        # Each job process is one extraction slot, so its extractor stays single-process.
+        try:
+            return self._pool.submit(extract_obligations, text, provider, workers=1).result()
+        except BrokenProcessPool:
+            logger.warning("Extraction process pool broke; starting a new one")
+            self._pool = self._new_pool()
+            return self._pool.submit(extract_obligations, text, provider, workers=1).result()
+
+    def _run(self, job_id: int) -> None:
+        db = SessionLocal()
+        try:
+            job = crud.claim_extraction_job(
+                db, job_id=job_id, worker_id=self.worker_id, lease=self.lease
+            )
+            if job is None or job.text is None:
+                return
+            with self._lock:
+                self._active.add(job_id)
+            version = job.extractor_version or extractor_version(job.extractor)
+            extracted = extraction_cache.get_cached(
+                db, extractor=job.extractor, extractor_version=version, text=job.text
+            )
+            if extracted is None:
+                try:
+                    extracted = self._extract(job.text, job.extractor)
+                except Exception as error:
+                    crud.fail_extraction_job(db, job=job, error=f"{type(error).__name__}: {error}")
+                    return
+                extraction_cache.store(
+                    db,
+                    extractor=job.extractor,
+                    extractor_version=version,
+                    text=job.text,
+                    extracted=extracted,
+                )
+            if crud.complete_extraction_job(db, job=job, extracted=extracted) is None:
+                logger.warning("Extraction job %s was reclaimed before it finished", job_id)
+        except Exception:
+            logger.exception("Failed to run extraction job %s", job_id)
+        finally:
+            with self._lock:
+                self._pending.discard(job_id)
+                self._active.discard(job_id)
+            db.close()
+
+
+def get_extraction_worker() -> ExtractionWorker:
+    return ExtractionWorker(
+        max_workers=int(os.getenv("EXTRACTION_WORKERS", "2")),
+        use_processes=os.getenv("EXTRACTION_POOL", "process").lower() != "thread",
+        lease_seconds=float(os.getenv("EXTRACTION_LEASE_SECONDS", "300")),
+    )
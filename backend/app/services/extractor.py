@@ -1,10 +1,14 @@
 from __future__ import annotations
 
+import hashlib
 import os
-from datetime import date, datetime, timedelta, timezone
+import threading
+from datetime import datetime, timezone
 from typing import Protocol
 
 from app import schemas
+from app.services import due_specs
+from app.services.rule_extractor import RuleBasedExtractor
 
 
 class ObligationExtractor(Protocol):
@@ -17,16 +21,14 @@ def _now() -> datetime:
 
 class MockExtractor:
     name = "mock"
+    version = "1"
 
     def extract_obligations(self, text: str) -> list[schemas.ExtractedObligation]:
-        now = _now()
-        today = date.today()
-
-        def dt_in(days: int) -> datetime:
-            return now + timedelta(days=days)
+        def dt_in(days: int) -> schemas.DueSpec:
+            return schemas.DueSpec(field="next_due_at", offset_days=days)
 
-        def d_in(days: int) -> date:
-            return today + timedelta(days=days)
+        def d_in(days: int) -> schemas.DueSpec:
+            return schemas.DueSpec(field="due_date", offset_days=days)
 
         excerpt = (
             (text or "").strip().replace("\n", " ")[:240]
@@ -41,7 +43,7 @@ class MockExtractor:
                 party_responsible="Borrower",
                 frequency=schemas.Frequency.QUARTERLY,
                 due_rule="Within 45 days after quarter-end",
-                next_due_at=dt_in(10),
+                due_spec=dt_in(10),
                 confidence=0.88,
                 source_excerpt=excerpt,
             ),
@@ -52,7 +54,7 @@ class MockExtractor:
                 party_responsible="Borrower",
                 frequency=schemas.Frequency.QUARTERLY,
                 due_rule="Together with quarterly financial statements",
-                next_due_at=dt_in(10),
+                due_spec=dt_in(10),
                 confidence=0.82,
                 source_excerpt=excerpt,
             ),
@@ -63,7 +65,7 @@ class MockExtractor:
                 party_responsible="Borrower",
                 frequency=schemas.Frequency.MONTHLY,
                 due_rule="Within 15 days after month-end",
-                next_due_at=dt_in(2),
+                due_spec=dt_in(2),
                 confidence=0.8,
                 source_excerpt=excerpt,
             ),
@@ -74,7 +76,7 @@ class MockExtractor:
                 party_responsible="Borrower",
                 frequency=schemas.Frequency.ANNUAL,
                 due_rule="Within 120 days after fiscal year-end",
-                next_due_at=dt_in(60),
+                due_spec=dt_in(60),
                 confidence=0.9,
                 source_excerpt=excerpt,
             ),
@@ -85,7 +87,7 @@ class MockExtractor:
                 party_responsible="Borrower",
                 frequency=schemas.Frequency.QUARTERLY,
                 due_rule="Tested quarterly; reported with compliance certificate",
-                next_due_at=dt_in(-3),
+                due_spec=dt_in(-3),
                 confidence=0.7,
                 source_excerpt=excerpt,
             ),
@@ -116,7 +118,7 @@ class MockExtractor:
                 party_responsible="Borrower",
                 frequency=schemas.Frequency.ANNUAL,
                 due_rule="No later than 30 days prior to fiscal year start",
-                next_due_at=dt_in(20),
+                due_spec=dt_in(20),
                 confidence=0.74,
                 source_excerpt=excerpt,
             ),
@@ -137,7 +139,7 @@ class MockExtractor:
                 party_responsible="Borrower",
                 frequency=schemas.Frequency.ANNUAL,
                 due_rule="Annually within 90 days after fiscal year-end",
-                next_due_at=dt_in(12),
+                due_spec=dt_in(12),
                 confidence=0.6,
                 source_excerpt=excerpt,
             ),
@@ -147,7 +149,7 @@ class MockExtractor:
                 description="Provide initial closing deliverables checklist and confirmations.",
                 party_responsible="Borrower",
                 frequency=schemas.Frequency.ONCE,
-                due_date=d_in(-1),
+                due_spec=d_in(-1),
                 due_rule="On or before closing",
                 confidence=0.55,
                 source_excerpt=excerpt,
@@ -157,22 +159,61 @@ class MockExtractor:
         if "esg" not in (text or "").lower():
             obligations = [o for o in obligations if "ESG" not in o.name]
 
-        return obligations
+        now = _now()
+        return [due_specs.resolve(o, now=now) for o in obligations]
 
 
 class LLMExtractor:
     name = "llm"
+    version = "0"
 
     def extract_obligations(self, text: str) -> list[schemas.ExtractedObligation]:
         raise NotImplementedError("LLM extraction not enabled for MVP; use MockExtractor.")
 
 
-def get_extractor() -> ObligationExtractor:
-    provider = os.getenv("EXTRACTOR_PROVIDER", "mock").lower()
+_rules_extractor: RuleBasedExtractor | None = None
+_rules_lock = threading.Lock()
+
+
+def _shared_rules_extractor() -> RuleBasedExtractor:
+    global _rules_extractor
+    with _rules_lock:
+        if _rules_extractor is None:
+            _rules_extractor = RuleBasedExtractor(
+                workers=int(os.getenv("RULES_EXTRACTOR_WORKERS", "1"))
+            )
+        return _rules_extractor
+
+
+def close_extractors() -> None:
+    global _rules_extractor
+    with _rules_lock:
+        extractor, _rules_extractor = _rules_extractor, None
+    if extractor is not None:
+        extractor.close()
+
+
+def get_extractor(provider: str | None = None, *, workers: int | None = None) -> ObligationExtractor:
+    provider = (provider or os.getenv("EXTRACTOR_PROVIDER", "mock")).lower()
     if provider == "llm":
         return LLMExtractor()
+    if provider == "rules":
+        # An explicit worker count is for a caller that manages its own processes.
+        if workers is not None:
+            return RuleBasedExtractor(workers=workers)
+        return _shared_rules_extractor()
     return MockExtractor()
 
 
-def extract_obligations(text: str) -> list[schemas.ExtractedObligation]:
-    return get_extractor().extract_obligations(text)
+def normalize_text(text: str) -> str:
+    return "\n".join(" ".join(line.split()) for line in text.strip().splitlines())
+
+
+def text_hash(text: str) -> str:
+    return hashlib.sha256(normalize_text(text).encode("utf-8")).hexdigest()
+
+
+def extract_obligations(
+    text: str, provider: str | None = None, *, workers: int | None = None
+) -> list[schemas.ExtractedObligation]:
+    return get_extractor(provider, workers=workers).extract_obligations(text)
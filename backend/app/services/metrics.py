@@ -0,0 +1,218 @@
+from __future__ import annotations
+
+import logging
+import os
+import threading
+import time
+from collections import Counter
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+from typing import Any
+
+from sqlalchemy import Engine, event
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+logger = logging.getLogger(__name__)
+
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+QUERY_COUNT_BUCKETS = (1, 2, 5, 10, 20, 50, 100, 250, 500)
+
+Labels = tuple[tuple[str, str], ...]
+
+
+def _labels(**labels: str) -> Labels:
+    return tuple(sorted(labels.items()))
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _format_labels(labels: Labels, extra: tuple[str, str] | None = None) -> str:
+    items = [*labels, extra] if extra else list(labels)
+    if not items:
+        return ""
+    return "{" + ",".join(f'{k}="{_escape(v)}"' for k, v in items) + "}"
+
+
+class MetricsRegistry:
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._help: dict[str, tuple[str, str]] = {}
+        self._values: dict[str, dict[Labels, float]] = {}
+        self._histograms: dict[str, tuple[tuple[float, ...], dict[Labels, list[float]]]] = {}
+
+    def counter(self, name: str, help_text: str) -> None:
+        self._help[name] = ("counter", help_text)
+        self._values.setdefault(name, {})
+
+    def gauge(self, name: str, help_text: str) -> None:
+        self._help[name] = ("gauge", help_text)
+        self._values.setdefault(name, {})
+
+    def histogram(self, name: str, help_text: str, buckets: tuple[float, ...]) -> None:
+        self._help[name] = ("histogram", help_text)
+        self._histograms.setdefault(name, (buckets, {}))
+
+    def inc(self, name: str, labels: Labels = (), amount: float = 1.0) -> None:
+        with self._lock:
+            series = self._values[name]
+            series[labels] = series.get(labels, 0.0) + amount
+
+    def observe(self, name: str, labels: Labels, value: float) -> None:
+        buckets, series = self._histograms[name]
+        with self._lock:
+            counts = series.get(labels)
+            if counts is None:
+                counts = series[labels] = [0.0] * (len(buckets) + 2)
+            for i, bound in enumerate(buckets):
+                if value <= bound:
+                    counts[i] += 1
+            counts[-2] += 1
+            counts[-1] += value
+
+    def render(self) -> str:
+        lines: list[str] = []
+        with self._lock:
+            for name, (kind, help_text) in self._help.items():
+                lines.append(f"# HELP {name} {help_text}")
+                lines.append(f"# TYPE {name} {kind}")
+                if kind == "histogram":
+                    buckets, series = self._histograms[name]
+                    for labels, counts in series.items():
+                        for bound, count in zip(buckets, counts):
+                            le = ("le", f"{bound:g}")
+                            lines.append(f"{name}_bucket{_format_labels(labels, le)} {count:g}")
+                        inf = ("le", "+Inf")
+                        lines.append(f"{name}_bucket{_format_labels(labels, inf)} {counts[-2]:g}")
+                        lines.append(f"{name}_count{_format_labels(labels)} {counts[-2]:g}")
+                        lines.append(f"{name}_sum{_format_labels(labels)} {counts[-1]:.6f}")
+                else:
+                    for labels, value in self._values[name].items():
+                        lines.append(f"{name}{_format_labels(labels)} {value:g}")
+        return "\n".join(lines) + "\n"
+
+
+registry = MetricsRegistry()
+registry.counter("http_requests_total", "HTTP requests by method, route and status code.")
+registry.histogram(
+    "http_request_duration_seconds", "HTTP request latency by method and route.", LATENCY_BUCKETS
+)
+registry.gauge("http_requests_in_flight", "HTTP requests currently being served.")
+registry.histogram(
+    "db_queries_per_request", "Database statements executed per request.", QUERY_COUNT_BUCKETS
+)
+registry.counter("db_query_seconds_total", "Time spent executing database statements.")
+registry.counter("db_queries_total", "Database statements executed, per route.")
+registry.counter(
+    "db_n_plus_one_total", "Requests that repeated one statement at least the N+1 threshold."
+)
+registry.counter("reminders_sent_total", "Obligation reminders delivered, per sink.")
+registry.counter("reminder_send_failures_total", "Reminder batches a sink failed to deliver.")
+registry.counter("audit_events_dropped_total", "Buffered audit events dropped because the buffer was full.")
+
+
+@dataclass
+class RequestStats:
+    queries: int = 0
+    db_seconds: float = 0.0
+    statements: Counter[str] = field(default_factory=Counter)
+
+
+_request_stats: ContextVar[RequestStats | None] = ContextVar("request_stats", default=None)
+
+
+def _n_plus_one_threshold() -> int:
+    return int(os.getenv("METRICS_N_PLUS_ONE_THRESHOLD", "10"))
+
+
+def instrument_engine(target: Engine) -> None:
+    @event.listens_for(target, "before_cursor_execute")
+    def _before(conn: Any, cursor: Any, statement: str, *args: Any) -> None:
+        conn.info.setdefault("query_started_at", []).append(time.perf_counter())
+
+    @event.listens_for(target, "after_cursor_execute")
+    def _after(conn: Any, cursor: Any, statement: str, *args: Any) -> None:
+        elapsed = time.perf_counter() - conn.info["query_started_at"].pop()
+        stats = _request_stats.get()
+        if stats is None:
+            registry.inc("db_queries_total", _labels(route="background"))
+            registry.inc("db_query_seconds_total", _labels(route="background"), elapsed)
+            return
+        stats.queries += 1
+        stats.db_seconds += elapsed
+        stats.statements[statement] += 1
+
+
+def _route_label(scope: Scope) -> str:
+    route = scope.get("route")
+    path = getattr(route, "path", None)
+    if not path:
+        return "unmatched"
+    request_path = scope["path"]
+    root_path = scope.get("root_path", "")
+    if root_path and request_path.startswith(root_path):
+        request_path = request_path[len(root_path) :]
+    regex = getattr(route, "path_regex", None)
+    if regex is None or regex.match(request_path):
+        return path
+    # Newer FastAPI versions keep an included router's own path on the route; restore its prefix.
+    for i, char in enumerate(request_path):
+        if i and char == "/" and regex.match(request_path[i:]):
+            return request_path[:i] + path
+    return path
+
+
+class MetricsMiddleware:
+    def __init__(self, app: ASGIApp) -> None:
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        status_code = 500
+
+        async def send_wrapper(message: Message) -> None:
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+            await send(message)
+
+        stats = RequestStats()
+        token = _request_stats.set(stats)
+        registry.inc("http_requests_in_flight")
+        started = time.perf_counter()
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            elapsed = time.perf_counter() - started
+            registry.inc("http_requests_in_flight", amount=-1)
+            _request_stats.reset(token)
+            self._record(scope, status_code, elapsed, stats)
+
+    def _record(self, scope: Scope, status_code: int, elapsed: float, stats: RequestStats) -> None:
+        method = scope["method"]
+        route = _route_label(scope)
+        registry.inc(
+            "http_requests_total", _labels(method=method, route=route, status=str(status_code))
+        )
+        registry.observe("http_request_duration_seconds", _labels(method=method, route=route), elapsed)
+        if not stats.queries:
+            return
+
+        labels = _labels(route=route)
+        registry.observe("db_queries_per_request", labels, stats.queries)
+        registry.inc("db_queries_total", labels, stats.queries)
+        registry.inc("db_query_seconds_total", labels, stats.db_seconds)
+        statement, repeats = stats.statements.most_common(1)[0]
+        if repeats >= _n_plus_one_threshold():
+            registry.inc("db_n_plus_one_total", labels)
+            logger.warning(
+                "Possible N+1 on %s %s: statement ran %d times: %s",
+                method,
+                route,
+                repeats,
+                " ".join(statement.split())[:200],
+            )
@@ -0,0 +1,174 @@
+from __future__ import annotations
+
+import calendar
+from bisect import bisect_left
+from collections.abc import Iterable
+from datetime import datetime, time, timedelta
+from operator import itemgetter
+from typing import NamedTuple
+
+from app import schemas
+
+_MONTH_STEPS: dict[str, int] = {
+    schemas.Frequency.MONTHLY.value: 1,
+    schemas.Frequency.QUARTERLY.value: 3,
+    schemas.Frequency.SEMI_ANNUAL.value: 6,
+    schemas.Frequency.ANNUAL.value: 12,
+}
+
+_DAY_STEPS: dict[str, int] = {
+    schemas.Frequency.DAILY.value: 1,
+    schemas.Frequency.WEEKLY.value: 7,
+}
+
+_RRULES: dict[str, str] = {
+    schemas.Frequency.DAILY.value: "FREQ=DAILY",
+    schemas.Frequency.WEEKLY.value: "FREQ=WEEKLY",
+    schemas.Frequency.MONTHLY.value: "FREQ=MONTHLY",
+    schemas.Frequency.QUARTERLY.value: "FREQ=MONTHLY;INTERVAL=3",
+    schemas.Frequency.SEMI_ANNUAL.value: "FREQ=MONTHLY;INTERVAL=6",
+    schemas.Frequency.ANNUAL.value: "FREQ=YEARLY",
+}
+
+
+def is_recurring(frequency: str) -> bool:
+    return frequency in _MONTH_STEPS or frequency in _DAY_STEPS
+
+
+def rrule_for(frequency: str, day: int | None = None) -> str | None:
+    step = _MONTH_STEPS.get(frequency)
+    if step is None or day is None or day <= 28:
+        return _RRULES.get(frequency)
+    # Calendar clients skip months that lack BYMONTHDAY, so clamp short months to their last day.
+    interval = f";INTERVAL={step}" if step > 1 else ""
+    if day == 31:
+        return f"FREQ=MONTHLY{interval};BYMONTHDAY=-1"
+    days = ",".join(str(d) for d in range(28, day + 1))
+    return f"FREQ=MONTHLY{interval};BYMONTHDAY={days};BYSETPOS=-1"
+
+
+def _month_at(month_index: int, day: int, at: time) -> datetime:
+    year, month = divmod(month_index, 12)
+    last = calendar.monthrange(year, month + 1)[1]
+    return datetime(
+        year, month + 1, min(day, last), at.hour, at.minute, at.second, at.microsecond
+    )
+
+
+def _month_index(dt: datetime) -> int:
+    return dt.year * 12 + dt.month - 1
+
+
+def _month_schedule(
+    step: int, day: int, at: time, phase: int, start: datetime, end: datetime
+) -> list[datetime]:
+    month_index = _month_index(start)
+    month_index -= (month_index - phase) % step
+    schedule: list[datetime] = []
+    while True:
+        occurrence = _month_at(month_index, day, at)
+        if occurrence > end:
+            break
+        if occurrence >= start:
+            schedule.append(occurrence)
+        month_index += step
+    return schedule
+
+
+Schedules = dict[tuple[int, int, time | timedelta, int], list[datetime]]
+
+
+def _rule_schedule(
+    anchor: datetime,
+    frequency: str,
+    start: datetime,
+    end: datetime,
+    day: int | None,
+    schedules: Schedules | None,
+) -> list[datetime] | None:
+    step = _MONTH_STEPS.get(frequency)
+    if step is not None:
+        day = day or anchor.day
+        at = anchor.time()
+        phase = _month_index(anchor) % step
+        key = (step, day, at, phase)
+        schedule = schedules.get(key) if schedules is not None else None
+        if schedule is None:
+            schedule = _month_schedule(step, day, at, phase, start, end)
+    else:
+        days = _DAY_STEPS.get(frequency)
+        if days is None:
+            return None
+        period = timedelta(days=days)
+        offset = (anchor - start) % period
+        key = (0, days, offset, 0)
+        schedule = schedules.get(key) if schedules is not None else None
+        if schedule is None:
+            count = (end - start - offset) // period + 1
+            schedule = [start + offset + period * k for k in range(max(count, 0))]
+    if schedules is not None:
+        schedules[key] = schedule
+    return schedule
+
+
+def occurrences_between(
+    anchor: datetime,
+    frequency: str,
+    start: datetime,
+    end: datetime,
+    *,
+    day: int | None = None,
+    schedules: Schedules | None = None,
+) -> list[datetime]:
+    if end < start:
+        return []
+    schedule = _rule_schedule(anchor, frequency, start, end, day, schedules)
+    if schedule is None:
+        return [anchor] if start <= anchor <= end else []
+    return schedule[bisect_left(schedule, anchor) :]
+
+
+def next_occurrence_after(
+    anchor: datetime, frequency: str, *, day: int | None = None
+) -> datetime | None:
+    step = _MONTH_STEPS.get(frequency)
+    if step is not None:
+        # Step from the anchor day rather than the clamped date, so Jan 31 -> Feb 28 -> Mar 31.
+        return _month_at(_month_index(anchor) + step, day or anchor.day, anchor.time())
+    days = _DAY_STEPS.get(frequency)
+    if days is not None:
+        return anchor + timedelta(days=days)
+    return None
+
+
+class Occurrence(NamedTuple):
+    due_at: datetime
+    obligation_id: int
+    loan_id: int
+    name: str
+    obligation_type: str
+    frequency: str
+
+
+_due_at = itemgetter(0)
+
+
+def expand_occurrences(
+    rows: Iterable[tuple[int, int, str, str, str, datetime | None, int | None]],
+    *,
+    start: datetime,
+    end: datetime,
+) -> list[Occurrence]:
+    # One schedule per (step, day, time, phase) for this window; each anchor bisects into it.
+    schedules: Schedules = {}
+    make = tuple.__new__
+    expanded: list[Occurrence] = []
+    for obligation_id, loan_id, name, obligation_type, frequency, anchor, day in rows:
+        if anchor is None:
+            continue
+        due = occurrences_between(anchor, frequency, start, end, day=day, schedules=schedules)
+        fields = (obligation_id, loan_id, name, obligation_type, frequency)
+        expanded += [make(Occurrence, (due_at, *fields)) for due_at in due]
+    # Rows arrive in obligation id order, so the stable sort keeps ties ordered by id.
+    expanded.sort(key=_due_at)
+    return expanded
@@ -0,0 +1,218 @@
+from __future__ import annotations
+
+import heapq
+import logging
+import os
+import socket
+import threading
+import time
+import uuid
+from collections import defaultdict
+from datetime import datetime, timedelta
+from typing import Any
+
+from sqlalchemy import event
+from sqlalchemy.orm import Session
+
+from app import crud, schemas
+from app.db import SessionLocal
+from app.services.metrics import registry
+from app.services.reminder_sinks import ReminderBatch, ReminderItem, ReminderSink, sinks_from_env
+
+logger = logging.getLogger(__name__)
+
+
+class ReminderScheduler:
+    def __init__(
+        self,
+        *,
+        sinks: list[ReminderSink],
+        batch_size: int = 500,
+        max_attempts: int = 5,
+        retry_seconds: float = 60.0,
+        max_sleep_seconds: float = 3600.0,
+        lease_seconds: float = 300.0,
+    ) -> None:
+        self.sinks = sinks
+        self.batch_size = batch_size
+        self.max_attempts = max_attempts
+        self.retry_seconds = retry_seconds
+        self.max_sleep_seconds = max_sleep_seconds
+        self.lease = timedelta(seconds=lease_seconds)
+        self.worker_id = f"{socket.gethostname()}:{os.getpid()}:{uuid.uuid4().hex[:8]}"
+        self._queue: list[datetime] = []
+        self._cond = threading.Condition()
+        self._stop = threading.Event()
+        self._thread: threading.Thread | None = None
+
+    @property
+    def running(self) -> bool:
+        return self._thread is not None and self._thread.is_alive()
+
+    def notify(self, at: datetime) -> None:
+        with self._cond:
+            # Later instants are rediscovered from the reminders index after each wake.
+            if self._queue and self._queue[0] <= at:
+                return
+            heapq.heappush(self._queue, at)
+            self._cond.notify()
+
+    def _after_commit(self, session: Session) -> None:
+        at = session.info.pop("reminder_at", None)
+        if at is not None:
+            self.notify(at)
+
+    def _after_rollback(self, session: Session) -> None:
+        session.info.pop("reminder_at", None)
+
+    def _wait(self) -> None:
+        deadline = time.monotonic() + self.max_sleep_seconds
+        with self._cond:
+            while not self._stop.is_set():
+                now = crud.now_utc()
+                if self._queue and self._queue[0] <= now:
+                    while self._queue and self._queue[0] <= now:
+                        heapq.heappop(self._queue)
+                    return
+                timeout = deadline - time.monotonic()
+                if timeout <= 0:
+                    return
+                if self._queue:
+                    timeout = min(timeout, (self._queue[0] - now).total_seconds())
+                self._cond.wait(timeout)
+
+    def _deliver(self, db: Session, claimed: list[Any], now: datetime) -> int:
+        by_party: dict[str, list[Any]] = defaultdict(list)
+        for row in claimed:
+            by_party[row.party_responsible].append(row)
+        sent_to = {row.id: list(row.sent_to or []) for row in claimed}
+        errors: dict[int, str] = {}
+        renewed = time.monotonic()
+
+        for sink in self.sinks:
+            labels = (("sink", sink.name),)
+            for party, rows in by_party.items():
+                todo = [row for row in rows if sink.name not in sent_to[row.id]]
+                if not todo:
+                    continue
+                if time.monotonic() - renewed > self.lease.total_seconds() / 2:
+                    crud.renew_reminder_leases(
+                        db,
+                        reminder_ids=[row.id for row in claimed],
+                        worker_id=self.worker_id,
+                        lease=self.lease,
+                    )
+                    renewed = time.monotonic()
+                batch = ReminderBatch(
+                    party_responsible=party,
+                    items=tuple(
+                        ReminderItem(
+                            reminder_id=row.id,
+                            obligation_id=row.obligation_id,
+                            loan_id=row.loan_id,
+                            loan_title=row.loan_title,
+                            name=row.name,
+                            obligation_type=row.obligation_type,
+                            due_at=row.due_at,
+                            lead_days=row.lead_days,
+                        )
+                        for row in todo
+                    ),
+                )
+                try:
+                    sink.send(batch)
+                except Exception as exc:
+                    logger.warning("Reminder sink %s failed for %d reminders: %s", sink.name, len(todo), exc)
+                    registry.inc("reminder_send_failures_total", labels)
+                    for row in todo:
+                        errors[row.id] = f"{sink.name}: {exc}"
+                    continue
+                registry.inc("reminders_sent_total", labels, len(todo))
+                for row in todo:
+                    sent_to[row.id].append(sink.name)
+                crud.save_reminder_states(db, [{"id": row.id, "sent_to": sent_to[row.id]} for row in todo])
+
+        states: list[dict[str, Any]] = []
+        for row in claimed:
+            state: dict[str, Any] = {
+                "id": row.id,
+                "sent_to": sent_to[row.id],
+                "claimed_by": None,
+                "lease_expires_at": None,
+            }
+            if row.id not in errors:
+                state.update(status=schemas.ReminderStatus.SENT.value, sent_at=now, last_error=None)
+            elif row.attempts >= self.max_attempts:
+                state.update(status=schemas.ReminderStatus.FAILED.value, last_error=errors[row.id])
+            else:
+                state.update(
+                    status=schemas.ReminderStatus.PENDING.value,
+                    remind_at=now + timedelta(seconds=self.retry_seconds * 2 ** (row.attempts - 1)),
+                    last_error=errors[row.id],
+                )
+            states.append(state)
+        crud.save_reminder_states(db, states)
+        return len(claimed) - len(errors)
+
+    def run_once(self, now: datetime | None = None) -> int:
+        n = now or crud.now_utc()
+        delivered = 0
+        with SessionLocal() as db:
+            interrupted = crud.fail_interrupted_reminders(db)
+            if interrupted:
+                logger.warning("Marked %d reminders interrupted during delivery as failed", interrupted)
+            while True:
+                claimed = crud.claim_due_reminders(
+                    db, worker_id=self.worker_id, lease=self.lease, now=n, limit=self.batch_size
+                )
+                if claimed:
+                    delivered += self._deliver(db, claimed, n)
+                next_at = crud.next_reminder_at(db)
+                if next_at is None or next_at > n:
+                    break
+        if next_at is not None:
+            self.notify(next_at)
+        return delivered
+
+    def _run(self) -> None:
+        while not self._stop.is_set():
+            try:
+                delivered = self.run_once()
+                if delivered:
+                    logger.info("Reminder scheduler delivered %d reminders", delivered)
+            except Exception:
+                logger.exception("Reminder dispatch failed")
+                self._stop.wait(self.retry_seconds)
+                continue
+            self._wait()
+
+    def start(self) -> None:
+        if not self.sinks or self.running:
+            return
+        event.listen(Session, "after_commit", self._after_commit)
+        event.listen(Session, "after_rollback", self._after_rollback)
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name="reminder-scheduler", daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        if self._thread is None:
+            return
+        self._stop.set()
+        with self._cond:
+            self._cond.notify_all()
+        self._thread.join(timeout=10)
+        self._thread = None
+        event.remove(Session, "after_commit", self._after_commit)
+        event.remove(Session, "after_rollback", self._after_rollback)
+
+
+def get_reminder_scheduler() -> ReminderScheduler:
+    return ReminderScheduler(
+        sinks=sinks_from_env(),
+        batch_size=int(os.getenv("REMINDER_BATCH_SIZE", "500")),
+        max_attempts=int(os.getenv("REMINDER_MAX_ATTEMPTS", "5")),
+        retry_seconds=float(os.getenv("REMINDER_RETRY_SECONDS", "60")),
+        max_sleep_seconds=float(os.getenv("REMINDER_MAX_SLEEP_SECONDS", "3600")),
+        lease_seconds=float(os.getenv("REMINDER_LEASE_SECONDS", "300")),
+    )
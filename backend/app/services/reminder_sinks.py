@@ -0,0 +1,167 @@
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+import re
+import smtplib
+import urllib.request
+from dataclasses import asdict, dataclass
+from datetime import datetime
+from email.message import EmailMessage
+from email.utils import make_msgid
+from typing import Protocol
+
+
+@dataclass(frozen=True)
+class ReminderItem:
+    reminder_id: int
+    obligation_id: int
+    loan_id: int
+    loan_title: str
+    name: str
+    obligation_type: str
+    due_at: datetime
+    lead_days: int
+
+    @property
+    def key(self) -> str:
+        return hashlib.sha256(f"reminder:{self.reminder_id}".encode()).hexdigest()
+
+
+@dataclass(frozen=True)
+class ReminderBatch:
+    party_responsible: str
+    items: tuple[ReminderItem, ...]
+
+    @property
+    def key(self) -> str:
+        ids = ",".join(str(i) for i in sorted(item.reminder_id for item in self.items))
+        return hashlib.sha256(ids.encode()).hexdigest()
+
+    def to_json(self) -> bytes:
+        return json.dumps(
+            {
+                "party_responsible": self.party_responsible,
+                # Retried batches can regroup reminders, so receivers dedupe on each item's key.
+                "reminders": [{**asdict(item), "idempotency_key": item.key} for item in self.items],
+            },
+            default=str,
+        ).encode()
+
+    def to_text(self) -> str:
+        party = self.party_responsible or "unassigned"
+        lines = [f"{len(self.items)} obligation(s) assigned to {party} are coming due:", ""]
+        for item in self.items:
+            lines.append(
+                f"- {item.name} ({item.obligation_type}) for {item.loan_title}: "
+                f"due {item.due_at:%Y-%m-%d %H:%M} UTC"
+            )
+        return "\n".join(lines) + "\n"
+
+
+def party_key(party: str) -> str:
+    return re.sub(r"[^A-Z0-9]+", "_", party.upper()).strip("_") or "UNASSIGNED"
+
+
+class ReminderSink(Protocol):
+    name: str
+
+    def send(self, batch: ReminderBatch) -> None: ...
+
+
+class WebhookSink:
+    name = "webhook"
+
+    def __init__(self, url: str, *, timeout_seconds: float = 10.0) -> None:
+        self.url = url
+        self.timeout_seconds = timeout_seconds
+
+    def send(self, batch: ReminderBatch) -> None:
+        request = urllib.request.Request(
+            self.url,
+            data=batch.to_json(),
+            method="POST",
+            headers={"Content-Type": "application/json", "Idempotency-Key": batch.key},
+        )
+        with urllib.request.urlopen(request, timeout=self.timeout_seconds) as response:
+            response.read()
+
+
+class SmtpSink:
+    name = "smtp"
+
+    def __init__(
+        self,
+        host: str,
+        *,
+        port: int = 25,
+        sender: str,
+        recipients: list[str],
+        party_recipients: dict[str, list[str]] | None = None,
+        username: str | None = None,
+        password: str | None = None,
+        starttls: bool = False,
+        timeout_seconds: float = 10.0,
+    ) -> None:
+        self.host = host
+        self.port = port
+        self.sender = sender
+        self.recipients = recipients
+        self.party_recipients = party_recipients or {}
+        self.username = username
+        self.password = password
+        self.starttls = starttls
+        self.timeout_seconds = timeout_seconds
+
+    def recipients_for(self, party_responsible: str) -> list[str]:
+        return self.party_recipients.get(party_key(party_responsible), self.recipients)
+
+    def _message(self, batch: ReminderBatch) -> EmailMessage:
+        message = EmailMessage()
+        party = batch.party_responsible or "unassigned"
+        message["Subject"] = f"{len(batch.items)} obligation(s) coming due for {party}"
+        message["From"] = self.sender
+        message["To"] = ", ".join(self.recipients_for(batch.party_responsible))
+        message["X-Party-Responsible"] = party
+        message["Message-ID"] = make_msgid(idstring=batch.key[:32])
+        message.set_content(batch.to_text())
+        return message
+
+    def send(self, batch: ReminderBatch) -> None:
+        with smtplib.SMTP(self.host, self.port, timeout=self.timeout_seconds) as smtp:
+            if self.starttls:
+                smtp.starttls()
+            if self.username:
+                smtp.login(self.username, self.password or "")
+            smtp.send_message(self._message(batch))
+
+
+def _addresses(raw: str) -> list[str]:
+    return [r.strip() for r in raw.split(",") if r.strip()]
+
+
+def sinks_from_env() -> list[ReminderSink]:
+    timeout = float(os.getenv("REMINDER_SINK_TIMEOUT_SECONDS", "10"))
+    sinks: list[ReminderSink] = []
+    if url := os.getenv("REMINDER_WEBHOOK_URL"):
+        sinks.append(WebhookSink(url, timeout_seconds=timeout))
+    if host := os.getenv("REMINDER_SMTP_HOST"):
+        sinks.append(
+            SmtpSink(
+                host,
+                port=int(os.getenv("REMINDER_SMTP_PORT", "25")),
+                sender=os.getenv("REMINDER_SMTP_FROM", "covenantops@localhost"),
+                recipients=_addresses(os.getenv("REMINDER_SMTP_TO", "")),
+                party_recipients={
+                    name.removeprefix("REMINDER_SMTP_TO_"): _addresses(value)
+                    for name, value in os.environ.items()
+                    if name.startswith("REMINDER_SMTP_TO_")
+                },
+                username=os.getenv("REMINDER_SMTP_USERNAME") or None,
+                password=os.getenv("REMINDER_SMTP_PASSWORD") or None,
+                starttls=os.getenv("REMINDER_SMTP_STARTTLS", "0") != "0",
+                timeout_seconds=timeout,
+            )
+        )
+    return sinks
@@ -0,0 +1,42 @@
+from __future__ import annotations
+
+import os
+from datetime import datetime, timedelta
+
+DEFAULT_LEAD_DAYS = "14,7,1"
+
+
+def enabled() -> bool:
+    # Without a sink nothing would ever deliver them, so reminder rows are not scheduled.
+    return bool(os.getenv("REMINDER_WEBHOOK_URL") or os.getenv("REMINDER_SMTP_HOST"))
+
+
+def _parse_lead_days(raw: str) -> tuple[int, ...]:
+    days = {int(part) for part in raw.split(",") if part.strip()}
+    if any(d < 0 for d in days):
+        raise ValueError(f"Reminder lead times must not be negative: {raw!r}")
+    return tuple(sorted(days, reverse=True))
+
+
+def lead_days(obligation_type: str) -> tuple[int, ...]:
+    raw = os.getenv(f"REMINDER_LEAD_DAYS_{obligation_type.upper()}")
+    if raw is None:
+        raw = os.getenv("REMINDER_LEAD_DAYS", DEFAULT_LEAD_DAYS)
+    return _parse_lead_days(raw)
+
+
+def plan(obligation_type: str, due_at: datetime, *, now: datetime) -> list[tuple[int, datetime]]:
+    if due_at <= now:
+        return []
+    planned: list[tuple[int, datetime]] = []
+    missed: int | None = None
+    for days in lead_days(obligation_type):
+        remind_at = due_at - timedelta(days=days)
+        if remind_at > now:
+            planned.append((days, remind_at))
+        else:
+            missed = days
+    # Lead times already behind us collapse into one immediate reminder at the tightest of them.
+    if missed is not None:
+        planned.append((missed, now))
+    return planned
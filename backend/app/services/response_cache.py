@@ -0,0 +1,68 @@
+from __future__ import annotations
+
+import os
+import time
+from collections.abc import Hashable
+from dataclasses import dataclass, field
+from datetime import datetime
+
+from fastapi import Response
+
+from app.services.cache import LRUCache
+
+_cache = LRUCache(
+    max_entries=int(os.getenv("RESPONSE_CACHE_ENTRIES", "1024")),
+    max_bytes=int(os.getenv("RESPONSE_CACHE_BYTES", str(32 * 1024 * 1024))),
+)
+
+
+def _ttl_seconds() -> float:
+    return float(os.getenv("RESPONSE_CACHE_TTL_SECONDS", "0"))
+
+
+@dataclass(frozen=True)
+class CachedResponse:
+    body: bytes
+    headers: dict[str, str] = field(default_factory=dict)
+    fresh_until: datetime | None = None
+    expires_at: float | None = None
+
+    def is_fresh(self, now: datetime) -> bool:
+        if self.expires_at is not None and time.monotonic() >= self.expires_at:
+            return False
+        return self.fresh_until is None or now < self.fresh_until
+
+    def to_response(self) -> Response:
+        return Response(content=self.body, media_type="application/json", headers=self.headers)
+
+
+def get(key: Hashable, *, now: datetime) -> CachedResponse | None:
+    entry = _cache.get(key)
+    if entry is None:
+        return None
+    if not entry.is_fresh(now):
+        _cache.pop(key)
+        return None
+    return entry
+
+
+def put(
+    key: Hashable,
+    body: bytes,
+    *,
+    headers: dict[str, str] | None = None,
+    fresh_until: datetime | None = None,
+) -> CachedResponse:
+    ttl = _ttl_seconds()
+    entry = CachedResponse(
+        body=body,
+        headers=headers or {},
+        fresh_until=fresh_until,
+        expires_at=time.monotonic() + ttl if ttl > 0 else None,
+    )
+    _cache.set(key, entry, size=len(body))
+    return entry
+
+
+def clear() -> None:
+    _cache.clear()
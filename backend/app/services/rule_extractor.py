@@ -0,0 +1,321 @@
+from __future__ import annotations
+
+import multiprocessing
+import re
+import threading
+from collections.abc import Callable, Iterator
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from datetime import date
+from typing import NamedTuple
+
+from app import schemas
+from app.services import due_specs
+
+_NUMBER = r"(?:[a-z\-]+\s+)?\(?(?P<days>\d{1,3})\)?"
+
+
+class ClauseRule(NamedTuple):
+    key: str
+    name: str
+    obligation_type: schemas.ObligationType
+    frequency: schemas.Frequency
+    triggers: tuple[str, ...]
+    pattern: re.Pattern[str]
+    confidence: float
+    due_rule: Callable[[re.Match[str]], str]
+    period_months: int | None = None
+
+
+def _after_period(period: str) -> Callable[[re.Match[str]], str]:
+    return lambda m: f"Within {m.group('days')} days after {period}-end"
+
+
+def _compile(pattern: str) -> re.Pattern[str]:
+    return re.compile(pattern, re.IGNORECASE | re.DOTALL)
+
+
+RULES: tuple[ClauseRule, ...] = (
+    ClauseRule(
+        key="annual_financials",
+        name="Annual audited financial statements",
+        obligation_type=schemas.ObligationType.REPORTING,
+        frequency=schemas.Frequency.ANNUAL,
+        triggers=("audited",),
+        pattern=_compile(
+            rf"audited.{{0,200}}?within\s+{_NUMBER}\s+days\s+after\s+the\s+end\s+of\s+each\s+"
+            r"(?:of\s+its\s+)?(?:fiscal|financial)\s+years?"
+        ),
+        confidence=0.9,
+        due_rule=_after_period("fiscal year"),
+        period_months=12,
+    ),
+    ClauseRule(
+        key="quarterly_financials",
+        name="Quarterly financial statements",
+        obligation_type=schemas.ObligationType.REPORTING,
+        frequency=schemas.Frequency.QUARTERLY,
+        triggers=("quarter",),
+        pattern=_compile(
+            rf"financial\s+statements.{{0,200}}?within\s+{_NUMBER}\s+days\s+after\s+the\s+end\s+"
+            r"of\s+each\s+(?:fiscal\s+|financial\s+)?quarter"
+        ),
+        confidence=0.88,
+        due_rule=_after_period("quarter"),
+        period_months=3,
+    ),
+    ClauseRule(
+        key="compliance_certificate",
+        name="Compliance certificate",
+        obligation_type=schemas.ObligationType.REPORTING,
+        frequency=schemas.Frequency.QUARTERLY,
+        triggers=("compliance certificate",),
+        pattern=_compile(r"compliance\s+certificate"),
+        confidence=0.82,
+        due_rule=lambda m: "Together with each set of financial statements",
+    ),
+    ClauseRule(
+        key="borrowing_base_certificate",
+        name="Monthly borrowing base certificate",
+        obligation_type=schemas.ObligationType.REPORTING,
+        frequency=schemas.Frequency.MONTHLY,
+        triggers=("borrowing base",),
+        pattern=_compile(
+            rf"borrowing\s+base\s+certificate.{{0,200}}?within\s+{_NUMBER}\s+days\s+after\s+"
+            r"the\s+end\s+of\s+each\s+(?:calendar\s+)?month"
+        ),
+        confidence=0.85,
+        due_rule=_after_period("month"),
+        period_months=1,
+    ),
+    ClauseRule(
+        key="annual_budget",
+        name="Annual budget delivery",
+        obligation_type=schemas.ObligationType.INFORMATION,
+        frequency=schemas.Frequency.ANNUAL,
+        triggers=("budget",),
+        pattern=_compile(r"(?:annual|operating)\s+budget"),
+        confidence=0.74,
+        due_rule=lambda m: "Before the start of each fiscal year",
+    ),
+    ClauseRule(
+        key="notice_of_default",
+        name="Notice of Default / Event of Default",
+        obligation_type=schemas.ObligationType.NOTICE,
+        frequency=schemas.Frequency.AD_HOC,
+        triggers=("default",),
+        pattern=_compile(
+            r"notify\s+the\s+(?:agent|lender)s?.{0,120}?(?:default|event\s+of\s+default)"
+        ),
+        confidence=0.8,
+        due_rule=lambda m: "Promptly upon becoming aware",
+    ),
+    ClauseRule(
+        key="notice_period",
+        name="Prior notice requirement",
+        obligation_type=schemas.ObligationType.NOTICE,
+        frequency=schemas.Frequency.AD_HOC,
+        triggers=("notice",),
+        pattern=_compile(
+            rf"not\s+less\s+than\s+{_NUMBER}\s+(?P<kind>business\s+)?days'?\s+(?:prior\s+)?"
+            r"(?:written\s+)?notice"
+        ),
+        confidence=0.72,
+        due_rule=lambda m: (
+            f"At least {m.group('days')} {'business days' if m.group('kind') else 'days'}' prior notice"
+        ),
+    ),
+    ClauseRule(
+        key="litigation_notice",
+        name="Material litigation notice",
+        obligation_type=schemas.ObligationType.EVENT,
+        frequency=schemas.Frequency.AD_HOC,
+        triggers=("litigation",),
+        pattern=_compile(
+            r"litigation.{0,120}?(?:material|adverse)|(?:material|adverse).{0,120}?litigation"
+        ),
+        confidence=0.66,
+        due_rule=lambda m: "Promptly upon occurrence",
+    ),
+    ClauseRule(
+        key="negative_pledge",
+        name="Negative pledge (ongoing)",
+        obligation_type=schemas.ObligationType.COVENANT,
+        frequency=schemas.Frequency.AD_HOC,
+        triggers=("security", "lien"),
+        pattern=_compile(
+            r"(?:shall\s+not|will\s+not|no\s+(?:obligor|borrower|guarantor)\s+shall)"
+            r".{0,80}?(?:create|permit).{0,80}?(?:security|lien)"
+        ),
+        confidence=0.68,
+        due_rule=lambda m: "Ongoing; monitor continuously",
+    ),
+)
+
+_COVENANT = _compile(
+    r"(?P<ratio>leverage|interest\s+cover(?:age)?|debt\s+service\s+cover(?:age)?|fixed\s+charge\s+"
+    r"cover(?:age)?)\s+ratio.{0,160}?(?P<test>(?:shall\s+)?not\s+(?:exceed|be\s+(?:greater|more)\s+"
+    r"than)|(?:shall\s+)?not\s+be\s+less\s+than|(?:shall\s+be\s+)?at\s+least)\s+(?P<value>\d+(?:\.\d+)?)"
+    r"\s*(?::\s*1|to\s*1(?:\.0+)?|x)"
+)
+_COVENANT_TRIGGERS = ("ratio",)
+
+
+def _build_trigger_index(rules: tuple[ClauseRule, ...]) -> dict[str, tuple[ClauseRule, ...]]:
+    index: dict[str, tuple[ClauseRule, ...]] = {}
+    for rule in rules:
+        for trigger in rule.triggers:
+            index[trigger] = index.get(trigger, ()) + (rule,)
+    return index
+
+
+_TRIGGER_INDEX = _build_trigger_index(RULES)
+_TRIGGERS = _compile(
+    "|".join(re.escape(t).replace(r"\ ", r"\s+") for t in [*_TRIGGER_INDEX, *_COVENANT_TRIGGERS])
+)
+
+_CLAUSE_BREAK = re.compile(r"\n\s*\n|\n(?=\s*(?:\d+(?:\.\d+)+\.?|\([a-z]{1,4}\))\s)")
+
+
+class Clause(NamedTuple):
+    text: str
+    page: int
+
+
+def split_pages(text: str) -> list[str]:
+    return text.split("\f")
+
+
+def split_clauses(pages: list[str], *, first_page: int = 1) -> Iterator[Clause]:
+    for offset, page in enumerate(pages):
+        for raw in _CLAUSE_BREAK.split(page):
+            clause = " ".join(raw.split())
+            if clause:
+                yield Clause(clause, first_page + offset)
+
+
+def _excerpt(clause: str, match: re.Match[str], width: int = 400) -> str:
+    if len(clause) <= width:
+        return clause
+    start = max(0, min(match.start() - width // 4, len(clause) - width))
+    return clause[start : start + width]
+
+
+def _match_clause(clause: Clause, today: date) -> Iterator[tuple[str, schemas.ExtractedObligation]]:
+    hits = {m.group(0).lower() for m in _TRIGGERS.finditer(clause.text)}
+    if not hits:
+        return
+
+    candidates: dict[str, ClauseRule] = {}
+    for hit in hits:
+        for rule in _TRIGGER_INDEX.get(" ".join(hit.split()), ()):
+            candidates[rule.key] = rule
+
+    for rule in candidates.values():
+        match = rule.pattern.search(clause.text)
+        if not match:
+            continue
+        due_date = None
+        due_spec = None
+        if rule.period_months and match.groupdict().get("days"):
+            due_spec = schemas.DueSpec(
+                period_months=rule.period_months, offset_days=int(match.group("days"))
+            )
+            due_date = due_specs.next_period_due(rule.period_months, due_spec.offset_days, today)
+        yield rule.key, schemas.ExtractedObligation(
+            name=rule.name,
+            obligation_type=rule.obligation_type,
+            description=clause.text[:280],
+            party_responsible="Borrower",
+            frequency=rule.frequency,
+            due_date=due_date,
+            due_rule=rule.due_rule(match),
+            confidence=rule.confidence,
+            source_excerpt=_excerpt(clause.text, match),
+            source_page=clause.page,
+            due_spec=due_spec,
+        )
+
+    if "ratio" in hits:
+        for match in _COVENANT.finditer(clause.text):
+            ratio = " ".join(match.group("ratio").split()).title()
+            test = " ".join(match.group("test").split()).lower()
+            maximum = "exceed" in test or "greater" in test or "more" in test
+            bound = "Maximum" if maximum else "Minimum"
+            yield f"covenant:{ratio.lower()}", schemas.ExtractedObligation(
+                name=f"{ratio} ratio maintenance covenant",
+                obligation_type=schemas.ObligationType.COVENANT,
+                description=f"{bound} {ratio.lower()} ratio of {match.group('value')}:1.",
+                party_responsible="Borrower",
+                frequency=schemas.Frequency.QUARTERLY,
+                due_rule="Tested quarterly; reported with compliance certificate",
+                confidence=0.78,
+                source_excerpt=_excerpt(clause.text, match),
+                source_page=clause.page,
+            )
+
+
+def extract_chunk(
+    pages: list[str], first_page: int, today: date
+) -> list[tuple[str, schemas.ExtractedObligation]]:
+    return [
+        found
+        for clause in split_clauses(pages, first_page=first_page)
+        for found in _match_clause(clause, today)
+    ]
+
+
+class RuleBasedExtractor:
+    name = "rules"
+    version = "1"
+
+    def __init__(self, *, workers: int = 1, chunk_pages: int = 40) -> None:
+        self.workers = workers
+        self.chunk_pages = chunk_pages
+        self._pool: ProcessPoolExecutor | None = None
+        self._pool_lock = threading.Lock()
+
+    def _chunk_pool(self, *, reset: bool = False) -> ProcessPoolExecutor:
+        with self._pool_lock:
+            if self._pool is not None and reset:
+                self._pool.shutdown(wait=False, cancel_futures=True)
+                self._pool = None
+            if self._pool is None:
+                self._pool = ProcessPoolExecutor(
+                    max_workers=self.workers, mp_context=multiprocessing.get_context("spawn")
+                )
+            return self._pool
+
+    def close(self) -> None:
+        with self._pool_lock:
+            pool, self._pool = self._pool, None
+        if pool is not None:
+            pool.shutdown(wait=True, cancel_futures=True)
+
+    def extract_obligations(self, text: str) -> list[schemas.ExtractedObligation]:
+        today = date.today()
+        pages = split_pages(text or "")
+        chunks = [
+            (pages[i : i + self.chunk_pages], i + 1)
+            for i in range(0, len(pages), self.chunk_pages)
+        ]
+
+        # Inside a worker process the parent already owns the parallelism; never nest pools.
+        fan_out = self.workers > 1 and len(chunks) > 1 and multiprocessing.parent_process() is None
+        if fan_out:
+            args = ([c[0] for c in chunks], [c[1] for c in chunks], [today] * len(chunks))
+            try:
+                results = list(self._chunk_pool().map(extract_chunk, *args))
+            except BrokenProcessPool:
+                results = list(self._chunk_pool(reset=True).map(extract_chunk, *args))
+        else:
+            results = [extract_chunk(chunk, first_page, today) for chunk, first_page in chunks]
+
+        seen: set[str] = set()
+        obligations: list[schemas.ExtractedObligation] = []
+        for result in results:
+            for key, obligation in result:
+                if key not in seen:
+                    seen.add(key)
+                    obligations.append(obligation)
+        return obligations
@@ -0,0 +1,346 @@
+from __future__ import annotations
+
+import re
+from collections.abc import Iterable
+from typing import Any
+
+from sqlalchemy import (
+    ColumnElement,
+    Connection,
+    Engine,
+    Float,
+    Integer,
+    String,
+    bindparam,
+    column,
+    func,
+    literal_column,
+    select,
+    table,
+    text,
+)
+from sqlalchemy.orm import Session
+
+from app import models, schemas
+from app.services import document_store
+
+SEARCH_FIELDS = ("name", "description", "due_rule", "source_excerpt")
+HIGHLIGHT = ("**", "**")
+SNIPPET_CHARS = 160
+
+_obligation_fts = table("obligation_fts", column("rowid", Integer))
+_loan_text_fts = table("loan_text_fts", column("rowid", Integer))
+_loan_text_search = table("loan_text_search", column("chunk_id", Integer), column("document"))
+
+_SQLITE_DDL = [
+    "CREATE VIRTUAL TABLE obligation_fts USING fts5("
+    "name, description, due_rule, source_excerpt, tokenize = 'porter unicode61')",
+    "CREATE VIRTUAL TABLE loan_text_fts USING fts5("
+    "body, content = '', tokenize = 'porter unicode61')",
+]
+_POSTGRES_DOCUMENT = (
+    "to_tsvector('english', coalesce(name, '') || ' ' || coalesce(description, '') || ' ' "
+    "|| coalesce(due_rule, '') || ' ' || coalesce(source_excerpt, ''))"
+)
+_POSTGRES_DDL = [
+    f"CREATE INDEX ix_obligations_fts ON obligations USING gin ({_POSTGRES_DOCUMENT})",
+    "CREATE TABLE loan_text_search ("
+    "chunk_id integer PRIMARY KEY REFERENCES loan_document_chunks (id) ON DELETE CASCADE, "
+    "document tsvector NOT NULL)",
+    "CREATE INDEX ix_loan_text_search ON loan_text_search USING gin (document)",
+]
+
+
+class SearchUnavailable(RuntimeError):
+    pass
+
+
+def _dialect(bind: Session | Connection | Engine) -> str:
+    if isinstance(bind, Session):
+        bind = bind.get_bind()
+    return bind.dialect.name
+
+
+def create_schema(target: Engine) -> bool:
+    dialect = _dialect(target)
+    with target.begin() as conn:
+        if dialect == "sqlite":
+            exists = conn.scalar(
+                text("SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'obligation_fts'")
+            )
+            ddl = _SQLITE_DDL
+        elif dialect == "postgresql":
+            exists = conn.scalar(text("SELECT to_regclass('loan_text_search')"))
+            ddl = _POSTGRES_DDL
+        else:
+            return False
+        if exists:
+            return False
+        for statement in ddl:
+            conn.execute(text(statement))
+    return True
+
+
+def index_obligations(db: Session, rows: Iterable[dict[str, Any]]) -> None:
+    if _dialect(db) != "sqlite":
+        return
+    params = [{"id": row["id"], **{f: row.get(f) for f in SEARCH_FIELDS}} for row in rows]
+    if params:
+        db.execute(
+            text(
+                "INSERT INTO obligation_fts (rowid, name, description, due_rule, source_excerpt) "
+                "VALUES (:id, :name, :description, :due_rule, :source_excerpt)"
+            ),
+            params,
+        )
+
+
+def remove_obligations(db: Session, obligation_ids: list[int]) -> None:
+    if _dialect(db) == "sqlite" and obligation_ids:
+        db.execute(
+            text("DELETE FROM obligation_fts WHERE rowid IN :ids").bindparams(
+                bindparam("ids", expanding=True)
+            ),
+            {"ids": obligation_ids},
+        )
+
+
+def reindex_obligations(db: Session, rows: list[dict[str, Any]]) -> None:
+    remove_obligations(db, [row["id"] for row in rows])
+    index_obligations(db, rows)
+
+
+def index_loan_text(db: Session, chunks: list[tuple[int, str]]) -> None:
+    if not chunks:
+        return
+    dialect = _dialect(db)
+    if dialect == "sqlite":
+        db.execute(
+            text("INSERT INTO loan_text_fts (rowid, body) VALUES (:id, :body)"),
+            [{"id": chunk_id, "body": body} for chunk_id, body in chunks],
+        )
+    elif dialect == "postgresql":
+        db.execute(
+            text(
+                "INSERT INTO loan_text_search (chunk_id, document) "
+                "VALUES (:id, to_tsvector('english', :body))"
+            ),
+            [{"id": chunk_id, "body": body} for chunk_id, body in chunks],
+        )
+
+
+def remove_loan_text(db: Session, *, loan_id: int) -> None:
+    # The SQLite index is contentless, so removing rows means replaying their text.
+    # Postgres rows go with their chunks through ON DELETE CASCADE.
+    if _dialect(db) != "sqlite":
+        return
+    c = models.LoanDocumentChunk
+    rows = db.execute(select(c.id, c.codec, c.data).where(c.loan_id == loan_id)).all()
+    if rows:
+        db.execute(
+            text(
+                "INSERT INTO loan_text_fts (loan_text_fts, rowid, body) "
+                "VALUES ('delete', :id, :body)"
+            ),
+            [
+                {"id": chunk_id, "body": document_store.decompress(codec, data)}
+                for chunk_id, codec, data in rows
+            ],
+        )
+
+
+def rebuild(db: Session, *, batch_size: int = 1000) -> None:
+    o = models.Obligation
+    last_id = 0
+    while True:
+        rows = db.execute(
+            select(o.id, *(getattr(o, f) for f in SEARCH_FIELDS))
+            .where(o.id > last_id)
+            .order_by(o.id)
+            .limit(batch_size)
+        ).mappings().all()
+        if not rows:
+            break
+        index_obligations(db, rows)
+        last_id = rows[-1]["id"]
+
+    c = models.LoanDocumentChunk
+    last_id = 0
+    while True:
+        rows = db.execute(
+            select(c.id, c.codec, c.data).where(c.id > last_id).order_by(c.id).limit(50)
+        ).all()
+        if not rows:
+            break
+        index_loan_text(
+            db, [(chunk_id, document_store.decompress(*blob)) for chunk_id, *blob in rows]
+        )
+        last_id = rows[-1][0]
+    db.commit()
+
+
+def _terms(query: str) -> list[str]:
+    return re.findall(r"\w+", query.lower())
+
+
+def _highlight(body: str, terms: list[str]) -> tuple[str, int]:
+    pattern = re.compile(r"\b(" + "|".join(re.escape(t) for t in terms) + r")\w*", re.IGNORECASE)
+    match = pattern.search(body)
+    if match is None:
+        return body[:SNIPPET_CHARS].replace("\f", " "), 0
+    start = max(0, match.start() - SNIPPET_CHARS // 2)
+    end = min(len(body), match.end() + SNIPPET_CHARS // 2)
+    window = pattern.sub(lambda m: f"{HIGHLIGHT[0]}{m.group(0)}{HIGHLIGHT[1]}", body[start:end])
+    prefix = "…" if start else ""
+    suffix = "…" if end < len(body) else ""
+    return prefix + window.replace("\f", " ") + suffix, body.count("\f", 0, match.start())
+
+
+def _match_sqlite(fts_table: str, terms: list[str]) -> ColumnElement[bool]:
+    return literal_column(fts_table).op("MATCH")(" ".join(f'"{t}"' for t in terms))
+
+
+def _search_obligations(
+    db: Session,
+    dialect: str,
+    terms: list[str],
+    *,
+    loan_id: int | None,
+    obligation_type: list[schemas.ObligationType] | None,
+    status: list[schemas.ObligationStatus] | None,
+    limit: int,
+) -> list[schemas.SearchHit]:
+    o = models.Obligation
+    if dialect == "sqlite":
+        fts = literal_column("obligation_fts")
+        snippet = func.snippet(fts, -1, HIGHLIGHT[0], HIGHLIGHT[1], "…", 16, type_=String)
+        score = -func.bm25(fts, type_=Float)
+        stmt = select(o.id).join(_obligation_fts, _obligation_fts.c.rowid == o.id).where(
+            _match_sqlite("obligation_fts", terms)
+        )
+    else:
+        query = func.plainto_tsquery("english", " ".join(terms))
+        document = literal_column(_POSTGRES_DOCUMENT)
+        snippet = func.ts_headline(
+            "english",
+            func.concat_ws(" ", o.name, o.description, o.due_rule, o.source_excerpt),
+            query,
+            f"StartSel={HIGHLIGHT[0]}, StopSel={HIGHLIGHT[1]}, MaxWords=24, MinWords=8",
+            type_=String,
+        )
+        score = func.ts_rank(document, query, type_=Float)
+        stmt = select(o.id).where(document.op("@@")(query))
+
+    stmt = (
+        stmt.join(models.Loan, models.Loan.id == o.loan_id)
+        .add_columns(
+            o.loan_id, models.Loan.title, o.name, o.obligation_type, o.status, snippet, score
+        )
+        .order_by(score.desc())
+        .limit(limit)
+    )
+    if loan_id is not None:
+        stmt = stmt.where(o.loan_id == loan_id)
+    if obligation_type:
+        stmt = stmt.where(o.obligation_type.in_([t.value for t in obligation_type]))
+    if status:
+        stmt = stmt.where(o.status.in_([s.value for s in status]))
+    return [
+        schemas.SearchHit(
+            kind="obligation",
+            obligation_id=row[0],
+            loan_id=row[1],
+            loan_title=row[2],
+            name=row[3],
+            obligation_type=row[4],
+            status=row[5],
+            snippet=row[6],
+            score=row[7],
+        )
+        for row in db.execute(stmt)
+    ]
+
+
+def _search_agreements(
+    db: Session, dialect: str, terms: list[str], *, loan_id: int | None, limit: int
+) -> list[schemas.SearchHit]:
+    c = models.LoanDocumentChunk
+    if dialect == "sqlite":
+        score = -func.bm25(literal_column("loan_text_fts"), type_=Float)
+        stmt = select(c.loan_id).join(_loan_text_fts, _loan_text_fts.c.rowid == c.id).where(
+            _match_sqlite("loan_text_fts", terms)
+        )
+    else:
+        query = func.plainto_tsquery("english", " ".join(terms))
+        s = _loan_text_search
+        score = func.ts_rank(s.c.document, query, type_=Float)
+        stmt = select(c.loan_id).join(s, s.c.chunk_id == c.id).where(s.c.document.op("@@")(query))
+
+    stmt = (
+        stmt.join(models.Loan, models.Loan.id == c.loan_id)
+        .add_columns(models.Loan.title, c.first_page, c.codec, c.data, score)
+        .order_by(score.desc())
+        .limit(limit)
+    )
+    if loan_id is not None:
+        stmt = stmt.where(c.loan_id == loan_id)
+
+    hits = []
+    for row_loan_id, title, first_page, codec, data, row_score in db.execute(stmt):
+        snippet, page_offset = _highlight(document_store.decompress(codec, data), terms)
+        hits.append(
+            schemas.SearchHit(
+                kind="agreement",
+                loan_id=row_loan_id,
+                loan_title=title,
+                page=first_page + page_offset,
+                snippet=snippet,
+                score=row_score,
+            )
+        )
+    return hits
+
+
+def search(
+    db: Session,
+    *,
+    query: str,
+    loan_id: int | None = None,
+    obligation_type: list[schemas.ObligationType] | None = None,
+    status: list[schemas.ObligationStatus] | None = None,
+    scope: schemas.SearchScope = "all",
+    limit: int = 20,
+) -> list[schemas.SearchHit]:
+    dialect = _dialect(db)
+    if dialect not in ("sqlite", "postgresql"):
+        raise SearchUnavailable(f"Search is not supported on {dialect}")
+    terms = _terms(query)
+    if not terms:
+        raise ValueError("Search query has no searchable terms")
+
+    sources: list[list[schemas.SearchHit]] = []
+    if scope in ("all", "obligations"):
+        sources.append(
+            _search_obligations(
+                db,
+                dialect,
+                terms,
+                loan_id=loan_id,
+                obligation_type=obligation_type,
+                status=status,
+                limit=limit,
+            )
+        )
+    # Agreement text has no type or status, so those filters narrow results to obligations.
+    if scope in ("all", "agreements") and not obligation_type and not status:
+        sources.append(_search_agreements(db, dialect, terms, loan_id=loan_id, limit=limit))
+
+    # Each index ranks on its own scale, so scores are made relative to the best hit of each source.
+    hits: list[schemas.SearchHit] = []
+    for source in sources:
+        top = max((hit.score for hit in source), default=0.0)
+        for hit in source:
+            hit.score = hit.score / top if top > 0 else 0.0
+        hits += source
+    hits.sort(key=lambda hit: hit.score, reverse=True)
+    return hits[:limit]
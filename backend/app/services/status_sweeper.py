@@ -0,0 +1,60 @@
+from __future__ import annotations
+
+import logging
+import os
+import threading
+from datetime import datetime
+
+from app import crud
+from app.db import SessionLocal
+
+logger = logging.getLogger(__name__)
+
+
+class StatusSweeper:
+    def __init__(self, *, interval_seconds: float, batch_size: int = 500) -> None:
+        self.interval_seconds = interval_seconds
+        self.batch_size = batch_size
+        self.last_run_at: datetime | None = None
+        self._stop = threading.Event()
+        self._thread: threading.Thread | None = None
+
+    def run_once(self, now: datetime | None = None) -> int:
+        n = now or crud.now_utc()
+        db = SessionLocal()
+        try:
+            swept = crud.sweep_statuses(db, since=self.last_run_at, now=n, batch_size=self.batch_size)
+        finally:
+            db.close()
+        self.last_run_at = n
+        return swept
+
+    def _run(self) -> None:
+        while not self._stop.is_set():
+            try:
+                swept = self.run_once()
+                if swept:
+                    logger.info("Status sweeper updated %d obligations", swept)
+            except Exception:
+                logger.exception("Status sweep failed")
+            self._stop.wait(self.interval_seconds)
+
+    def start(self) -> None:
+        if self._thread and self._thread.is_alive():
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name="status-sweeper", daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        self._stop.set()
+        if self._thread:
+            self._thread.join(timeout=self.interval_seconds)
+            self._thread = None
+
+
+def get_status_sweeper() -> StatusSweeper:
+    return StatusSweeper(
+        interval_seconds=float(os.getenv("STATUS_SWEEP_INTERVAL_SECONDS", "60")),
+        batch_size=int(os.getenv("STATUS_SWEEP_BATCH_SIZE", "500")),
+    )
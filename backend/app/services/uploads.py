@@ -0,0 +1,105 @@
+from __future__ import annotations
+
+import asyncio
+import os
+import weakref
+from collections.abc import AsyncIterator
+from datetime import timedelta
+from pathlib import Path
+
+import anyio
+
+from app.services.blob_store import storage_root
+
+
+def chunk_size() -> int:
+    return int(os.getenv("EVIDENCE_UPLOAD_CHUNK_BYTES", str(8 * 1024 * 1024)))
+
+
+def max_upload_bytes() -> int:
+    return int(os.getenv("EVIDENCE_UPLOAD_MAX_BYTES", str(2 * 1024 * 1024 * 1024)))
+
+
+def max_pending_bytes() -> int:
+    return int(os.getenv("EVIDENCE_UPLOAD_MAX_PENDING_BYTES", str(20 * 1024 * 1024 * 1024)))
+
+
+def session_ttl() -> timedelta:
+    return timedelta(hours=float(os.getenv("EVIDENCE_UPLOAD_TTL_HOURS", "24")))
+
+
+def claim_timeout() -> timedelta:
+    return timedelta(seconds=float(os.getenv("EVIDENCE_UPLOAD_CLAIM_SECONDS", "900")))
+
+
+_slots = asyncio.Semaphore(int(os.getenv("EVIDENCE_UPLOAD_CONCURRENCY", "8")))
+_locks: weakref.WeakValueDictionary[str, asyncio.Lock] = weakref.WeakValueDictionary()
+
+
+class UploadBusy(Exception):
+    pass
+
+
+class OffsetMismatch(Exception):
+    def __init__(self, expected: int) -> None:
+        super().__init__(f"Expected offset {expected}")
+        self.expected = expected
+
+
+class ChunkTooLarge(Exception):
+    pass
+
+
+def part_path(upload_id: str) -> Path:
+    return storage_root() / "uploads" / f"{upload_id}.part"
+
+
+def create_part(upload_id: str) -> None:
+    path = part_path(upload_id)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.touch()
+
+
+def received_bytes(upload_id: str) -> int:
+    try:
+        return part_path(upload_id).stat().st_size
+    except FileNotFoundError:
+        return 0
+
+
+def discard_part(upload_id: str) -> None:
+    part_path(upload_id).unlink(missing_ok=True)
+
+
+async def write_chunk(
+    upload_id: str, *, offset: int, total: int, body: AsyncIterator[bytes]
+) -> int:
+    if _slots.locked():
+        raise UploadBusy()
+
+    lock = _locks.get(upload_id)
+    if lock is None:
+        lock = _locks[upload_id] = asyncio.Lock()
+
+    async with _slots, lock:
+        path = part_path(upload_id)
+        current = (await anyio.Path(path).stat()).st_size
+        if offset != current:
+            raise OffsetMismatch(current)
+
+        limit = min(chunk_size(), total - offset)
+        written = 0
+        async with await anyio.open_file(path, "r+b") as f:
+            await f.seek(offset)
+            try:
+                async for data in body:
+                    written += len(data)
+                    if written > limit:
+                        raise ChunkTooLarge(f"Chunk exceeds {limit} bytes")
+                    await f.write(data)
+            except ChunkTooLarge:
+                await f.truncate(offset)
+                raise
+            finally:
+                await f.flush()
+        return offset + written
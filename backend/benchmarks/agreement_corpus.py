@@ -0,0 +1,82 @@
+from __future__ import annotations
+
+import random
+
+_BOILERPLATE = [
+    "Each Party shall bear its own costs and expenses incurred in connection with the negotiation, "
+    "preparation and execution of this Agreement and the other Finance Documents.",
+    "Any reference in this Agreement to a provision of law is a reference to that provision as "
+    "amended or re-enacted from time to time.",
+    "The Agent may rely on any representation, notice or document believed by it to be genuine, "
+    "correct and appropriately authorised.",
+    "Unless a contrary indication appears, a term used in any other Finance Document or in any "
+    "notice given under or in connection with any Finance Document has the same meaning in that "
+    "Finance Document or notice as in this Agreement.",
+    "No failure to exercise, nor any delay in exercising, on the part of any Finance Party, any "
+    "right or remedy under a Finance Document shall operate as a waiver of any such right or remedy.",
+    "If a payment under this Agreement is due on a day which is not a Business Day, the due date "
+    "for that payment shall instead be the next Business Day in the same calendar month.",
+]
+
+_OBLIGATION_CLAUSES = {
+    "annual_financials": "The Borrower shall supply to the Agent its audited consolidated financial "
+    "statements as soon as they are available, but in any event within {days} days after the end "
+    "of each of its financial years.",
+    "quarterly_financials": "The Borrower shall supply to the Agent its consolidated financial "
+    "statements for each financial quarter within {days} days after the end of each quarter.",
+    "compliance_certificate": "The Borrower shall supply to the Agent, with each set of its "
+    "financial statements, a Compliance Certificate setting out computations as to compliance "
+    "with the financial covenants.",
+    "borrowing_base_certificate": "The Borrower shall deliver a Borrowing Base Certificate, "
+    "together with supporting schedules, within {days} days after the end of each calendar month.",
+    "annual_budget": "The Borrower shall supply to the Agent its annual budget for the following "
+    "financial year no later than thirty days before the start of that financial year.",
+    "notice_of_default": "The Borrower shall notify the Agent of any Default (and the steps, if "
+    "any, being taken to remedy it) promptly upon becoming aware of its occurrence.",
+    "notice_period": "The Borrower may prepay the whole or any part of the Loan if it gives the "
+    "Agent not less than {days} Business Days' prior notice.",
+    "litigation_notice": "The Borrower shall promptly inform the Agent of any litigation, "
+    "arbitration or administrative proceedings which, if adversely determined, are reasonably "
+    "likely to have a Material Adverse Effect.",
+    "negative_pledge": "No Obligor shall create or permit to subsist any Security over any of "
+    "its assets, other than Permitted Security.",
+    "covenant:leverage": "The Borrower shall ensure that the Leverage ratio in respect of any "
+    "Relevant Period shall not exceed {ratio}:1.",
+    "covenant:interest cover": "The Borrower shall ensure that the Interest Cover ratio in "
+    "respect of any Relevant Period shall not be less than {ratio}:1.",
+}
+
+EXPECTED_KEYS = frozenset(_OBLIGATION_CLAUSES)
+
+
+def generate_agreement(*, pages: int, seed: int = 0, page_chars: int = 3000) -> str:
+    rng = random.Random(seed)
+    placements = {key: rng.randrange(pages) for key in _OBLIGATION_CLAUSES}
+
+    out: list[str] = []
+    for page_no in range(pages):
+        paragraphs: list[str] = []
+        clause_no = 1
+        for key, page in placements.items():
+            if page == page_no:
+                paragraphs.append(
+                    f"{page_no + 1}.{clause_no} "
+                    + _OBLIGATION_CLAUSES[key].format(
+                        days=rng.choice([3, 5, 30, 45, 60, 90, 120]),
+                        ratio=rng.choice(["2.50", "3.00", "3.75", "4.00"]),
+                    )
+                )
+                clause_no += 1
+        size = sum(len(p) for p in paragraphs)
+        while size < page_chars:
+            paragraph = f"{page_no + 1}.{clause_no} " + rng.choice(_BOILERPLATE)
+            paragraphs.append(paragraph)
+            size += len(paragraph)
+            clause_no += 1
+        rng.shuffle(paragraphs)
+        out.append("\n\n".join(paragraphs))
+    return "\f".join(out)
+
+
+def generate_corpus(*, documents: int, pages: int, seed: int = 0) -> list[str]:
+    return [generate_agreement(pages=pages, seed=seed + i) for i in range(documents)]
@@ -0,0 +1,528 @@
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+import math
+import os
+import random
+import sys
+import tempfile
+import time
+from collections.abc import Awaitable, Callable
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any
+
+_queries: ContextVar[list[int] | None] = ContextVar("benchmark_queries", default=None)
+
+
+def _count_query(*_args: Any) -> None:
+    counter = _queries.get()
+    if counter is not None:
+        counter[0] += 1
+
+
+@dataclass
+class RouteSamples:
+    latencies: list[float] = field(default_factory=list)
+    queries: list[int] = field(default_factory=list)
+    errors: int = 0
+    wall_seconds: float = 0.0
+
+
+@dataclass
+class Workload:
+    loan_ids: list[int]
+    obligation_ids: list[int]
+    evidence_ids: list[int]
+    scratch_loan_id: int
+    disposable_ids: list[int]
+    rng: random.Random
+
+
+class Runner:
+    def __init__(self, client: Any, workload: Workload) -> None:
+        self.client = client
+        self.workload = workload
+        self.samples: dict[str, RouteSamples] = {}
+
+    async def call(self, method: str, template: str, **kwargs: Any) -> Any:
+        path_params = kwargs.pop("path", {})
+        counter = [0]
+        token = _queries.set(counter)
+        started = time.perf_counter()
+        try:
+            response = await self.client.request(method, template.format(**path_params), **kwargs)
+        finally:
+            _queries.reset(token)
+        elapsed = time.perf_counter() - started
+
+        samples = self.samples.setdefault(f"{method} {template}", RouteSamples())
+        samples.latencies.append(elapsed)
+        samples.queries.append(counter[0])
+        if response.status_code >= 400:
+            samples.errors += 1
+        return response
+
+    def loan(self) -> dict[str, int]:
+        return {"loan_id": self.workload.rng.choice(self.workload.loan_ids)}
+
+    def obligation(self) -> dict[str, int]:
+        return {"obligation_id": self.workload.rng.choice(self.workload.obligation_ids)}
+
+    def obligation_ids(self, n: int) -> list[int]:
+        return self.workload.rng.sample(self.workload.obligation_ids, n)
+
+
+Scenario = Callable[[Runner], Awaitable[None]]
+
+
+async def _health(r: Runner) -> None:
+    await r.call("GET", "/api/health")
+
+
+async def _health_db(r: Runner) -> None:
+    await r.call("GET", "/api/health/db")
+
+
+async def _list_loans(r: Runner) -> None:
+    await r.call("GET", "/api/loans", params={"limit": 50})
+
+
+async def _create_loan(r: Runner) -> None:
+    await r.call("POST", "/api/loans", json={"title": "Benchmark Facility"})
+
+
+async def _get_loan(r: Runner) -> None:
+    await r.call("GET", "/api/loans/{loan_id}", path=r.loan())
+
+
+async def _portfolio_summary(r: Runner) -> None:
+    await r.call("GET", "/api/portfolio/summary")
+
+
+async def _import_text(r: Runner) -> None:
+    await r.call(
+        "POST",
+        "/api/loans/{loan_id}/import-text",
+        path={"loan_id": r.workload.scratch_loan_id},
+        json={"text": f"Benchmark agreement {r.workload.rng.random()}"},
+    )
+
+
+async def _extract(r: Runner) -> None:
+    await r.call(
+        "POST",
+        "/api/loans/{loan_id}/extract",
+        path={"loan_id": r.workload.scratch_loan_id},
+        json={"text": "The Borrower shall supply its annual financial statements."},
+    )
+
+
+async def _list_obligations(r: Runner) -> None:
+    sort = r.workload.rng.choice(["created", "due", "status", "confidence"])
+    await r.call(
+        "GET", "/api/loans/{loan_id}/obligations", path=r.loan(), params={"sort": sort, "limit": 50}
+    )
+
+
+async def _create_obligation(r: Runner) -> None:
+    await r.call(
+        "POST",
+        "/api/loans/{loan_id}/obligations",
+        path={"loan_id": r.workload.scratch_loan_id},
+        json={"name": "Benchmark obligation", "obligation_type": "REPORTING", "frequency": "QUARTERLY"},
+    )
+
+
+async def _upcoming(r: Runner) -> None:
+    await r.call("GET", "/api/obligations/upcoming", params={"days": 14, "limit": 100})
+
+
+async def _occurrences(r: Runner) -> None:
+    await r.call("GET", "/api/obligations/occurrences", params={"days": 90, **r.loan()})
+
+
+async def _batch_complete(r: Runner) -> None:
+    await r.call("POST", "/api/obligations/batch/complete", json={"ids": r.obligation_ids(10)})
+
+
+async def _batch_reopen(r: Runner) -> None:
+    await r.call("POST", "/api/obligations/batch/reopen", json={"ids": r.obligation_ids(10)})
+
+
+async def _batch_update(r: Runner) -> None:
+    items = [{"id": i, "confidence": r.workload.rng.random()} for i in r.obligation_ids(10)]
+    await r.call("POST", "/api/obligations/batch/update", json={"items": items})
+
+
+async def _batch_delete(r: Runner) -> None:
+    ids = [r.workload.disposable_ids.pop() for _ in range(10)]
+    await r.call("POST", "/api/obligations/batch/delete", json={"ids": ids})
+
+
+async def _update_obligation(r: Runner) -> None:
+    await r.call(
+        "PUT",
+        "/api/obligations/{obligation_id}",
+        path=r.obligation(),
+        json={"party_responsible": r.workload.rng.choice(["Borrower", "Agent"])},
+    )
+
+
+async def _delete_obligation(r: Runner) -> None:
+    obligation_id = r.workload.disposable_ids.pop()
+    await r.call("DELETE", "/api/obligations/{obligation_id}", path={"obligation_id": obligation_id})
+
+
+async def _complete_obligation(r: Runner) -> None:
+    await r.call("POST", "/api/obligations/{obligation_id}/complete", path=r.obligation())
+
+
+async def _reopen_obligation(r: Runner) -> None:
+    await r.call("POST", "/api/obligations/{obligation_id}/reopen", path=r.obligation())
+
+
+async def _upload_evidence(r: Runner) -> None:
+    await r.call(
+        "POST",
+        "/api/obligations/{obligation_id}/evidence",
+        path=r.obligation(),
+        files={"file": ("certificate.pdf", r.workload.rng.randbytes(16 * 1024))},
+    )
+
+
+async def _list_evidence(r: Runner) -> None:
+    await r.call("GET", "/api/obligations/{obligation_id}/evidence", path=r.obligation())
+
+
+async def _download_evidence(r: Runner) -> None:
+    evidence_id = r.workload.rng.choice(r.workload.evidence_ids)
+    await r.call("GET", "/api/evidence/{evidence_id}/download", path={"evidence_id": evidence_id})
+
+
+async def _evidence_zip(r: Runner) -> None:
+    await r.call("GET", "/api/loans/{loan_id}/evidence.zip", path=r.loan())
+
+
+async def _resumable_upload(r: Runner) -> None:
+    body = r.workload.rng.randbytes(64 * 1024)
+    created = await r.call(
+        "POST",
+        "/api/obligations/{obligation_id}/uploads",
+        path=r.obligation(),
+        json={"filename": "statements.pdf", "size_bytes": len(body)},
+    )
+    if created.status_code >= 400:
+        return
+    upload = {"upload_id": created.json()["id"]}
+    await r.call(
+        "PUT", "/api/uploads/{upload_id}/chunks", path=upload, params={"offset": 0}, content=body
+    )
+    await r.call("GET", "/api/uploads/{upload_id}", path=upload)
+    await r.call("POST", "/api/uploads/{upload_id}/complete", path=upload)
+
+
+async def _aborted_upload(r: Runner) -> None:
+    created = await r.call(
+        "POST",
+        "/api/obligations/{obligation_id}/uploads",
+        path=r.obligation(),
+        json={"filename": "draft.pdf", "size_bytes": 1024},
+    )
+    if created.status_code < 400:
+        await r.call("DELETE", "/api/uploads/{upload_id}", path={"upload_id": created.json()["id"]})
+
+
+async def _loan_ics(r: Runner) -> None:
+    await r.call("GET", "/api/loans/{loan_id}/export.ics", path=r.loan())
+
+
+async def _portfolio_ics(r: Runner) -> None:
+    await r.call("GET", "/api/portfolio/export.ics")
+
+
+async def _compliance_packet(r: Runner) -> None:
+    await r.call("GET", "/api/loans/{loan_id}/compliance-packet", path=r.loan())
+
+
+async def _audit(r: Runner) -> None:
+    await r.call("GET", "/api/audit", params={"limit": 200, **r.loan()})
+
+
+async def _extraction_job(r: Runner) -> None:
+    submitted = await r.call(
+        "POST",
+        "/api/loans/{loan_id}/extraction-jobs",
+        path={"loan_id": r.workload.scratch_loan_id},
+        json={"text": f"The Borrower shall deliver a Compliance Certificate. {r.workload.rng.random()}"},
+    )
+    if submitted.status_code >= 400:
+        return
+    job = {"job_id": submitted.json()["id"]}
+    for _ in range(100):
+        polled = await r.call("GET", "/api/extraction-jobs/{job_id}", path=job)
+        if polled.status_code >= 400 or polled.json()["status"] in ("SUCCEEDED", "FAILED"):
+            break
+        await asyncio.sleep(0.01)
+    await r.call("GET", "/api/extraction-jobs/{job_id}/obligations", path=job)
+
+
+async def _search(r: Runner) -> None:
+    query = r.workload.rng.choice(["compliance certificate", "borrowing base", "financials"])
+    await r.call("GET", "/api/search", params={"q": query, "limit": 20})
+
+
+# (scenario, share of --requests it runs)
+SCENARIOS: list[tuple[Scenario, float]] = [
+    (_health, 1.0),
+    (_health_db, 0.2),
+    (_list_loans, 1.0),
+    (_create_loan, 0.2),
+    (_get_loan, 1.0),
+    (_portfolio_summary, 0.5),
+    (_import_text, 0.2),
+    (_extract, 0.2),
+    (_list_obligations, 1.0),
+    (_create_obligation, 0.5),
+    (_occurrences, 0.5),
+    (_upcoming, 0.5),
+    (_batch_complete, 0.2),
+    (_batch_reopen, 0.2),
+    (_batch_update, 0.2),
+    (_batch_delete, 0.2),
+    (_update_obligation, 0.5),
+    (_delete_obligation, 0.5),
+    (_complete_obligation, 0.5),
+    (_reopen_obligation, 0.5),
+    (_upload_evidence, 0.5),
+    (_list_evidence, 1.0),
+    (_download_evidence, 1.0),
+    (_evidence_zip, 0.1),
+    (_resumable_upload, 0.2),
+    (_aborted_upload, 0.2),
+    (_loan_ics, 0.5),
+    (_portfolio_ics, 0.05),
+    (_compliance_packet, 0.2),
+    (_audit, 1.0),
+    (_extraction_job, 0.1),
+    (_search, 1.0),
+]
+
+
+def _iterations(requests: int, share: float) -> int:
+    return max(1, int(requests * share))
+
+
+def _disposable_needed(requests: int) -> int:
+    return _iterations(requests, 0.5) + 10 * _iterations(requests, 0.2)
+
+
+async def _run_scenario(runner: Runner, scenario: Scenario, *, iterations: int, concurrency: int) -> None:
+    remaining = iter(range(iterations))
+    before = set(runner.samples)
+
+    async def worker() -> None:
+        for _ in remaining:
+            await scenario(runner)
+
+    started = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(min(concurrency, iterations))))
+    elapsed = time.perf_counter() - started
+    for key, samples in runner.samples.items():
+        if key not in before:
+            samples.wall_seconds += elapsed
+
+
+def _percentile(values: list[float], pct: float) -> float:
+    ordered = sorted(values)
+    return ordered[max(0, math.ceil(pct / 100 * len(ordered)) - 1)]
+
+
+def summarize(samples: dict[str, RouteSamples]) -> dict[str, dict[str, float]]:
+    return {
+        key: {
+            "requests": len(s.latencies),
+            "errors": s.errors,
+            "p50_ms": _percentile(s.latencies, 50) * 1000,
+            "p95_ms": _percentile(s.latencies, 95) * 1000,
+            "p99_ms": _percentile(s.latencies, 99) * 1000,
+            "rps": len(s.latencies) / s.wall_seconds if s.wall_seconds else 0.0,
+            "queries": sum(s.queries) / len(s.queries),
+        }
+        for key, s in sorted(samples.items())
+    }
+
+
+def compare(
+    current: dict[str, dict[str, float]],
+    baseline: dict[str, dict[str, float]],
+    *,
+    latency_tolerance: float,
+    latency_floor_ms: float,
+    throughput_tolerance: float,
+    query_tolerance: float,
+) -> list[str]:
+    failures = []
+    for key, base in baseline.items():
+        now = current.get(key)
+        if now is None:
+            failures.append(f"{key}: missing from this run")
+            continue
+        p95_limit = max(base["p95_ms"] * (1 + latency_tolerance), base["p95_ms"] + latency_floor_ms)
+        if now["p95_ms"] > p95_limit:
+            failures.append(f"{key}: p95 {now['p95_ms']:.1f}ms > {p95_limit:.1f}ms")
+        if now["rps"] < base["rps"] * (1 - throughput_tolerance):
+            floor = base["rps"] * (1 - throughput_tolerance)
+            failures.append(f"{key}: throughput {now['rps']:.1f}/s < {floor:.1f}/s")
+        if now["queries"] > base["queries"] + query_tolerance:
+            failures.append(f"{key}: {now['queries']:.1f} queries/request > {base['queries']:.1f}")
+        if now["errors"] > base["errors"]:
+            failures.append(f"{key}: {now['errors']} errors (baseline {base['errors']})")
+    return failures
+
+
+def _print_report(results: dict[str, dict[str, float]]) -> None:
+    print(f"{'route':<52} {'n':>6} {'err':>4} {'p50 ms':>8} {'p95 ms':>8} {'p99 ms':>8} {'req/s':>8} {'q/req':>6}")
+    for key, r in results.items():
+        print(
+            f"{key:<52} {r['requests']:>6} {r['errors']:>4} {r['p50_ms']:>8.1f} {r['p95_ms']:>8.1f} "
+            f"{r['p99_ms']:>8.1f} {r['rps']:>8.1f} {r['queries']:>6.1f}"
+        )
+
+
+async def _run(args: argparse.Namespace) -> dict[str, dict[str, float]]:
+    import httpx
+    from sqlalchemy import Engine, event, func, select
+
+    from app import models
+    from app.db import SessionLocal
+    from app.main import create_app
+    from benchmarks.synthetic_portfolio import generate_portfolio
+
+    app = create_app()
+    async with app.router.lifespan_context(app):
+        with SessionLocal() as db:
+            if args.reuse and db.scalar(select(func.count()).select_from(models.Loan)):
+                loan_ids = list(db.scalars(select(models.Loan.id)))
+                obligation_ids = list(db.scalars(select(models.Obligation.id)))
+                evidence_ids = list(db.scalars(select(models.Evidence.id)))
+            else:
+                seeded = generate_portfolio(
+                    db,
+                    loans=args.loans,
+                    obligations_per_loan=args.obligations,
+                    evidence_per_obligation=args.evidence,
+                    audit_events_per_obligation=args.audit,
+                    agreement_pages=args.agreement_pages,
+                    seed=args.seed,
+                )
+                loan_ids, obligation_ids, evidence_ids = (
+                    seeded.loan_ids,
+                    seeded.obligation_ids,
+                    seeded.evidence_ids,
+                )
+            scratch = generate_portfolio(
+                db,
+                loans=1,
+                obligations_per_loan=_disposable_needed(args.requests),
+                evidence_per_obligation=1,
+                audit_events_per_obligation=1,
+                seed=args.seed + 1,
+            )
+
+        workload = Workload(
+            loan_ids=loan_ids,
+            obligation_ids=obligation_ids,
+            evidence_ids=evidence_ids,
+            scratch_loan_id=scratch.loan_ids[0],
+            disposable_ids=scratch.obligation_ids,
+            rng=random.Random(args.seed),
+        )
+        event.listen(Engine, "after_cursor_execute", _count_query)
+        transport = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://benchmark") as client:
+            runner = Runner(client, workload)
+            started = time.perf_counter()
+            for scenario, share in SCENARIOS:
+                await _run_scenario(
+                    runner,
+                    scenario,
+                    iterations=_iterations(args.requests, share),
+                    concurrency=args.concurrency,
+                )
+            elapsed = time.perf_counter() - started
+        event.remove(Engine, "after_cursor_execute", _count_query)
+
+    total = sum(len(s.latencies) for s in runner.samples.values())
+    print(f"portfolio:  {len(loan_ids)} loans, {len(obligation_ids)} obligations, {len(evidence_ids)} evidence")
+    print(f"requests:   {total} in {elapsed:.2f}s ({total / elapsed:,.0f} req/s, concurrency {args.concurrency})")
+    covered = set(runner.samples)
+    declared = {
+        f"{method.upper()} {path}"
+        for path, operations in app.openapi()["paths"].items()
+        for method in operations
+    }
+    for key in sorted(declared - covered):
+        print(f"not covered: {key}")
+    return summarize(runner.samples)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Drive every API route in-process and report latency.")
+    parser.add_argument("--loans", type=int, default=200)
+    parser.add_argument("--obligations", type=int, default=50, help="obligations per loan")
+    parser.add_argument("--evidence", type=int, default=1, help="evidence files per obligation")
+    parser.add_argument("--audit", type=int, default=3, help="audit events per obligation")
+    parser.add_argument("--agreement-pages", type=int, default=2)
+    parser.add_argument("--requests", type=int, default=200, help="iterations of the core scenarios")
+    parser.add_argument("--concurrency", type=int, default=8)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--database-url", help="benchmark an existing database instead of a temporary one")
+    parser.add_argument("--reuse", action="store_true", help="skip seeding when the database has loans")
+    parser.add_argument("--baseline", type=Path, help="compare against a stored run")
+    parser.add_argument("--save-baseline", type=Path, help="store this run as a baseline")
+    parser.add_argument("--output", type=Path, help="write this run's results as JSON")
+    parser.add_argument("--latency-tolerance", type=float, default=0.25)
+    parser.add_argument("--latency-floor-ms", type=float, default=5.0)
+    parser.add_argument("--throughput-tolerance", type=float, default=0.25)
+    parser.add_argument("--query-tolerance", type=float, default=0.5)
+    args = parser.parse_args()
+
+    workdir = tempfile.mkdtemp(prefix="covenantops-bench-")
+    os.environ["DATABASE_URL"] = args.database_url or f"sqlite:///{workdir}/bench.db"
+    os.environ.setdefault("STORAGE_DIR", f"{workdir}/storage")
+
+    results = asyncio.run(_run(args))
+    _print_report(results)
+    run = {
+        "workload": {
+            key: getattr(args, key)
+            for key in ("loans", "obligations", "evidence", "audit", "requests", "concurrency", "seed")
+        },
+        "routes": results,
+    }
+    for path in (args.output, args.save_baseline):
+        if path:
+            path.write_text(json.dumps(run, indent=2))
+
+    if args.baseline:
+        failures = compare(
+            results,
+            json.loads(args.baseline.read_text())["routes"],
+            latency_tolerance=args.latency_tolerance,
+            latency_floor_ms=args.latency_floor_ms,
+            throughput_tolerance=args.throughput_tolerance,
+            query_tolerance=args.query_tolerance,
+        )
+        for failure in failures:
+            print(f"REGRESSION {failure}")
+        if failures:
+            sys.exit(1)
+        print(f"no regressions against {args.baseline}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,42 @@
+from __future__ import annotations
+
+import argparse
+import time
+
+from app.services.rule_extractor import RuleBasedExtractor
+from benchmarks.agreement_corpus import EXPECTED_KEYS, generate_corpus
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Measure rule-based extractor throughput.")
+    parser.add_argument("--documents", type=int, default=4)
+    parser.add_argument("--pages", type=int, default=300)
+    parser.add_argument("--workers", type=int, default=1)
+    parser.add_argument("--chunk-pages", type=int, default=40)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    corpus = generate_corpus(documents=args.documents, pages=args.pages, seed=args.seed)
+    extractor = RuleBasedExtractor(workers=args.workers, chunk_pages=args.chunk_pages)
+
+    try:
+        extractor.extract_obligations(corpus[0])
+
+        found = 0
+        started = time.perf_counter()
+        for text in corpus:
+            found += len(extractor.extract_obligations(text))
+        elapsed = time.perf_counter() - started
+    finally:
+        extractor.close()
+
+    total_pages = args.documents * args.pages
+    expected = args.documents * len(EXPECTED_KEYS)
+    print(f"documents:   {args.documents} x {args.pages} pages ({args.workers} workers)")
+    print(f"obligations: {found} found / {expected} planted")
+    print(f"elapsed:     {elapsed:.3f}s")
+    print(f"throughput:  {total_pages / elapsed:,.0f} pages/sec")
+
+
+if __name__ == "__main__":
+    main()
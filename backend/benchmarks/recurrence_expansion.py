@@ -0,0 +1,66 @@
+from __future__ import annotations
+
+import argparse
+import random
+import time
+from datetime import datetime, timedelta
+
+from app.services import recurrence
+
+MONTH_FREQUENCIES = ("MONTHLY", "QUARTERLY", "SEMI_ANNUAL", "ANNUAL")
+
+
+def synthetic_rows(
+    count: int, *, frequencies: list[str], start: datetime, seed: int = 0
+) -> list[tuple[int, int, str, str, str, datetime, int]]:
+    rng = random.Random(seed)
+    rows = []
+    for obligation_id in range(1, count + 1):
+        anchor = start + timedelta(days=rng.randrange(365), hours=rng.choice((9, 12, 17)))
+        rows.append(
+            (
+                obligation_id,
+                obligation_id // 50 + 1,
+                "Quarterly financial statements",
+                "REPORTING",
+                rng.choice(frequencies),
+                anchor,
+                anchor.day,
+            )
+        )
+    return rows
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(
+        description="Measure occurrence expansion for a calendar window."
+    )
+    parser.add_argument("--obligations", type=int, default=50_000)
+    parser.add_argument("--months", type=int, default=12)
+    parser.add_argument("--frequencies", nargs="+", default=list(MONTH_FREQUENCIES))
+    parser.add_argument(
+        "--budget", type=float, default=1.0, help="seconds; exit non-zero when exceeded"
+    )
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    start = datetime(2031, 1, 1)
+    end = start + timedelta(days=round(args.months * 365 / 12))
+    rows = synthetic_rows(
+        args.obligations, frequencies=args.frequencies, start=start, seed=args.seed
+    )
+
+    started = time.perf_counter()
+    occurrences = recurrence.expand_occurrences(rows, start=start, end=end)
+    elapsed = time.perf_counter() - started
+
+    print(f"obligations: {args.obligations} ({', '.join(args.frequencies)})")
+    print(f"window:      {start.date()} .. {end.date()}")
+    print(f"occurrences: {len(occurrences)}")
+    print(f"elapsed:     {elapsed:.3f}s (budget {args.budget:.3f}s)")
+    if elapsed > args.budget:
+        raise SystemExit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,191 @@
+from __future__ import annotations
+
+import argparse
+import json
+import logging
+import os
+import random
+import socketserver
+import tempfile
+import threading
+import time
+from collections import Counter
+from datetime import timedelta
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any
+
+
+class WebhookStandIn(ThreadingHTTPServer):
+    def __init__(self, *, failure_rate: float, seed: int) -> None:
+        super().__init__(("127.0.0.1", 0), _WebhookHandler)
+        self.failure_rate = failure_rate
+        self.rng = random.Random(seed)
+        self.lock = threading.Lock()
+        self.posts = 0
+        self.failures = 0
+        self.received: Counter[str] = Counter()
+
+    @property
+    def url(self) -> str:
+        return f"http://127.0.0.1:{self.server_address[1]}/reminders"
+
+
+class _WebhookHandler(BaseHTTPRequestHandler):
+    server: WebhookStandIn
+
+    def do_POST(self) -> None:
+        body = json.loads(self.rfile.read(int(self.headers["Content-Length"])))
+        with self.server.lock:
+            if self.server.rng.random() < self.server.failure_rate:
+                self.server.failures += 1
+                status = 503
+            else:
+                self.server.posts += 1
+                self.server.received.update(r["idempotency_key"] for r in body["reminders"])
+                status = 204
+        self.send_response(status)
+        self.send_header("Content-Length", "0")
+        self.end_headers()
+
+    def log_message(self, *_args: Any) -> None:
+        pass
+
+
+class SmtpStandIn(socketserver.ThreadingTCPServer):
+    daemon_threads = True
+
+    def __init__(self) -> None:
+        super().__init__(("127.0.0.1", 0), _SmtpHandler)
+        self.lock = threading.Lock()
+        self.messages = 0
+
+    @property
+    def port(self) -> int:
+        return self.server_address[1]
+
+
+class _SmtpHandler(socketserver.StreamRequestHandler):
+    server: SmtpStandIn
+
+    def _reply(self, line: str) -> None:
+        self.wfile.write(f"{line}\r\n".encode())
+
+    def handle(self) -> None:
+        self._reply("220 stand-in ESMTP")
+        while line := self.rfile.readline():
+            command = line.decode(errors="replace").strip().upper()
+            if command.startswith("DATA"):
+                self._reply("354 end data with <CR><LF>.<CR><LF>")
+                while self.rfile.readline().rstrip(b"\r\n") != b".":
+                    pass
+                with self.server.lock:
+                    self.server.messages += 1
+                self._reply("250 queued")
+            elif command.startswith("QUIT"):
+                self._reply("221 bye")
+                return
+            else:
+                self._reply("250 ok")
+
+
+def _serve(server: socketserver.BaseServer) -> None:
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(
+        description="Schedule and dispatch a quarter of reminders against local webhook and SMTP stand-ins."
+    )
+    parser.add_argument("--loans", type=int, default=500)
+    parser.add_argument("--obligations", type=int, default=100, help="obligations per loan")
+    parser.add_argument("--days", type=int, default=90, help="simulated period")
+    parser.add_argument(
+        "--step-hours", type=float, default=6.0, help="simulated time between scheduler wakes"
+    )
+    parser.add_argument("--batch-size", type=int, default=500)
+    parser.add_argument("--webhook-failure-rate", type=float, default=0.0)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+    # Injected webhook failures would otherwise log a warning per batch.
+    logging.disable(logging.WARNING)
+
+    workdir = tempfile.mkdtemp(prefix="covenantops-reminders-")
+    os.environ["DATABASE_URL"] = f"sqlite:///{workdir}/bench.db"
+    os.environ.setdefault("STORAGE_DIR", f"{workdir}/storage")
+
+    from sqlalchemy import func, select
+
+    from app import crud, models
+    from app.db import SessionLocal, init_db
+    from app.services.reminder_scheduler import ReminderScheduler
+    from app.services.reminder_sinks import SmtpSink, WebhookSink
+    from benchmarks.synthetic_portfolio import generate_portfolio
+
+    webhook = WebhookStandIn(failure_rate=args.webhook_failure_rate, seed=args.seed)
+    smtp = SmtpStandIn()
+    _serve(webhook)
+    _serve(smtp)
+    # Reminders are only scheduled while a sink is configured.
+    os.environ["REMINDER_WEBHOOK_URL"] = webhook.url
+    sinks = [
+        WebhookSink(webhook.url),
+        SmtpSink("127.0.0.1", port=smtp.port, sender="bench@localhost", recipients=["ops@localhost"]),
+    ]
+
+    init_db()
+    started = time.perf_counter()
+    with SessionLocal() as db:
+        portfolio = generate_portfolio(
+            db,
+            loans=args.loans,
+            obligations_per_loan=args.obligations,
+            evidence_per_obligation=0,
+            audit_events_per_obligation=0,
+            seed=args.seed,
+        )
+        scheduled = db.scalar(select(func.count()).select_from(models.Reminder))
+    seeded = time.perf_counter() - started
+
+    scheduler = ReminderScheduler(sinks=sinks, batch_size=args.batch_size, retry_seconds=600)
+    now = crud.now_utc()
+    end = now + timedelta(days=args.days)
+    wakes = 0
+    delivered = 0
+    started = time.perf_counter()
+    while True:
+        delivered += scheduler.run_once(now=now)
+        wakes += 1
+        if now + timedelta(hours=args.step_hours) > end:
+            break
+        now += timedelta(hours=args.step_hours)
+    elapsed = time.perf_counter() - started
+
+    # A fresh scheduler stands in for a restart; nothing already sent may go out again.
+    resent = ReminderScheduler(sinks=sinks, batch_size=args.batch_size).run_once(now=now)
+
+    with SessionLocal() as db:
+        states = {
+            status: count
+            for status, count in db.execute(
+                select(models.Reminder.status, func.count()).group_by(models.Reminder.status)
+            )
+        }
+    duplicates = sum(1 for n in webhook.received.values() if n > 1)
+    webhook.shutdown()
+    smtp.shutdown()
+
+    print(f"portfolio:   {len(portfolio.loan_ids)} loans, {len(portfolio.obligation_ids)} obligations")
+    print(f"scheduled:   {scheduled} reminders in {seeded:.2f}s (including seeding)")
+    print(f"simulated:   {args.days} days in {wakes} wakes, {elapsed:.2f}s wall")
+    print(f"delivered:   {delivered} ({delivered / elapsed:,.0f}/s)")
+    print(f"states:      {', '.join(f'{k}={v}' for k, v in sorted(states.items()))}")
+    print(f"webhook:     {webhook.posts} posts, {webhook.failures} injected failures")
+    print(f"smtp:        {smtp.messages} messages")
+    print(f"duplicates:  {duplicates}")
+    print(f"after restart: {resent} resent")
+    if duplicates or resent:
+        raise SystemExit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,217 @@
+from __future__ import annotations
+
+import argparse
+import io
+import json
+import random
+import time
+from collections import Counter
+from dataclasses import dataclass, field
+from datetime import datetime, timedelta
+from typing import Any
+
+from sqlalchemy import insert
+from sqlalchemy.orm import Session
+
+from app import crud, models, schemas
+from app.db import SessionLocal, init_db
+from app.services import blob_store, search_index
+from benchmarks.agreement_corpus import generate_agreement
+
+_PARTIES = ["Borrower", "Agent", "Guarantor", "Parent", "Security Trustee"]
+_NAMES = [
+    "Annual audited financials",
+    "Quarterly management accounts",
+    "Compliance certificate",
+    "Borrowing base certificate",
+    "Annual budget",
+    "Insurance renewal evidence",
+    "Leverage covenant test",
+    "Interest cover test",
+    "Notice of default",
+    "Litigation notice",
+]
+_AUDIT_ACTIONS = [
+    schemas.AuditAction.UPDATED.value,
+    schemas.AuditAction.EVIDENCE_UPLOADED.value,
+    schemas.AuditAction.COMPLETED.value,
+]
+
+
+@dataclass
+class Portfolio:
+    loan_ids: list[int] = field(default_factory=list)
+    obligation_ids: list[int] = field(default_factory=list)
+    evidence_ids: list[int] = field(default_factory=list)
+
+
+def _insert_ids(db: Session, model: type[Any], rows: list[dict[str, Any]], batch_size: int) -> list[int]:
+    ids: list[int] = []
+    stmt = (
+        insert(model)
+        .returning(model.id, sort_by_parameter_order=True)
+        .execution_options(render_nulls=True)
+    )
+    for start in range(0, len(rows), batch_size):
+        ids.extend(db.scalars(stmt, rows[start : start + batch_size]))
+    return ids
+
+
+def _obligation_row(rng: random.Random, *, loan_id: int, now: datetime) -> dict[str, Any]:
+    frequency = rng.choice(list(schemas.Frequency)).value
+    due_at = now + timedelta(days=rng.randint(-120, 400), hours=rng.randint(0, 23))
+    recurring = frequency not in (schemas.Frequency.ONCE.value, schemas.Frequency.AD_HOC.value)
+    status = schemas.ObligationStatus.COMPLETED.value if rng.random() < 0.2 else "ON_TRACK"
+    next_due_at = due_at if recurring else None
+    due_date = None if recurring else due_at.date()
+    effective_due_at = crud.due_at_from(next_due_at, due_date)
+    created_at = now - timedelta(days=rng.randint(0, 720), seconds=rng.randint(0, 86399))
+    return {
+        "loan_id": loan_id,
+        "name": rng.choice(_NAMES),
+        "obligation_type": rng.choice(list(schemas.ObligationType)).value,
+        "description": "Synthetic obligation generated for benchmarking.",
+        "party_responsible": rng.choice(_PARTIES),
+        "frequency": frequency,
+        "due_date": due_date,
+        "due_rule": f"within {rng.choice([10, 30, 45, 90, 120])} days" if recurring else None,
+        "next_due_at": next_due_at,
+        "effective_due_at": effective_due_at,
+        "anchor_day": effective_due_at.day,
+        "status": crud.compute_status(current_status=status, due_at=effective_due_at, now=now),
+        "confidence": round(rng.uniform(0.4, 1.0), 3),
+        "source_excerpt": None,
+        "source_page": rng.randint(1, 300),
+        "created_at": created_at,
+        "updated_at": created_at,
+    }
+
+
+def generate_portfolio(
+    db: Session,
+    *,
+    loans: int,
+    obligations_per_loan: int,
+    evidence_per_obligation: int = 1,
+    audit_events_per_obligation: int = 3,
+    agreement_pages: int = 0,
+    blob_pool: int = 32,
+    seed: int = 0,
+    batch_size: int = 5000,
+) -> Portfolio:
+    rng = random.Random(seed)
+    now = crud.now_utc()
+    portfolio = Portfolio()
+
+    portfolio.loan_ids = _insert_ids(
+        db,
+        models.Loan,
+        [
+            {"title": f"Synthetic Facility {seed}-{i + 1:05d}", "created_at": now - timedelta(minutes=i)}
+            for i in range(loans)
+        ],
+        batch_size,
+    )
+    obligation_rows = [
+        _obligation_row(rng, loan_id=loan_id, now=now)
+        for loan_id in portfolio.loan_ids
+        for _ in range(obligations_per_loan)
+    ]
+    portfolio.obligation_ids = _insert_ids(db, models.Obligation, obligation_rows, batch_size)
+    search_index.index_obligations(
+        db, [{"id": i, **row} for i, row in zip(portfolio.obligation_ids, obligation_rows)]
+    )
+
+    blobs = []
+    if evidence_per_obligation and portfolio.obligation_ids:
+        for _ in range(blob_pool):
+            data = rng.randbytes(rng.randint(1024, 64 * 1024))
+            blobs.append(blob_store.write_blob(io.BytesIO(data)))
+
+    evidence_rows = []
+    refs: Counter[str] = Counter()
+    for obligation_id, row in zip(portfolio.obligation_ids, obligation_rows):
+        for n in range(evidence_per_obligation):
+            sha256, size_bytes, rel_path = rng.choice(blobs)
+            refs[sha256] += 1
+            evidence_rows.append(
+                {
+                    "obligation_id": obligation_id,
+                    "filename": f"evidence-{obligation_id}-{n + 1}.pdf",
+                    "file_path": rel_path,
+                    "sha256": sha256,
+                    "size_bytes": size_bytes,
+                    "uploaded_at": row["created_at"] + timedelta(days=n + 1),
+                    "note": None,
+                }
+            )
+    if refs:
+        db.execute(
+            insert(models.EvidenceBlob),
+            [
+                {"sha256": sha256, "file_path": rel_path, "size_bytes": size_bytes, "ref_count": refs[sha256]}
+                for sha256, size_bytes, rel_path in blobs
+                if refs[sha256]
+            ],
+        )
+    portfolio.evidence_ids = _insert_ids(db, models.Evidence, evidence_rows, batch_size)
+
+    audit_rows = []
+    for obligation_id, row in zip(portfolio.obligation_ids, obligation_rows):
+        for n in range(audit_events_per_obligation):
+            action = schemas.AuditAction.CREATED.value if n == 0 else rng.choice(_AUDIT_ACTIONS)
+            audit_rows.append(
+                {
+                    "entity_type": "obligation",
+                    "entity_id": obligation_id,
+                    "action": action,
+                    "details_json": json.dumps({"loan_id": row["loan_id"], "name": row["name"]}),
+                    "loan_id": row["loan_id"],
+                    "obligation_id": obligation_id,
+                    "at": row["created_at"] + timedelta(hours=n),
+                }
+            )
+    for start in range(0, len(audit_rows), batch_size):
+        db.execute(insert(models.AuditEvent), audit_rows[start : start + batch_size])
+    db.commit()
+    crud.backfill_reminders(db, now=now)
+
+    if agreement_pages:
+        for loan_id in portfolio.loan_ids:
+            loan = db.get(models.Loan, loan_id)
+            text = generate_agreement(pages=agreement_pages, seed=rng.randrange(1 << 30))
+            crud.store_loan_text(db, loan=loan, text=text)
+    return portfolio
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Seed the configured database with a synthetic portfolio.")
+    parser.add_argument("--loans", type=int, default=1000)
+    parser.add_argument("--obligations", type=int, default=100, help="obligations per loan")
+    parser.add_argument("--evidence", type=int, default=1, help="evidence files per obligation")
+    parser.add_argument("--audit", type=int, default=3, help="audit events per obligation")
+    parser.add_argument("--agreement-pages", type=int, default=0)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    init_db()
+    started = time.perf_counter()
+    with SessionLocal() as db:
+        portfolio = generate_portfolio(
+            db,
+            loans=args.loans,
+            obligations_per_loan=args.obligations,
+            evidence_per_obligation=args.evidence,
+            audit_events_per_obligation=args.audit,
+            agreement_pages=args.agreement_pages,
+            seed=args.seed,
+        )
+    elapsed = time.perf_counter() - started
+    print(f"loans:       {len(portfolio.loan_ids)}")
+    print(f"obligations: {len(portfolio.obligation_ids)}")
+    print(f"evidence:    {len(portfolio.evidence_ids)}")
+    print(f"elapsed:     {elapsed:.3f}s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,51 @@
+from __future__ import annotations
+
+import os
+import tempfile
+from collections.abc import Iterator
+from typing import Any
+
+import pytest
+
+# app.db builds its engines at import time, so point them at a scratch database first.
+_workdir = tempfile.mkdtemp(prefix="covenantops-tests-")
+os.environ["DATABASE_URL"] = f"sqlite:///{_workdir}/test.db"
+os.environ["STORAGE_DIR"] = os.path.join(_workdir, "storage")
+for _name in ("DATABASE_READ_URL", "REMINDER_WEBHOOK_URL", "REMINDER_SMTP_HOST"):
+    os.environ.pop(_name, None)
+
+from fastapi.testclient import TestClient  # noqa: E402
+from sqlalchemy.orm import Session  # noqa: E402
+
+from app.db import SessionLocal  # noqa: E402
+from app.main import app  # noqa: E402
+
+
+@pytest.fixture(scope="session")
+def client() -> Iterator[TestClient]:
+    with TestClient(app) as c:
+        yield c
+
+
+@pytest.fixture
+def db(client: TestClient) -> Iterator[Session]:
+    with SessionLocal() as session:
+        yield session
+
+
+@pytest.fixture
+def loan(client: TestClient) -> dict[str, Any]:
+    response = client.post("/api/loans", json={"title": "Test Facility"})
+    assert response.status_code == 200
+    return response.json()
+
+
+@pytest.fixture
+def make_obligation(client: TestClient, loan: dict[str, Any]):
+    def _make(**fields: Any) -> dict[str, Any]:
+        payload = {"name": "Quarterly financial statements", "obligation_type": "REPORTING", **fields}
+        response = client.post(f"/api/loans/{loan['id']}/obligations", json=payload)
+        assert response.status_code == 200, response.text
+        return response.json()
+
+    return _make
@@ -0,0 +1,60 @@
+from __future__ import annotations
+
+import json
+
+from app import crud, models
+
+
+def _ids(client, **params) -> list[int]:
+    return [e["id"] for e in client.get("/api/audit", params={"limit": 1000, **params}).json()]
+
+
+def test_audit_filters_by_denormalized_links_and_pages(client, loan, make_obligation) -> None:
+    obligation = make_obligation(name="Audited certificate")
+    for n in range(4):
+        response = client.put(
+            f"/api/obligations/{obligation['id']}", json={"name": f"Audited certificate v{n}"}
+        )
+        assert response.status_code == 200
+    assert client.post(f"/api/obligations/{obligation['id']}/complete").status_code == 200
+
+    events = client.get(
+        "/api/audit", params={"obligation_id": obligation["id"], "limit": 1000}
+    ).json()
+    assert [e["action"] for e in events][0] == "COMPLETED"
+    assert len(events) == 6
+    assert {e["loan_id"] for e in events} == {loan["id"]}
+    assert set(_ids(client, obligation_id=obligation["id"])) <= set(
+        _ids(client, loan_id=loan["id"])
+    )
+    assert _ids(client, obligation_id=obligation["id"], action="UPDATED") == [
+        e["id"] for e in events if e["action"] == "UPDATED"
+    ]
+
+    seen: list[int] = []
+    params = {"obligation_id": obligation["id"], "limit": 4}
+    while True:
+        response = client.get("/api/audit", params=params)
+        seen += [e["id"] for e in response.json()]
+        cursor = response.headers.get("X-Next-Cursor")
+        if cursor is None:
+            break
+        params = {**params, "cursor": cursor}
+    assert seen == [e["id"] for e in events]
+
+    assert client.get("/api/audit", params={"cursor": "not-a-cursor"}).status_code == 400
+
+
+def test_backfill_links_legacy_audit_rows(db, loan) -> None:
+    legacy = models.AuditEvent(
+        entity_type="evidence",
+        entity_id=987_654,
+        action="EVIDENCE_UPLOADED",
+        details_json=json.dumps({"loan_id": loan["id"], "obligation_id": 876_543}),
+    )
+    db.add(legacy)
+    db.commit()
+
+    assert crud.backfill_audit_links(db) >= 1
+    db.refresh(legacy)
+    assert (legacy.loan_id, legacy.obligation_id) == (loan["id"], 876_543)
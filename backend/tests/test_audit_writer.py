@@ -0,0 +1,89 @@
+from __future__ import annotations
+
+from collections.abc import Iterator
+
+import pytest
+from sqlalchemy import func, select
+from sqlalchemy.orm import Session
+
+from app import models
+from app.services import audit_writer as audit_writer_module
+from app.services.audit_writer import AuditWriter
+from app.services.metrics import registry
+
+
+def _rows(entity_id: int, n: int = 1) -> list[dict]:
+    return [
+        {"entity_type": "loan", "entity_id": entity_id, "action": "UPDATED", "details_json": "{}"}
+        for _ in range(n)
+    ]
+
+
+def _stored(db: Session, entity_id: int) -> int:
+    return db.scalar(
+        select(func.count()).select_from(models.AuditEvent).where(models.AuditEvent.entity_id == entity_id)
+    )
+
+
+@pytest.fixture
+def writer(db: Session) -> Iterator[AuditWriter]:
+    w = AuditWriter(buffered=True, max_pending=3, flush_interval_seconds=3600)
+    w.start()
+    yield w
+    w.stop()
+
+
+def test_rolled_back_events_are_never_buffered(writer: AuditWriter, db: Session) -> None:
+    writer.record(db, _rows(918_001, 2))
+    assert writer.pending() == 0
+    db.rollback()
+    db.commit()
+    assert writer.pending() == 0
+    assert writer.flush() == 0
+    assert _stored(db, 918_001) == 0
+
+
+def test_committed_events_are_buffered_then_flushed(writer: AuditWriter, db: Session) -> None:
+    writer.record(db, _rows(918_002, 2))
+    db.commit()
+    assert writer.pending() == 2
+    assert writer.flush() == 2
+    assert _stored(db, 918_002) == 2
+
+
+def test_full_buffer_writes_in_the_callers_transaction(writer: AuditWriter, db: Session) -> None:
+    writer.record(db, _rows(918_003, 3))
+    db.commit()
+    writer.record(db, _rows(918_004))
+    db.commit()
+    assert writer.pending() == 3
+    assert _stored(db, 918_004) == 1
+    writer.flush()
+
+
+def test_failed_flush_requeues_up_to_the_cap(
+    writer: AuditWriter, db: Session, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    writer.record(db, _rows(918_005, 2))
+    db.commit()
+
+    def unavailable() -> Session:
+        raise RuntimeError("database unavailable")
+
+    monkeypatch.setattr(audit_writer_module, "SessionLocal", unavailable)
+    with pytest.raises(RuntimeError):
+        writer.flush()
+    assert writer.pending() == 2
+
+    writer.record(db, _rows(918_006, 1))
+    db.commit()
+    before = registry._values["audit_events_dropped_total"].get((), 0.0)
+    writer._enqueue(_rows(918_007, 2))
+    assert writer.pending() == 3
+    assert registry._values["audit_events_dropped_total"].get((), 0.0) == before + 2
+
+    monkeypatch.undo()
+    assert writer.flush() == 3
+    assert _stored(db, 918_005) == 0
+    assert _stored(db, 918_006) == 1
+    assert _stored(db, 918_007) == 2
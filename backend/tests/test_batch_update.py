@@ -0,0 +1,51 @@
+from __future__ import annotations
+
+from sqlalchemy import func, select
+from sqlalchemy.orm import Session
+
+from app import models
+
+
+def _state(db: Session, loan_id: int, obligation_id: int) -> tuple:
+    db.expire_all()
+    return (
+        db.get(models.Loan, loan_id).version,
+        db.get(models.Obligation, obligation_id).updated_at,
+        db.scalar(
+            select(func.count())
+            .select_from(models.AuditEvent)
+            .where(models.AuditEvent.obligation_id == obligation_id)
+        ),
+    )
+
+
+def test_no_op_patch_leaves_obligation_and_loan_untouched(client, db, loan, make_obligation) -> None:
+    obligation = make_obligation(name="Insurance certificate", party_responsible="Borrower")
+    before = _state(db, loan["id"], obligation["id"])
+
+    patch = {"id": obligation["id"], "name": "Insurance certificate", "party_responsible": "Borrower"}
+    response = client.post("/api/obligations/batch/update", json={"items": [patch]})
+    assert response.status_code == 200
+    assert response.json()["succeeded"] == 1
+    assert _state(db, loan["id"], obligation["id"]) == before
+
+
+def test_batch_only_bumps_for_changed_rows(client, db, loan, make_obligation) -> None:
+    same = make_obligation(name="Annual budget")
+    edited = make_obligation(name="Compliance certificate")
+    version, same_updated_at, _ = _state(db, loan["id"], same["id"])
+
+    response = client.post(
+        "/api/obligations/batch/update",
+        json={
+            "items": [
+                {"id": same["id"], "name": "Annual budget"},
+                {"id": edited["id"], "name": "Signed compliance certificate"},
+            ]
+        },
+    )
+    assert response.json()["succeeded"] == 2
+    new_version, updated_at, _ = _state(db, loan["id"], same["id"])
+    assert updated_at == same_updated_at
+    assert new_version == version + 1
+    assert db.get(models.Obligation, edited["id"]).name == "Signed compliance certificate"
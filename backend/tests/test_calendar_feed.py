@@ -0,0 +1,53 @@
+from __future__ import annotations
+
+
+def test_loan_feed_is_conditional_and_changes_with_the_loan(client, loan, make_obligation) -> None:
+    obligation = make_obligation(name="Calendar covenant test", due_date="2031-05-15")
+    url = f"/api/loans/{loan['id']}/export.ics"
+
+    first = client.get(url)
+    assert first.status_code == 200
+    assert first.headers["content-type"].startswith("text/calendar")
+    assert "Calendar covenant test" in first.text
+    etag, last_modified = first.headers["ETag"], first.headers["Last-Modified"]
+
+    assert client.get(url, headers={"If-None-Match": etag}).status_code == 304
+    assert client.get(url, headers={"If-None-Match": f'W/{etag}, "other"'}).status_code == 304
+    assert client.get(url, headers={"If-Modified-Since": last_modified}).status_code == 304
+    stale = client.get(url, headers={"If-Modified-Since": "Mon, 01 Jan 2001 00:00:00 GMT"})
+    assert stale.status_code == 200
+
+    response = client.put(
+        f"/api/obligations/{obligation['id']}", json={"name": "Calendar covenant moved"}
+    )
+    assert response.status_code == 200
+    changed = client.get(url, headers={"If-None-Match": etag})
+    assert changed.status_code == 200
+    assert "Calendar covenant moved" in changed.text
+
+    # Deleting an obligation also bumps the loan version, so the feed cannot keep its old ETag.
+    assert client.delete(f"/api/obligations/{obligation['id']}").status_code == 200
+    deleted = client.get(url, headers={"If-None-Match": changed.headers["ETag"]})
+    assert deleted.status_code == 200
+    assert "Calendar covenant moved" not in deleted.text
+
+
+def test_portfolio_feed_streams_and_honours_etags(client, make_obligation) -> None:
+    make_obligation(
+        name="Portfolio feed item", party_responsible="Feed Agent", due_date="2031-07-01"
+    )
+    params = {"party_responsible": "Feed Agent"}
+
+    response = client.get("/api/portfolio/export.ics", params=params)
+    assert response.status_code == 200
+    assert response.text.startswith("BEGIN:VCALENDAR")
+    assert response.text.rstrip().endswith("END:VCALENDAR")
+    assert "Portfolio feed item" in response.text
+
+    again = client.get(
+        "/api/portfolio/export.ics",
+        params=params,
+        headers={"If-None-Match": response.headers["ETag"]},
+    )
+    assert again.status_code == 304
+    assert again.content == b""
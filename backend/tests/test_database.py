@@ -0,0 +1,35 @@
+from __future__ import annotations
+
+import os
+
+import pytest
+from sqlalchemy import text
+from sqlalchemy.exc import OperationalError
+
+from app import db as db_module
+
+
+def test_health_db_reports_pool_and_wal_state(client) -> None:
+    response = client.get("/api/health/db")
+    assert response.status_code == 200
+    stats = response.json()
+    assert stats["status"] == "ok"
+    assert stats["dialect"] == "sqlite"
+    assert stats["journal_mode"] == "wal"
+    assert set(stats["wal"]) == {"busy", "log_frames", "checkpointed_frames"}
+    assert stats["pool"]["class"] == type(db_module.engine.pool).__name__
+    assert stats["read_pool"] is None
+
+
+def test_read_only_engine_applies_pragmas_and_rejects_writes(client) -> None:
+    reader = db_module.build_engine(os.environ["DATABASE_URL"], read_only=True)
+    try:
+        with reader.connect() as conn:
+            assert conn.execute(text("PRAGMA query_only")).scalar() == 1
+            assert conn.execute(text("PRAGMA busy_timeout")).scalar() == 5000
+            assert conn.execute(text("SELECT count(*) FROM loans")).scalar() >= 0
+            with pytest.raises(OperationalError):
+                conn.execute(text("INSERT INTO loans (title, version) VALUES ('nope', 0)"))
+        assert db_module.pool_stats(reader)["class"] == type(reader.pool).__name__
+    finally:
+        reader.dispose()
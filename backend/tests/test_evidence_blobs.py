@@ -0,0 +1,113 @@
+from __future__ import annotations
+
+import hashlib
+
+import pytest
+from sqlalchemy import event
+from sqlalchemy.orm import Session
+
+from app import crud, models
+from app.services import blob_store
+
+
+def _upload(client, obligation_id: int, content: bytes) -> dict:
+    response = client.post(
+        f"/api/obligations/{obligation_id}/evidence", files={"file": ("proof.pdf", content)}
+    )
+    assert response.status_code == 200, response.text
+    return response.json()
+
+
+def _blob_file(db, sha256: str):
+    return blob_store.storage_root() / blob_store.blob_rel_path(sha256)
+
+
+def test_shared_blob_survives_until_last_reference(client, db, make_obligation) -> None:
+    first, second = make_obligation(), make_obligation()
+    evidence = _upload(client, first["id"], b"shared blob contents")
+    _upload(client, second["id"], b"shared blob contents")
+    path = _blob_file(db, evidence["sha256"])
+
+    assert client.delete(f"/api/obligations/{first['id']}").status_code == 200
+    assert path.exists()
+    assert client.delete(f"/api/obligations/{second['id']}").status_code == 200
+    assert not path.exists()
+    assert db.get(models.EvidenceBlob, evidence["sha256"]) is None
+
+
+def test_cleanup_skips_blob_referenced_again(client, db, make_obligation) -> None:
+    doomed, survivor = make_obligation(), make_obligation()
+    evidence = _upload(client, doomed["id"], b"re-uploaded while being deleted")
+
+    # Delete without running orphan cleanup yet, then upload the same bytes elsewhere.
+    orphaned = crud.delete_obligation(
+        db, obligation=crud.get_obligation(db, obligation_id=doomed["id"])
+    )
+    assert orphaned == [evidence["sha256"]]
+    again = _upload(client, survivor["id"], b"re-uploaded while being deleted")
+
+    assert crud.remove_orphaned_blobs(db, hashes=orphaned) == 0
+    download = client.get(f"/api/evidence/{again['id']}/download")
+    assert download.status_code == 200
+    assert download.content == b"re-uploaded while being deleted"
+
+
+def test_upload_after_cleanup_writes_blob_back(client, db, make_obligation) -> None:
+    doomed, survivor = make_obligation(), make_obligation()
+    evidence = _upload(client, doomed["id"], b"cleaned up then uploaded")
+    assert client.delete(f"/api/obligations/{doomed['id']}").status_code == 200
+    assert not _blob_file(db, evidence["sha256"]).exists()
+
+    again = _upload(client, survivor["id"], b"cleaned up then uploaded")
+    assert (
+        client.get(f"/api/evidence/{again['id']}/download").content == b"cleaned up then uploaded"
+    )
+
+
+def test_failed_commit_leaves_no_blob_behind(client, db, make_obligation) -> None:
+    obligation = make_obligation()
+    content = b"commit fails after staging"
+
+    def fail_evidence_commit(session: Session) -> None:
+        if any(isinstance(o, models.Evidence) for o in session.identity_map.values()):
+            raise RuntimeError("database unavailable")
+
+    event.listen(Session, "before_commit", fail_evidence_commit)
+    try:
+        with pytest.raises(RuntimeError):
+            client.post(
+                f"/api/obligations/{obligation['id']}/evidence",
+                files={"file": ("proof.pdf", content)},
+            )
+    finally:
+        event.remove(Session, "before_commit", fail_evidence_commit)
+
+    sha256 = hashlib.sha256(content).hexdigest()
+    assert not _blob_file(db, sha256).exists()
+    assert db.get(models.EvidenceBlob, sha256) is None
+    assert not list((blob_store.storage_root() / "tmp").iterdir())
+
+    evidence = _upload(client, obligation["id"], content)
+    assert client.get(f"/api/evidence/{evidence['id']}/download").content == content
+
+
+def test_failed_placement_removes_the_committed_evidence(
+    client, db, make_obligation, monkeypatch
+) -> None:
+    obligation = make_obligation()
+    content = b"disk full while placing"
+
+    def broken(_staged) -> None:
+        raise OSError("No space left on device")
+
+    with monkeypatch.context() as patch:
+        patch.setattr(blob_store, "place_blob", broken)
+        with pytest.raises(OSError):
+            client.post(
+                f"/api/obligations/{obligation['id']}/evidence",
+                files={"file": ("proof.pdf", content)},
+            )
+
+    db.expire_all()
+    assert client.get(f"/api/obligations/{obligation['id']}/evidence").json() == []
+    assert db.get(models.EvidenceBlob, hashlib.sha256(content).hexdigest()) is None
@@ -0,0 +1,59 @@
+from __future__ import annotations
+
+import io
+import zipfile
+
+
+def _upload(client, obligation_id: int, filename: str, content: bytes) -> dict:
+    response = client.post(
+        f"/api/obligations/{obligation_id}/evidence", files={"file": (filename, content)}
+    )
+    assert response.status_code == 200, response.text
+    return response.json()
+
+
+def test_download_supports_etags_ranges_and_if_range(client, make_obligation) -> None:
+    content = bytes(range(256)) * 8
+    evidence = _upload(client, make_obligation()["id"], "ranged.bin", content)
+    url = f"/api/evidence/{evidence['id']}/download"
+
+    full = client.get(url)
+    assert full.status_code == 200
+    assert full.content == content
+    etag = full.headers["ETag"]
+    assert etag == f'"{evidence["sha256"]}"'
+    assert full.headers["Accept-Ranges"] == "bytes"
+    assert client.get(url, headers={"If-None-Match": etag}).status_code == 304
+
+    part = client.get(url, headers={"Range": "bytes=100-199"})
+    assert part.status_code == 206
+    assert part.content == content[100:200]
+    assert part.headers["Content-Range"] == f"bytes 100-199/{len(content)}"
+
+    resumed = client.get(url, headers={"Range": "bytes=2000-", "If-Range": etag})
+    assert resumed.status_code == 206
+    assert resumed.content == content[2000:]
+
+    # A validator for other content means the client's partial copy is stale: send it all.
+    stale = client.get(url, headers={"Range": "bytes=2000-", "If-Range": '"other"'})
+    assert stale.status_code == 200
+    assert stale.content == content
+
+
+def test_loan_evidence_zip_streams_every_file(client, loan, make_obligation) -> None:
+    first, second = make_obligation(), make_obligation()
+    files = {
+        _upload(client, first["id"], "accounts.pdf", b"annual accounts")["id"]: b"annual accounts",
+        _upload(client, second["id"], "cert.pdf", b"compliance cert")["id"]: b"compliance cert",
+    }
+
+    response = client.get(f"/api/loans/{loan['id']}/evidence.zip")
+    assert response.status_code == 200
+    assert response.headers["content-type"] == "application/zip"
+    with zipfile.ZipFile(io.BytesIO(response.content)) as archive:
+        assert archive.testzip() is None
+        contents = {
+            int(name.split("/")[1].split("-")[0]): archive.read(name) for name in archive.namelist()
+        }
+    assert contents == files
+    assert client.get("/api/loans/999999/evidence.zip").status_code == 404
@@ -0,0 +1,77 @@
+from __future__ import annotations
+
+from datetime import datetime, timedelta
+
+from sqlalchemy import event
+
+from app import crud
+from app.db import engine
+from app.services import due_specs, extraction_cache
+from app.services.extractor import MockExtractor
+from app.services.rule_extractor import RuleBasedExtractor
+
+AGREEMENT = (
+    "The Borrower shall deliver quarterly financial statements within 45 days after the end "
+    "of each fiscal quarter.\n\nThe Borrower shall deliver a borrowing base certificate within "
+    "20 days after the end of each calendar month."
+)
+
+
+def _later(monkeypatch, days: int) -> datetime:
+    later = crud.now_utc() + timedelta(days=days)
+    monkeypatch.setattr(crud, "now_utc", lambda: later)
+    return later
+
+
+def test_cache_hit_recomputes_offset_deadlines(db, monkeypatch) -> None:
+    text = "mock agreement for the cache"
+    fresh, hit = extraction_cache.extract(db, MockExtractor(), text)
+    assert not hit
+
+    later = _later(monkeypatch, 5)
+    cached, hit = extraction_cache.extract(db, MockExtractor(), text)
+    assert hit
+
+    by_name = {o.name: o for o in cached}
+    for o in fresh:
+        again = by_name[o.name]
+        if o.next_due_at is not None:
+            assert again.next_due_at == later.replace(microsecond=0) + timedelta(
+                days=o.due_spec.offset_days
+            )
+        if o.due_date is not None:
+            assert again.due_date == later.date() + timedelta(days=o.due_spec.offset_days)
+
+
+def test_cache_hit_recomputes_period_deadlines(db, monkeypatch) -> None:
+    extractor = RuleBasedExtractor(workers=1)
+    fresh, _ = extraction_cache.extract(db, extractor, AGREEMENT)
+    assert {o.due_spec.period_months for o in fresh if o.due_spec} == {1, 3}
+
+    monkeypatch.setattr(extraction_cache, "_max_age", lambda: None)
+    later = _later(monkeypatch, 40)
+    cached, hit = extraction_cache.extract(db, extractor, AGREEMENT)
+    assert hit
+    for o in cached:
+        spec = o.due_spec
+        assert o.due_date == due_specs.next_period_due(spec.period_months, spec.offset_days, later.date())
+        assert o.due_date >= later.date()
+
+
+def test_cache_hit_does_not_write(db) -> None:
+    text = "read only cache hit"
+    extraction_cache.extract(db, MockExtractor(), text)
+    db.commit()
+
+    statements: list[str] = []
+
+    def record(_conn, _cursor, statement, *_args) -> None:
+        statements.append(statement.split()[0].upper())
+
+    event.listen(engine, "before_cursor_execute", record)
+    try:
+        _, hit = extraction_cache.extract(db, MockExtractor(), text)
+    finally:
+        event.remove(engine, "before_cursor_execute", record)
+    assert hit
+    assert set(statements) == {"SELECT"}
@@ -0,0 +1,125 @@
+from __future__ import annotations
+
+import multiprocessing
+import time
+from collections import Counter
+from datetime import timedelta
+
+from app import crud, schemas
+from app.services.extraction_jobs import ExtractionWorker
+from benchmarks.agreement_corpus import generate_agreement
+
+LEASE = timedelta(minutes=5)
+
+
+def _submit(db, loan, text: str, version: str = "1"):
+    return crud.submit_extraction_job(
+        db, loan_id=loan["id"], extractor="mock", extractor_version=version, text=text
+    )
+
+
+def test_job_is_claimed_once(db, loan) -> None:
+    job, created = _submit(db, loan, "claim once")
+    assert created and job.status == schemas.JobStatus.QUEUED.value
+
+    first = crud.claim_extraction_job(db, job_id=job.id, worker_id="a", lease=LEASE)
+    second = crud.claim_extraction_job(db, job_id=job.id, worker_id="b", lease=LEASE)
+
+    assert first is not None and first.claimed_by == "a"
+    assert first.status == schemas.JobStatus.RUNNING.value
+    assert second is None
+
+
+def test_only_stale_running_jobs_are_recovered(db, loan) -> None:
+    live, _ = _submit(db, loan, "live lease")
+    stale, _ = _submit(db, loan, "stale lease")
+    now = crud.now_utc()
+    crud.claim_extraction_job(db, job_id=live.id, worker_id="a", lease=LEASE, now=now)
+    crud.claim_extraction_job(db, job_id=stale.id, worker_id="dead", lease=LEASE, now=now - 2 * LEASE)
+
+    claimable = crud.list_claimable_extraction_jobs(db, now=now)
+    assert stale.id in claimable
+    assert live.id not in claimable
+
+    reclaimed = crud.claim_extraction_job(db, job_id=stale.id, worker_id="b", lease=LEASE, now=now)
+    assert reclaimed is not None and reclaimed.claimed_by == "b"
+    # The worker that lost its lease can no longer record a result over the new owner's run.
+    db.expire_all()
+    lost = crud.get_extraction_job(db, job_id=stale.id)
+    lost.claimed_by = "dead"
+    assert crud.fail_extraction_job(db, job=lost, error="late") is None
+
+
+def test_extractor_version_is_part_of_job_key(db, loan) -> None:
+    old, _ = _submit(db, loan, "versioned text", version="1")
+    same, created_same = _submit(db, loan, "versioned text", version="1")
+    new, created_new = _submit(db, loan, "versioned text", version="2")
+
+    assert same.id == old.id and not created_same
+    assert created_new and new.id != old.id
+
+
+def test_competing_workers_run_each_job_once(client, db, loan, monkeypatch) -> None:
+    texts = [f"competing {i}" for i in range(6)]
+    jobs = [_submit(db, loan, text)[0].id for text in texts]
+    runs: Counter[str] = Counter()
+    extract = ExtractionWorker._extract
+
+    def counting_extract(self, text, provider):
+        runs[text] += 1
+        return extract(self, text, provider)
+
+    monkeypatch.setattr(ExtractionWorker, "_extract", counting_extract)
+    workers = [ExtractionWorker(max_workers=2, use_processes=False) for _ in range(3)]
+    for worker in workers:
+        worker.start()
+    try:
+        for worker in workers:
+            for job_id in jobs:
+                worker.submit(job_id)
+        deadline = time.monotonic() + 10
+        while time.monotonic() < deadline:
+            db.expire_all()
+            finished = [crud.get_extraction_job(db, job_id=i) for i in jobs]
+            if all(j.finished_at is not None for j in finished):
+                break
+            time.sleep(0.05)
+    finally:
+        for worker in workers:
+            worker.stop()
+
+    assert {j.status for j in finished} == {schemas.JobStatus.SUCCEEDED.value}
+    assert [runs[text] for text in texts] == [1] * len(texts)
+
+
+def test_rules_jobs_in_the_process_pool_shut_down_cleanly(db, loan, monkeypatch) -> None:
+    monkeypatch.setenv("EXTRACTOR_PROVIDER", "rules")
+    # Would fan out per job process if the job pool did not pin its extractor to one process.
+    monkeypatch.setenv("RULES_EXTRACTOR_WORKERS", "4")
+    job, _ = crud.submit_extraction_job(
+        db,
+        loan_id=loan["id"],
+        extractor="rules",
+        extractor_version="1",
+        text=generate_agreement(pages=120, seed=8),
+    )
+    worker = ExtractionWorker(max_workers=1, use_processes=True)
+    worker.start()
+    try:
+        worker.submit(job.id)
+        deadline = time.monotonic() + 60
+        while time.monotonic() < deadline:
+            db.expire_all()
+            job = crud.get_extraction_job(db, job_id=job.id)
+            if job.finished_at is not None:
+                break
+            time.sleep(0.1)
+    finally:
+        started = time.monotonic()
+        worker.stop()
+        stopped_in = time.monotonic() - started
+
+    assert job.status == schemas.JobStatus.SUCCEEDED.value, job.error
+    assert len(job.obligation_ids) >= 11
+    assert stopped_in < 10
+    assert multiprocessing.active_children() == []
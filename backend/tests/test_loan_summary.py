@@ -0,0 +1,31 @@
+from __future__ import annotations
+
+from datetime import timedelta
+
+from app import crud
+
+
+def _due_in(days: int) -> str:
+    return str((crud.now_utc() + timedelta(days=days)).date())
+
+
+def test_summary_counts_statuses_in_sql(client, db, loan, make_obligation) -> None:
+    make_obligation(name="Overdue certificate", due_date=_due_in(-3))
+    make_obligation(name="Due soon budget", due_date=_due_in(5))
+    make_obligation(name="Later accounts", due_date=_due_in(60))
+    make_obligation(name="Undated notice")
+    make_obligation(name="Done already", due_date=_due_in(5), status="COMPLETED")
+
+    summary = client.get(f"/api/loans/{loan['id']}").json()["summary"]
+    assert summary == {"total": 5, "due_soon": 1, "overdue": 1, "on_track": 2, "completed": 1}
+
+    # The CASE expression is evaluated against the supplied clock, not the stored status.
+    later = crud.loan_summary(db, loan_id=loan["id"], now=crud.now_utc() + timedelta(days=30))
+    assert (later.overdue, later.due_soon, later.on_track, later.completed) == (2, 0, 2, 1)
+
+    portfolio = client.get("/api/portfolio/summary").json()
+    (entry,) = [row for row in portfolio["loans"] if row["id"] == loan["id"]]
+    assert entry["summary"] == summary
+    totals = portfolio["totals"]
+    assert totals["total"] == sum(row["summary"]["total"] for row in portfolio["loans"])
+    assert totals["overdue"] == sum(row["summary"]["overdue"] for row in portfolio["loans"])
@@ -0,0 +1,43 @@
+from __future__ import annotations
+
+from sqlalchemy import select, update
+
+from app import crud, models
+from app.services import document_store
+
+
+def _chunks(db, loan_id: int) -> list[models.LoanDocumentChunk]:
+    db.expire_all()
+    c = models.LoanDocumentChunk
+    return list(db.scalars(select(c).where(c.loan_id == loan_id).order_by(c.chunk_index)))
+
+
+def _raw_text(db, loan_id: int) -> str | None:
+    return db.scalar(select(models.Loan.raw_text).where(models.Loan.id == loan_id))
+
+
+def test_imported_text_is_stored_compressed_in_page_chunks(client, db, loan) -> None:
+    pages = [f"Page {n}: the Borrower shall deliver its accounts. " * 20 for n in range(1, 121)]
+    text = "\f".join(pages) + "\f"
+    response = client.post(f"/api/loans/{loan['id']}/import-text", json={"text": text})
+    assert response.status_code == 200
+
+    chunks = _chunks(db, loan["id"])
+    size = document_store.pages_per_chunk()
+    assert [c.first_page for c in chunks] == list(range(1, len(pages) + 2, size))
+    assert {c.codec for c in chunks} == {document_store.CODEC}
+    assert sum(len(c.data) for c in chunks) < sum(c.size_bytes for c in chunks) // 5
+    assert crud.get_loan_text(db, loan_id=loan["id"]) == text
+    assert _raw_text(db, loan["id"]) is None
+
+
+def test_legacy_raw_text_moves_into_chunks(db, loan) -> None:
+    text = "Legacy agreement page one\fpage two\f\fpage four"
+    db.execute(update(models.Loan).where(models.Loan.id == loan["id"]).values(raw_text=text))
+    db.commit()
+    assert crud.get_loan_text(db, loan_id=loan["id"]) is None
+
+    assert crud.migrate_legacy_loan_text(db) >= 1
+    assert _raw_text(db, loan["id"]) is None
+    assert len(_chunks(db, loan["id"])) == 1
+    assert crud.get_loan_text(db, loan_id=loan["id"]) == text
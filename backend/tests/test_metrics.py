@@ -0,0 +1,24 @@
+from __future__ import annotations
+
+
+def _requests_total(client, method: str) -> list[str]:
+    return [
+        line
+        for line in client.get("/api/metrics").text.splitlines()
+        if line.startswith("http_requests_total") and f'method="{method}"' in line
+    ]
+
+
+def test_route_label_includes_the_router_prefix(client, loan) -> None:
+    assert client.get(f"/api/loans/{loan['id']}").status_code == 200
+    lines = _requests_total(client, "GET")
+    assert any('route="/api/loans/{loan_id}"' in line for line in lines)
+    assert not any('route="/loans/{loan_id}"' in line for line in lines)
+
+
+def test_app_level_and_unmatched_routes(client) -> None:
+    client.get("/api/metrics")
+    client.get("/no-such-route")
+    lines = _requests_total(client, "GET")
+    assert any('route="/api/metrics"' in line for line in lines)
+    assert any('route="unmatched",status="404"' in line for line in lines)
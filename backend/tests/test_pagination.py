@@ -0,0 +1,46 @@
+from __future__ import annotations
+
+import pytest
+
+SORTS = ["created", "due", "status", "confidence"]
+
+
+@pytest.fixture
+def paged_loan(client, loan, make_obligation) -> int:
+    # Ties and NULLs in every sort column, so the cursor has to fall back to the id.
+    rows = [
+        {"due_date": "2031-03-31", "confidence": 0.9},
+        {"due_date": "2031-03-31", "confidence": 0.9, "status": "COMPLETED"},
+        {"due_date": None, "confidence": None},
+        {"due_date": "2030-01-15", "confidence": 0.4},
+        {"due_date": "2031-03-31", "confidence": None, "status": "COMPLETED"},
+        {"due_date": None, "confidence": 0.4},
+        {"due_date": "2032-06-30", "confidence": 0.9},
+        {"due_date": "2030-01-15", "confidence": 0.7, "status": "COMPLETED"},
+        {"due_date": None, "confidence": 0.7},
+        {"due_date": "2032-06-30", "confidence": None},
+    ]
+    for i, fields in enumerate(rows):
+        make_obligation(name=f"Paged obligation {i}", **fields)
+    return loan["id"]
+
+
+@pytest.mark.parametrize("sort", SORTS)
+def test_keyset_pages_match_the_unpaginated_list(client, paged_loan: int, sort: str) -> None:
+    url = f"/api/loans/{paged_loan}/obligations"
+    expected = [o["id"] for o in client.get(url, params={"sort": sort}).json()]
+    assert len(expected) == 10
+
+    seen: list[int] = []
+    params = {"sort": sort, "limit": 3}
+    for _ in range(len(expected)):
+        response = client.get(url, params=params)
+        assert response.status_code == 200
+        page = [o["id"] for o in response.json()]
+        assert len(page) <= 3
+        seen += page
+        cursor = response.headers.get("X-Next-Cursor")
+        if cursor is None:
+            break
+        params = {"sort": sort, "limit": 3, "cursor": cursor}
+    assert seen == expected
@@ -0,0 +1,91 @@
+from __future__ import annotations
+
+import time
+from datetime import datetime
+
+from app.services import recurrence
+from benchmarks.recurrence_expansion import MONTH_FREQUENCIES, synthetic_rows
+
+
+def test_month_end_anchor_does_not_drift() -> None:
+    due = datetime(2031, 1, 31, 9, 0)
+    chain = [due]
+    for _ in range(4):
+        chain.append(recurrence.next_occurrence_after(chain[-1], "MONTHLY", day=31))
+
+    assert [d.date().isoformat() for d in chain] == [
+        "2031-01-31",
+        "2031-02-28",
+        "2031-03-31",
+        "2031-04-30",
+        "2031-05-31",
+    ]
+
+
+def test_next_occurrence_matches_occurrences_between() -> None:
+    due = datetime(2032, 1, 30, 12, 0)
+    expected = recurrence.occurrences_between(
+        due, "QUARTERLY", datetime(2032, 1, 1), datetime(2034, 1, 1)
+    )
+
+    chain = [due]
+    while len(chain) < len(expected):
+        chain.append(recurrence.next_occurrence_after(chain[-1], "QUARTERLY", day=due.day))
+    assert chain == expected
+
+    # Once the stored date has been clamped, the saved anchor day keeps the feed on the same dates.
+    assert recurrence.occurrences_between(
+        chain[1], "QUARTERLY", chain[1], datetime(2034, 1, 1), day=30
+    ) == expected[1:]
+
+
+def test_rrule_clamps_month_end_anchors() -> None:
+    assert recurrence.rrule_for("MONTHLY", 15) == "FREQ=MONTHLY"
+    assert recurrence.rrule_for("MONTHLY", 31) == "FREQ=MONTHLY;BYMONTHDAY=-1"
+    assert recurrence.rrule_for("QUARTERLY", 30) == (
+        "FREQ=MONTHLY;INTERVAL=3;BYMONTHDAY=28,29,30;BYSETPOS=-1"
+    )
+    assert recurrence.rrule_for("ANNUAL", 29) == (
+        "FREQ=MONTHLY;INTERVAL=12;BYMONTHDAY=28,29;BYSETPOS=-1"
+    )
+    assert recurrence.rrule_for("WEEKLY", 31) == "FREQ=WEEKLY"
+
+
+def test_completing_month_end_obligation_keeps_anchor_day(client, make_obligation) -> None:
+    obligation = make_obligation(frequency="MONTHLY", next_due_at="2031-01-31T09:00:00")
+
+    seen = []
+    for _ in range(3):
+        response = client.post(f"/api/obligations/{obligation['id']}/complete")
+        assert response.status_code == 200
+        seen.append(response.json()["next_due_at"][:10])
+    assert seen == ["2031-02-28", "2031-03-31", "2031-04-30"]
+
+    occurrences = client.get(
+        "/api/obligations/occurrences",
+        params={"start": "2031-04-01T00:00:00", "days": 95, "loan_id": obligation["loan_id"]},
+    ).json()
+    assert [o["due_at"][:10] for o in occurrences if o["obligation_id"] == obligation["id"]] == [
+        "2031-04-30",
+        "2031-05-31",
+        "2031-06-30",
+    ]
+
+
+def test_memoized_expansion_matches_per_anchor_rules_and_fits_budget() -> None:
+    start, end = datetime(2031, 1, 1), datetime(2032, 1, 1)
+    frequencies = ["MONTHLY", "QUARTERLY", "SEMI_ANNUAL", "ANNUAL", "WEEKLY", "DAILY", "ONCE"]
+    sample = synthetic_rows(2_000, frequencies=frequencies, start=start, seed=7)
+
+    expected = sorted(
+        (due_at, row[0])
+        for row in sample
+        for due_at in recurrence.occurrences_between(row[5], row[4], start, end, day=row[6])
+    )
+    expanded = recurrence.expand_occurrences(sample, start=start, end=end)
+    assert [(o.due_at, o.obligation_id) for o in expanded] == expected
+
+    rows = synthetic_rows(50_000, frequencies=list(MONTH_FREQUENCIES), start=start)
+    started = time.perf_counter()
+    recurrence.expand_occurrences(rows, start=start, end=end)
+    assert time.perf_counter() - started < 1.0
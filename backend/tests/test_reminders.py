@@ -0,0 +1,154 @@
+from __future__ import annotations
+
+import json
+from datetime import timedelta
+
+import pytest
+from sqlalchemy import select
+from sqlalchemy.orm import Session
+
+from app import crud, models
+from app.services import reminders
+from app.services.reminder_scheduler import ReminderScheduler
+from app.services.reminder_sinks import ReminderBatch, ReminderItem, SmtpSink, sinks_from_env
+
+
+class RecordingSink:
+    name = "recording"
+
+    def __init__(self) -> None:
+        self.batches: list[ReminderBatch] = []
+
+    def send(self, batch: ReminderBatch) -> None:
+        self.batches.append(batch)
+
+
+@pytest.fixture(autouse=True)
+def sinks_configured(monkeypatch) -> None:
+    monkeypatch.setattr(reminders, "enabled", lambda: True)
+
+
+def _reminders(db: Session, obligation_id: int) -> dict[int, models.Reminder]:
+    db.expire_all()
+    return {
+        r.lead_days: r
+        for r in db.scalars(
+            select(models.Reminder).where(models.Reminder.obligation_id == obligation_id)
+        )
+    }
+
+
+def _items(*reminder_ids: int) -> list[ReminderItem]:
+    now = crud.now_utc()
+    return [
+        ReminderItem(
+            reminder_id=i,
+            obligation_id=i,
+            loan_id=1,
+            loan_title="Facility",
+            name="Certificate",
+            obligation_type="REPORTING",
+            due_at=now,
+            lead_days=7,
+        )
+        for i in reminder_ids
+    ]
+
+
+def test_recovery_only_fails_reminders_with_expired_leases(db: Session, make_obligation) -> None:
+    now = crud.now_utc()
+    obligation = make_obligation(due_date=str((now + timedelta(days=20)).date()))
+    rows = _reminders(db, obligation["id"])
+    live, stale = rows[14], rows[7]
+    live.status = stale.status = "SENDING"
+    live.claimed_by, live.lease_expires_at = "other-host:1:live", now + timedelta(minutes=5)
+    stale.claimed_by, stale.lease_expires_at = "other-host:2:gone", now - timedelta(minutes=5)
+    db.commit()
+
+    crud.fail_interrupted_reminders(db, now=now)
+    rows = _reminders(db, obligation["id"])
+    assert rows[14].status == "SENDING"
+    assert rows[14].claimed_by == "other-host:1:live"
+    assert rows[7].status == "FAILED"
+    assert rows[7].last_error == "Interrupted during delivery"
+    assert rows[1].status == "PENDING"
+
+
+def test_scheduler_claims_with_a_lease_and_releases_it(db: Session, make_obligation) -> None:
+    obligation = make_obligation(due_date=str((crud.now_utc() + timedelta(days=3)).date()))
+    sink = RecordingSink()
+    scheduler = ReminderScheduler(sinks=[sink])
+
+    now = crud.now_utc()
+    claimed = crud.claim_due_reminders(
+        db, worker_id=scheduler.worker_id, lease=scheduler.lease, now=now
+    )
+    mine = [row for row in claimed if row.obligation_id == obligation["id"]]
+    assert [row.lead_days for row in mine] == [7]
+    reminder = _reminders(db, obligation["id"])[7]
+    assert reminder.status == "SENDING"
+    assert reminder.claimed_by == scheduler.worker_id
+    assert reminder.lease_expires_at > now
+
+    scheduler._deliver(db, claimed, now)
+    assert any(item.obligation_id == obligation["id"] for b in sink.batches for item in b.items)
+    reminder = _reminders(db, obligation["id"])[7]
+    assert reminder.status == "SENT"
+    assert reminder.claimed_by is None
+    assert reminder.lease_expires_at is None
+
+
+def test_rescheduling_resets_cancelled_reminders_but_keeps_sent_ones(
+    client, db: Session, make_obligation
+) -> None:
+    now = crud.now_utc()
+    obligation = make_obligation(due_date=str((now + timedelta(days=10)).date()))
+    rows = _reminders(db, obligation["id"])
+    rows[7].status = "SENT"
+    rows[1].status, rows[1].attempts, rows[1].last_error = "CANCELLED", 1, "Obligation completed"
+    db.commit()
+
+    assert client.post(f"/api/obligations/{obligation['id']}/complete").status_code == 200
+    assert client.post(f"/api/obligations/{obligation['id']}/reopen").status_code == 200
+
+    rows = _reminders(db, obligation["id"])
+    assert rows[7].status == "SENT"
+    assert rows[1].status == "PENDING"
+    assert rows[1].attempts == 0
+    assert rows[1].last_error is None
+
+
+def test_nothing_is_scheduled_without_sinks(db: Session, make_obligation, monkeypatch) -> None:
+    monkeypatch.setattr(reminders, "enabled", lambda: False)
+    obligation = make_obligation(due_date=str((crud.now_utc() + timedelta(days=20)).date()))
+    assert _reminders(db, obligation["id"]) == {}
+
+
+def test_idempotency_keys_are_per_reminder() -> None:
+    items = _items(101, 102)
+    together = ReminderBatch(party_responsible="Borrower", items=tuple(items))
+    alone = ReminderBatch(party_responsible="Borrower", items=(items[1],))
+    assert together.key != alone.key
+
+    keys = {
+        r["reminder_id"]: r["idempotency_key"] for r in json.loads(together.to_json())["reminders"]
+    }
+    assert keys[102] == json.loads(alone.to_json())["reminders"][0]["idempotency_key"]
+    assert keys[101] != keys[102]
+
+
+def test_smtp_routes_batches_by_party(monkeypatch) -> None:
+    monkeypatch.setenv("REMINDER_SMTP_HOST", "127.0.0.1")
+    monkeypatch.setenv("REMINDER_SMTP_TO", "ops@example.com")
+    monkeypatch.setenv("REMINDER_SMTP_TO_FACILITY_AGENT", "agency@example.com, backup@example.com")
+    (sink,) = sinks_from_env()
+    assert isinstance(sink, SmtpSink)
+
+    routed = sink._message(
+        ReminderBatch(party_responsible="Facility Agent", items=tuple(_items(201)))
+    )
+    assert routed["To"] == "agency@example.com, backup@example.com"
+    assert routed["X-Party-Responsible"] == "Facility Agent"
+    assert "Facility Agent" in routed["Subject"]
+    fallback = sink._message(ReminderBatch(party_responsible="Borrower", items=tuple(_items(202))))
+    assert fallback["To"] == "ops@example.com"
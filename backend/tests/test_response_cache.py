@@ -0,0 +1,58 @@
+from __future__ import annotations
+
+from datetime import timedelta
+
+from sqlalchemy import update
+
+from app import crud, models
+from app.services import response_cache
+
+
+def _rename_behind_the_cache(db, obligation_id: int, name: str) -> None:
+    db.execute(
+        update(models.Obligation).where(models.Obligation.id == obligation_id).values(name=name)
+    )
+    db.commit()
+
+
+def test_obligation_list_is_served_from_cache_until_the_version_bumps(
+    client, db, loan, make_obligation
+) -> None:
+    obligation = make_obligation(name="Cached statements")
+    url = f"/api/loans/{loan['id']}/obligations"
+    assert [o["name"] for o in client.get(url).json()] == ["Cached statements"]
+
+    # A write that skips the loan version is invisible until the version moves.
+    _rename_behind_the_cache(db, obligation["id"], "Renamed statements")
+    assert [o["name"] for o in client.get(url).json()] == ["Cached statements"]
+
+    crud.bump_loan_version(db, loan["id"])
+    db.commit()
+    assert [o["name"] for o in client.get(url).json()] == ["Renamed statements"]
+
+
+def test_loan_detail_and_portfolio_refresh_on_writes(client, loan, make_obligation) -> None:
+    assert client.get(f"/api/loans/{loan['id']}").json()["summary"]["total"] == 0
+    before = client.get("/api/portfolio/summary").json()["totals"]["total"]
+
+    obligation = make_obligation(name="Fresh after write")
+    assert client.get(f"/api/loans/{loan['id']}").json()["summary"]["total"] == 1
+    assert client.get("/api/portfolio/summary").json()["totals"]["total"] == before + 1
+
+    assert client.delete(f"/api/obligations/{obligation['id']}").status_code == 200
+    assert client.get(f"/api/loans/{loan['id']}").json()["summary"]["total"] == 0
+    assert client.get("/api/portfolio/summary").json()["totals"]["total"] == before
+
+
+def test_cached_detail_expires_at_the_next_status_transition(
+    client, db, loan, make_obligation
+) -> None:
+    due = crud.now_utc() + timedelta(days=20)
+    make_obligation(name="Turns due soon", due_date=str(due.date()))
+    assert client.get(f"/api/loans/{loan['id']}").json()["summary"]["on_track"] == 1
+
+    db.expire_all()
+    key = ("loan", loan["id"], crud.get_loan(db, loan_id=loan["id"]).version)
+    now = crud.now_utc()
+    assert response_cache.get(key, now=now) is not None
+    assert response_cache.get(key, now=now + timedelta(days=7)) is None
@@ -0,0 +1,35 @@
+from __future__ import annotations
+
+from datetime import date
+
+from app.services.rule_extractor import RuleBasedExtractor, extract_chunk, split_pages
+from benchmarks.agreement_corpus import _OBLIGATION_CLAUSES, EXPECTED_KEYS, generate_agreement
+
+
+def _flat(text: str) -> str:
+    return " ".join(text.split())
+
+
+def test_every_planted_clause_is_found_on_its_page() -> None:
+    pages = split_pages(generate_agreement(pages=80, seed=3))
+    found = dict(extract_chunk(pages, 1, date(2026, 1, 15)))
+
+    assert EXPECTED_KEYS <= found.keys()
+    for key in EXPECTED_KEYS:
+        obligation = found[key]
+        # The fixed wording before the first placeholder identifies the planted clause.
+        wording = _flat(_OBLIGATION_CLAUSES[key].split("{")[0])
+        assert wording in obligation.source_excerpt, key
+        assert obligation.source_excerpt in _flat(pages[obligation.source_page - 1]), key
+
+
+def test_chunked_workers_match_single_process() -> None:
+    text = generate_agreement(pages=60, seed=5)
+    single = RuleBasedExtractor(workers=1, chunk_pages=7)
+    chunked = RuleBasedExtractor(workers=2, chunk_pages=7)
+    try:
+        expected = [o.model_dump() for o in single.extract_obligations(text)]
+        assert [o.model_dump() for o in chunked.extract_obligations(text)] == expected
+    finally:
+        chunked.close()
+    assert len(expected) == len(EXPECTED_KEYS)
@@ -0,0 +1,31 @@
+from __future__ import annotations
+
+
+def test_scores_are_relative_to_each_source(client, loan, make_obligation) -> None:
+    make_obligation(name="Zephyrquartz reserve account", description="Fund the zephyrquartz reserve")
+    make_obligation(name="Reserve top-up", description="Zephyrquartz shortfall notice")
+    pages = ["Definitions"] * 2 + ["The Zephyrquartz Reserve Account shall be funded monthly."]
+    response = client.post(f"/api/loans/{loan['id']}/import-text", json={"text": "\f".join(pages)})
+    assert response.status_code == 200
+
+    response = client.get("/api/search", params={"q": "zephyrquartz", "loan_id": loan["id"]})
+    assert response.status_code == 200
+    hits = response.json()
+    by_kind: dict[str, list[float]] = {}
+    for hit in hits:
+        by_kind.setdefault(hit["kind"], []).append(hit["score"])
+
+    assert set(by_kind) == {"obligation", "agreement"}
+    assert len(by_kind["obligation"]) == 2
+    for scores in by_kind.values():
+        assert max(scores) == 1.0
+        assert all(0 < score <= 1.0 for score in scores)
+    assert [h["score"] for h in hits] == sorted((h["score"] for h in hits), reverse=True)
+
+
+def test_single_source_scope(client, loan, make_obligation) -> None:
+    make_obligation(name="Quillfeather certificate")
+    hits = client.get(
+        "/api/search", params={"q": "quillfeather", "loan_id": loan["id"], "scope": "obligations"}
+    ).json()
+    assert [(h["kind"], h["score"]) for h in hits] == [("obligation", 1.0)]
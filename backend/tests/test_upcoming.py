@@ -0,0 +1,64 @@
+from __future__ import annotations
+
+from datetime import timedelta
+
+from sqlalchemy import select
+
+from app import crud, models
+
+PARTY = "Upcoming Test Agent"
+
+
+def _upcoming(client, **params) -> tuple[list[dict], str | None]:
+    response = client.get("/api/obligations/upcoming", params={"party_responsible": PARTY, **params})
+    assert response.status_code == 200, response.text
+    return response.json(), response.headers.get("x-next-cursor")
+
+
+def test_upcoming_orders_open_deadlines_and_pages(client, loan, make_obligation) -> None:
+    now = crud.now_utc()
+
+    def make(**fields):
+        return make_obligation(party_responsible=PARTY, **fields)
+
+    overdue = make(next_due_at=(now - timedelta(days=2)).isoformat(), frequency="MONTHLY")
+    soon = make(due_date=str((now + timedelta(days=3)).date()))
+    later = make(next_due_at=(now + timedelta(days=30)).isoformat(), frequency="MONTHLY")
+    make(due_date=str((now + timedelta(days=1)).date()), status="COMPLETED")
+    make()
+
+    items, _ = _upcoming(client)
+    assert [i["id"] for i in items] == [overdue["id"], soon["id"]]
+    assert items[0]["status"] == "OVERDUE"
+    assert items[1]["status"] == "DUE_SOON"
+    assert items[0]["loan_title"] == loan["title"]
+
+    first, cursor = _upcoming(client, days=45, limit=2)
+    assert [i["id"] for i in first] == [overdue["id"], soon["id"]]
+    assert cursor
+    rest, cursor = _upcoming(client, days=45, limit=2, cursor=cursor)
+    assert [i["id"] for i in rest] == [later["id"]]
+    assert cursor is None
+
+    bad = client.get("/api/obligations/upcoming", params={"cursor": "not-a-cursor"})
+    assert bad.status_code == 400
+
+
+def test_effective_due_at_follows_every_write_path(client, db, make_obligation) -> None:
+    now = crud.now_utc()
+    undated = make_obligation(party_responsible=PARTY)
+    monthly = make_obligation(next_due_at=(now + timedelta(days=5)).isoformat(), frequency="MONTHLY")
+    batched = make_obligation(due_date=str((now + timedelta(days=9)).date()))
+
+    due_date = str((now + timedelta(days=60)).date())
+    client.put(f"/api/obligations/{undated['id']}", json={"due_date": due_date})
+    client.post(f"/api/obligations/{monthly['id']}/complete")
+    client.post(
+        "/api/obligations/batch/update",
+        json={"items": [{"id": batched["id"], "next_due_at": (now + timedelta(days=100)).isoformat()}]},
+    )
+
+    ids = [undated["id"], monthly["id"], batched["id"]]
+    for o in db.scalars(select(models.Obligation).where(models.Obligation.id.in_(ids))):
+        assert o.effective_due_at is not None
+        assert o.effective_due_at == crud.obligation_due_at(o)
@@ -0,0 +1,104 @@
+from __future__ import annotations
+
+import threading
+
+import pytest
+from sqlalchemy import event
+from sqlalchemy.orm import Session
+
+from app import crud, models
+from app.services import uploads
+
+
+def _staged_upload(client, obligation_id: int, body: bytes) -> str:
+    response = client.post(
+        f"/api/obligations/{obligation_id}/uploads",
+        json={"filename": "statements.pdf", "size_bytes": len(body)},
+    )
+    assert response.status_code == 201
+    upload_id = response.json()["id"]
+    response = client.put(f"/api/uploads/{upload_id}/chunks", params={"offset": 0}, content=body)
+    assert response.status_code == 200
+    return upload_id
+
+
+def test_complete_creates_evidence_and_removes_session(client, db, make_obligation) -> None:
+    upload_id = _staged_upload(client, make_obligation()["id"], b"complete me")
+
+    response = client.post(f"/api/uploads/{upload_id}/complete")
+    assert response.status_code == 200
+    download = client.get(f"/api/evidence/{response.json()['id']}/download")
+    assert download.content == b"complete me"
+    assert crud.get_upload_session(db, upload_id=upload_id) is None
+    assert client.post(f"/api/uploads/{upload_id}/complete").status_code == 404
+
+
+def test_claimed_upload_is_not_completed_twice(client, db, make_obligation) -> None:
+    upload_id = _staged_upload(client, make_obligation()["id"], b"claimed elsewhere")
+    assert crud.claim_upload_session(db, upload_id=upload_id, stale_after=uploads.claim_timeout())
+
+    assert client.post(f"/api/uploads/{upload_id}/complete").status_code == 409
+    assert client.delete(f"/api/uploads/{upload_id}").status_code == 409
+    assert uploads.received_bytes(upload_id) == len(b"claimed elsewhere")
+
+
+def test_concurrent_completes_create_one_evidence(client, make_obligation) -> None:
+    obligation = make_obligation()
+    upload_id = _staged_upload(client, obligation["id"], b"x" * 256 * 1024)
+    barrier = threading.Barrier(2)
+    statuses: list[int] = []
+
+    def complete() -> None:
+        barrier.wait()
+        statuses.append(client.post(f"/api/uploads/{upload_id}/complete").status_code)
+
+    threads = [threading.Thread(target=complete) for _ in range(2)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert sorted(statuses)[0] == 200
+    assert sorted(statuses)[1] in (404, 409)
+    evidence = client.get(f"/api/obligations/{obligation['id']}/evidence").json()
+    assert len(evidence) == 1
+
+
+def test_failed_completion_keeps_upload_retryable(client, db, make_obligation, monkeypatch) -> None:
+    upload_id = _staged_upload(client, make_obligation()["id"], b"retry me")
+
+    def broken(*_args, **_kwargs):
+        raise RuntimeError("database unavailable")
+
+    with monkeypatch.context() as patch:
+        patch.setattr(crud, "create_evidence", broken)
+        with pytest.raises(RuntimeError):
+            client.post(f"/api/uploads/{upload_id}/complete")
+
+    db.expire_all()
+    upload = crud.get_upload_session(db, upload_id=upload_id)
+    assert upload is not None and upload.claimed_at is None
+    assert uploads.received_bytes(upload_id) == len(b"retry me")
+    assert client.post(f"/api/uploads/{upload_id}/complete").status_code == 200
+
+
+def test_failed_commit_keeps_staged_part_for_retry(client, db, make_obligation) -> None:
+    obligation = make_obligation()
+    upload_id = _staged_upload(client, obligation["id"], b"commit fails on complete")
+
+    def fail_evidence_commit(session: Session) -> None:
+        if any(isinstance(o, models.Evidence) for o in session.identity_map.values()):
+            raise RuntimeError("database unavailable")
+
+    event.listen(Session, "before_commit", fail_evidence_commit)
+    try:
+        with pytest.raises(RuntimeError):
+            client.post(f"/api/uploads/{upload_id}/complete")
+    finally:
+        event.remove(Session, "before_commit", fail_evidence_commit)
+
+    assert uploads.received_bytes(upload_id) == len(b"commit fails on complete")
+    response = client.post(f"/api/uploads/{upload_id}/complete")
+    assert response.status_code == 200
+    download = client.get(f"/api/evidence/{response.json()['id']}/download")
+    assert download.content == b"commit fails on complete"